@@ -0,0 +1,160 @@
+"""Time leaderboard window queries over a large ``search_signals_daily`` table.
+
+    python benchmarks/leaderboard_window.py --docs 27400 --days 365   # ~10M rows
+
+Defaults to a temporary SQLite file; pass ``--database-url`` to point at PostgreSQL
+(``search_signals_daily`` must exist and will be truncated). ``--no-index`` repeats
+each window with the covering ``(day, doc_id)`` index dropped, and ``--explain``
+prints the plan of the 30d query.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import tempfile
+import time
+from pathlib import Path
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from kickback.core.settings import ScoringSettings
+from kickback.domain import models
+from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.services.scoring import RecencyDecay
+from kickback.services.search import plan_window, window_start
+
+TABLE = models.SearchSignalsDaily.__table__
+INDEX = next(index for index in TABLE.indexes if index.name.endswith("_day_doc_id"))
+WINDOWS = (1, 7, 30, 90)
+
+
+async def seed(engine: AsyncEngine, docs: int, days: int) -> None:
+    """Fill ``docs * days`` rows in SQL so seeding 10M rows does not go through Python."""
+    postgres = engine.dialect.name == "postgresql"
+    async with engine.begin() as conn:
+        await conn.execute(sa.text(f"DELETE FROM {TABLE.name}"))
+        if postgres:
+            await conn.execute(
+                sa.text(
+                    f"INSERT INTO {TABLE.name} (doc_id, day, views, edits) "
+                    "SELECT d, current_date - g, (d * 7 + g) % 50, (d + g) % 5 "
+                    "FROM generate_series(1, :docs) d, generate_series(0, :days - 1) g"
+                ),
+                {"docs": docs, "days": days},
+            )
+        else:
+            await conn.execute(
+                sa.text(
+                    "WITH RECURSIVE "
+                    "d(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM d WHERE n < :docs), "
+                    "g(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM g WHERE n < :days - 1) "
+                    f"INSERT INTO {TABLE.name} (doc_id, day, views, edits) "
+                    "SELECT d.n, date('now', '-' || g.n || ' days'), "
+                    "(d.n * 7 + g.n) % 50, (d.n + g.n) % 5 "
+                    "FROM d, g"
+                ),
+                {"docs": docs, "days": days},
+            )
+    await analyze(engine)
+
+
+async def analyze(engine: AsyncEngine) -> None:
+    # VACUUM also sets the visibility map, without which PostgreSQL cannot skip the heap.
+    statement = f"VACUUM ANALYZE {TABLE.name}" if engine.dialect.name == "postgresql" else "ANALYZE"
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(sa.text(statement))
+
+
+def window_query(days: int, now: dt.datetime):
+    plan = plan_window(window_start(f"{days}d", now), now, {"day"})
+    weights = RecencyDecay(ScoringSettings()).bucket_weights(plan, now)
+    return plan, weights
+
+
+async def run_windows(
+    sessionmaker: async_sessionmaker, label: str, limit: int, repeat: int
+) -> None:
+    now = dt.datetime.now(dt.UTC)
+    for days in WINDOWS:
+        plan, weights = window_query(days, now)
+        best = float("inf")
+        for _ in range(repeat):
+            async with sessionmaker() as session:
+                started = time.perf_counter()
+                rows = await SearchRepository(session).window_leaderboard(plan, limit, weights)
+                best = min(best, time.perf_counter() - started)
+        print(f"{label:<12} {days:>3}d {best * 1000:10.1f} ms {len(rows):5d} rows")
+
+
+async def explain(engine: AsyncEngine, limit: int) -> None:
+    """Capture the 30d statement as sent to the driver and run it again under EXPLAIN."""
+    now = dt.datetime.now(dt.UTC)
+    plan, weights = window_query(30, now)
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        captured.append((statement, parameters))
+
+    sa.event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with async_sessionmaker(engine)() as session:
+            await SearchRepository(session).window_leaderboard(plan, limit, weights)
+    finally:
+        sa.event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    prefix = (
+        "EXPLAIN (ANALYZE, BUFFERS) "
+        if engine.dialect.name == "postgresql"
+        else "EXPLAIN QUERY PLAN "
+    )
+    async with engine.connect() as conn:
+        for row in await conn.exec_driver_sql(prefix + statement, parameters):
+            print("   ", " | ".join(str(value) for value in row))
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = args.database_url
+    if url is None:
+        url = f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = create_async_engine(url)
+    if url.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    started = time.perf_counter()
+    await seed(engine, args.docs, args.days)
+    print(
+        f"{args.docs * args.days} daily rows ({args.docs} docs x {args.days} days, "
+        f"{engine.dialect.name}) seeded in {time.perf_counter() - started:.1f}s"
+    )
+
+    await run_windows(sessionmaker, "index", args.limit, args.repeat)
+    if args.explain:
+        print("30d plan:")
+        await explain(engine, args.limit)
+    if args.no_index:
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync: INDEX.drop(sync, checkfirst=True))
+        await analyze(engine)
+        await run_windows(sessionmaker, "no index", args.limit, args.repeat)
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync: INDEX.create(sync, checkfirst=True))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=27_400)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-index", action="store_true")
+    parser.add_argument("--explain", action="store_true")
+    parser.add_argument("--database-url")
+    asyncio.run(main(parser.parse_args()))
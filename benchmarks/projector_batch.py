@@ -0,0 +1,142 @@
+"""Compare projector batch paths: ORM fetch + dict aggregation vs columnar fetch.
+
+    python benchmarks/projector_batch.py --rows 50000 --docs 2000
+
+Defaults to a temporary SQLite file; pass ``--database-url`` to point at PostgreSQL
+(the signals, documents and users tables must exist and will receive rows).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from kickback.core.types import SignalKind
+from kickback.domain import models
+from kickback.infra.repositories.signals_repo import SignalRepository
+from kickback.services import aggregation
+
+
+def orm_aggregate(signals: list[models.Signal], now: dt.datetime) -> int:
+    """The projector's previous per-object loop, kept here as the baseline."""
+    aggregates: dict[tuple[int, dt.date], dict[str, float]] = defaultdict(
+        lambda: {"views": 0, "edits": 0}
+    )
+    for signal in signals:
+        key = (signal.doc_id, signal.occurred_at.date())
+        if signal.kind == SignalKind.VIEW:
+            aggregates[key]["views"] += 1
+        else:
+            aggregates[key]["edits"] += 1
+    for (_, day), data in aggregates.items():
+        data["score"] = data["views"] + data["edits"] * 2 + max(0, 10 - (now.date() - day).days)
+    return len(aggregates)
+
+
+async def seed(sessionmaker: async_sessionmaker, rows: int, docs: int) -> None:
+    async with sessionmaker() as session:
+        user = models.User(email=f"bench-{time.time_ns()}@example.com")
+        session.add(user)
+        await session.flush()
+        documents = [
+            models.Document(external_key=f"bench-{user.id}-{i}", title="Bench", owner_id=user.id)
+            for i in range(docs)
+        ]
+        session.add_all(documents)
+        await session.flush()
+        doc_ids = [document.id for document in documents]
+        now = dt.datetime.now(dt.UTC)
+        kinds = list(SignalKind)
+        payloads = [
+            {
+                "doc_id": doc_ids[i % docs],
+                "user_id": user.id,
+                "kind": kinds[i % 7 % len(kinds)],
+                "occurred_at": now - dt.timedelta(hours=i % (24 * 30)),
+            }
+            for i in range(rows)
+        ]
+        await session.execute(sa.insert(models.Signal), payloads)
+        await session.commit()
+
+
+async def measure(label: str, func: Callable[[], Awaitable[int]], repeat: int) -> None:
+    # Time without tracemalloc (it slows allocation-heavy paths unevenly), then one traced run.
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        groups = await func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    await func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {best * 1000:9.1f} ms {peak / 1024 / 1024:9.1f} MiB {groups:8d} groups")
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = args.database_url
+    if url is None:
+        url = f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = create_async_engine(url)
+    if url.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    await seed(sessionmaker, args.rows, args.docs)
+    now = dt.datetime.now(dt.UTC)
+
+    async def orm_path() -> int:
+        async with sessionmaker() as session:
+            signals = await SignalRepository(session).fetch_batch(last_id=0, limit=args.rows)
+            return orm_aggregate(signals, now)
+
+    def columnar(vectorize: bool) -> Callable[[], Awaitable[int]]:
+        async def run() -> int:
+            async with sessionmaker() as session:
+                rows = await SignalRepository(session).fetch_rows(last_id=0, limit=args.rows)
+                return len(aggregation.aggregate_daily(rows, vectorize=vectorize))
+
+        return run
+
+    print(f"{args.rows} signals over {args.docs} docs ({engine.dialect.name})")
+    await measure("ORM objects + dict loop", orm_path, args.repeat)
+    await measure("row tuples + python", columnar(False), args.repeat)
+    if aggregation.np is not None:
+        await measure("row tuples + numpy", columnar(True), args.repeat)
+    else:
+        print("row tuples + numpy          skipped (numpy not installed)")
+
+    async with sessionmaker() as session:
+        rows = await SignalRepository(session).fetch_rows(last_id=0, limit=args.rows)
+
+    def aggregate_only(vectorize: bool) -> Callable[[], Awaitable[int]]:
+        async def run() -> int:
+            return len(aggregation.aggregate_daily(rows, vectorize=vectorize))
+
+        return run
+
+    print("aggregation only:")
+    await measure("  python", aggregate_only(False), args.repeat)
+    if aggregation.np is not None:
+        await measure("  numpy", aggregate_only(True), args.repeat)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--docs", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url")
+    asyncio.run(main(parser.parse_args()))
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from kickback.api import deps
 from kickback.core import flags
-from kickback.services.projector import SignalProjector
-
+from kickback.core.metrics import get_metrics
+from kickback.domain import schemas
+from kickback.services.projector import ProjectorMonitor, ShardedProjectorRunner, ShardLayoutError
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(deps.enforce_rate_limit)])
 
@@ -19,8 +22,31 @@ async def require_admin(request: Request):
 
 
 @router.post("/projector/run-once", dependencies=[Depends(require_admin)])
-async def projector_run_once(projector: SignalProjector = Depends(deps.get_projector)) -> dict[str, int]:
+async def projector_run_once(
+    projector: ShardedProjectorRunner = Depends(deps.get_projector),
+) -> dict[str, int]:
     if not flags.projector_enabled():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Projector disabled")
-    processed = await projector.run_once()
+    try:
+        processed = await projector.run_once()
+    except ShardLayoutError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
     return {"processed": processed}
+
+
+@router.get(
+    "/projector/status",
+    response_model=schemas.ProjectorStatus,
+    dependencies=[Depends(require_admin)],
+)
+async def projector_status(
+    exact: bool = False,
+    monitor: ProjectorMonitor = Depends(deps.get_projector_monitor),
+) -> schemas.ProjectorStatus:
+    return await monitor.status(exact=exact)
+
+
+@router.get("/metrics", dependencies=[Depends(require_admin)])
+async def metrics() -> dict[str, list[dict[str, Any]]]:
+    """This process's metrics, e.g. ``search_cache_hit_ratio`` and projector batch stats."""
+    return get_metrics().snapshot()
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from kickback.core.db import get_engine
+from kickback.core import flags
+from kickback.core.auth_cache import run_invalidation_listener
+from kickback.core.db import get_engine, get_sessionmaker
 from kickback.core.middleware import RequestContextMiddleware
 from kickback.core.settings import get_settings
+from kickback.infra.spool import DeadLetterFile, IngestSpool
+from kickback.services.ingest_buffer import SignalWriteBuffer, set_signal_buffer
+from kickback.services.ingest_spool import SpoolReplayer, claim_spool, set_ingest_spool
+from kickback.services.snapshots import LeaderboardSnapshots, set_leaderboard_snapshots
 
 from . import admin, health
 from .v1 import router as v1_router
 
-
 logger = logging.getLogger(__name__)
 
 
@@ -21,9 +28,61 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     logger.info("Starting Kickback", extra={"log_level": settings.log_level})
     engine = get_engine()
+    background: list[asyncio.Task[None]] = []
+    if flags.auth_cache_enabled():
+        background.append(asyncio.create_task(run_invalidation_listener()))
+    buffer: SignalWriteBuffer | None = None
+    if flags.signal_write_behind_enabled() and flags.ingest_spool_enabled():
+        logger.warning(
+            "Ingest spool enabled; it takes over POST /v1/signals:async from write-behind"
+        )
+    elif flags.signal_write_behind_enabled():
+        buffer = SignalWriteBuffer(
+            get_sessionmaker(),
+            max_queue=settings.ingest.write_behind_queue_size,
+            flush_max_items=settings.ingest.write_behind_flush_items,
+            flush_interval_seconds=settings.ingest.write_behind_flush_interval_seconds,
+            dead_letters=DeadLetterFile(settings.ingest.write_behind_dead_letter_path),
+        )
+        buffer.start()
+        set_signal_buffer(buffer)
+    spool: IngestSpool | None = None
+    if flags.ingest_spool_enabled():
+        spool = claim_spool(settings.spool)
+        set_ingest_spool(spool)
+        replayer = SpoolReplayer(
+            spool, get_sessionmaker(), batch_size=settings.spool.replay_batch_size
+        )
+        background.append(
+            asyncio.create_task(replayer.run_forever(settings.spool.replay_interval_seconds))
+        )
+    snapshots: LeaderboardSnapshots | None = None
+    if flags.leaderboard_snapshots_enabled():
+        snapshots = LeaderboardSnapshots(
+            get_sessionmaker(),
+            windows=settings.leaderboard.snapshot_windows,
+            size=settings.leaderboard.snapshot_size,
+            poll_seconds=settings.leaderboard.snapshot_poll_seconds,
+            max_age_seconds=settings.leaderboard.snapshot_max_age_seconds,
+        )
+        snapshots.start()
+        set_leaderboard_snapshots(snapshots)
     try:
         yield
     finally:
+        if snapshots is not None:
+            await snapshots.stop()
+            set_leaderboard_snapshots(None)
+        if buffer is not None:
+            await buffer.stop()
+            set_signal_buffer(None)
+        for task in background:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if spool is not None:
+            set_ingest_spool(None)
+            spool.close()
         await engine.dispose()
         logger.info("Shutdown complete")
 
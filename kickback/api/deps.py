@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import math
 from collections.abc import AsyncIterator
 
 from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from kickback.core.db import session_scope
+from kickback.core import flags
+from kickback.core.auth_cache import ApiPrincipal, get_principal_cache
+from kickback.core.db import get_sessionmaker, session_scope
 from kickback.core.rate_limit import check_rate_limit
-from kickback.core.security import verify_api_key
+from kickback.core.security import parse_key_id, verify_api_key
 from kickback.core.settings import get_settings
 from kickback.infra.repositories.api_keys_repo import ApiKeyRepository
+from kickback.infra.spool import IngestSpool
 from kickback.services.api_keys import ApiKeyService
 from kickback.services.documents import DocumentService
-from kickback.services.projector import SignalProjector
+from kickback.services.ingest_buffer import SignalWriteBuffer, get_signal_buffer
+from kickback.services.ingest_spool import get_ingest_spool
+from kickback.services.leaderboard import RedisLeaderboard
+from kickback.services.projector import ProjectorMonitor, ShardedProjectorRunner
 from kickback.services.search import SearchService
 from kickback.services.signals import SignalsService
+from kickback.services.snapshots import LeaderboardSnapshots, get_leaderboard_snapshots
 
 
 async def get_session() -> AsyncIterator[AsyncSession]:
@@ -26,30 +35,72 @@ async def require_api_key(
     request: Request,
     session: AsyncSession = Depends(get_session),
     api_key_header: str | None = Header(default=None, alias=get_settings().api_key_header),
-):
+) -> ApiPrincipal:
     if not api_key_header:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API key")
 
+    cache = get_principal_cache() if flags.auth_cache_enabled() else None
+    if cache is not None:
+        cached = cache.get(api_key_header)
+        if cached is not None:
+            request.state.api_client = cached
+            return cached
+
+    key = await _lookup_api_key(session, api_key_header)
+    if key is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+
+    principal = ApiPrincipal.from_model(key)
+    if cache is not None:
+        cache.put(api_key_header, principal)
+    request.state.api_client = principal
+    return principal
+
+
+async def _lookup_api_key(session: AsyncSession, raw_key: str):
     repo = ApiKeyRepository(session)
-    active_keys = await repo.fetch_active()
-    for key in active_keys:
-        if verify_api_key(api_key_header, key.salt, key.key_hash):
-            request.state.api_client = key
+    key_id = parse_key_id(raw_key)
+    if key_id is not None:
+        key = await repo.get_active_by_key_id(key_id)
+        if key and verify_api_key(raw_key, key.salt, key.key_hash):
             return key
+    elif get_settings().api_key_legacy_lookup:
+        for key in await repo.fetch_active(legacy_only=True):
+            if verify_api_key(raw_key, key.salt, key.key_hash):
+                return key
+    return None
 
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
+async def enforce_rate_limit(api_key: ApiPrincipal = Depends(require_api_key)):
+    await charge_rate_limit(api_key, cost=1)
 
-async def enforce_rate_limit(api_key=Depends(require_api_key)):
-    result = await check_rate_limit(str(api_key.id))
+
+async def charge_rate_limit(api_key: ApiPrincipal, cost: int) -> None:
+    result = await check_rate_limit(str(api_key.id), cost=cost)
     if not result.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded",
-            headers={"Retry-After": "60"},
+            headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))},
         )
 
 
+async def wait_for_rate_limit(api_key: ApiPrincipal, cost: int) -> None:
+    """Charge ``cost`` tokens, sleeping until the limiter admits them instead of failing.
+
+    The bucket never holds more than ``burst`` tokens, so a larger cost is charged
+    in burst-sized installments.
+    """
+    burst = max(1, get_settings().rate_limit.burst)
+    while cost > 0:
+        installment = min(cost, burst)
+        result = await check_rate_limit(str(api_key.id), cost=installment)
+        if result.allowed:
+            cost -= installment
+            continue
+        await asyncio.sleep(max(result.retry_after, 0.1))
+
+
 async def get_document_service(session: AsyncSession = Depends(get_session)) -> DocumentService:
     return DocumentService(session=session)
 
@@ -58,13 +109,30 @@ async def get_signals_service(session: AsyncSession = Depends(get_session)) -> S
     return SignalsService(session=session)
 
 
-async def get_projector(session: AsyncSession = Depends(get_session)) -> SignalProjector:
-    return SignalProjector(session=session)
+async def get_projector() -> ShardedProjectorRunner:
+    return ShardedProjectorRunner.from_settings(get_sessionmaker(), get_settings().projector)
+
+
+async def get_projector_monitor(session: AsyncSession = Depends(get_session)) -> ProjectorMonitor:
+    return ProjectorMonitor(session=session, lag_cap=get_settings().projector.status_lag_cap)
 
 
 async def get_search_service(session: AsyncSession = Depends(get_session)) -> SearchService:
-    return SearchService(session=session)
+    board = await RedisLeaderboard.connect() if flags.redis_leaderboard_enabled() else None
+    return SearchService(session=session, board=board)
 
 
 async def get_api_key_service(session: AsyncSession = Depends(get_session)) -> ApiKeyService:
     return ApiKeyService(session=session)
+
+
+async def get_write_buffer() -> SignalWriteBuffer | None:
+    return get_signal_buffer()
+
+
+async def get_snapshots() -> LeaderboardSnapshots | None:
+    return get_leaderboard_snapshots()
+
+
+async def get_spool() -> IngestSpool | None:
+    return get_ingest_spool()
@@ -1,30 +1,64 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import datetime as dt
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from kickback.api import deps
 from kickback.domain import schemas
 from kickback.services.search import SearchService
-
+from kickback.services.snapshots import LeaderboardSnapshots
 
 router = APIRouter(dependencies=[Depends(deps.enforce_rate_limit)])
 
+# Bodies stay plain lists; the next page's cursor travels in this header when there is one.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/leaderboard", response_model=list[schemas.LeaderboardEntry])
 async def leaderboard(
+    response: Response,
     window: str = Query(default="7d"),
     limit: int = Query(default=10, ge=1, le=100),
+    from_day: dt.date | None = Query(default=None, alias="from"),
+    to_day: dt.date | None = Query(default=None, alias="to"),
+    cursor: str | None = Query(default=None),
     service: SearchService = Depends(deps.get_search_service),
-) -> list[schemas.LeaderboardEntry]:
+    snapshots: LeaderboardSnapshots | None = Depends(deps.get_snapshots),
+) -> list[schemas.LeaderboardEntry] | Response:
+    if snapshots is not None and cursor is None and from_day is None and to_day is None:
+        cached = snapshots.get(window, limit)
+        if cached is not None:
+            payload, next_cursor = cached
+            headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+            return Response(content=payload, media_type="application/json", headers=headers)
     try:
-        return await service.leaderboard(window=window, limit=limit)
+        page = await service.leaderboard_page(
+            window=window, limit=limit, start_day=from_day, end_day=to_day, cursor=cursor
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.entries
 
 
 @router.get("/signals/daily", response_model=list[schemas.SignalsDailyEntry])
 async def signals_daily(
+    response: Response,
     doc_id: int = Query(..., ge=1),
+    limit: int = Query(default=100, ge=1, le=1000),
+    from_day: dt.date | None = Query(default=None, alias="from"),
+    to_day: dt.date | None = Query(default=None, alias="to"),
+    cursor: str | None = Query(default=None),
     service: SearchService = Depends(deps.get_search_service),
 ) -> list[schemas.SignalsDailyEntry]:
-    return await service.daily(doc_id=doc_id)
+    try:
+        page = await service.daily_page(
+            doc_id=doc_id, limit=limit, start_day=from_day, end_day=to_day, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.entries
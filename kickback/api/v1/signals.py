@@ -1,23 +1,168 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import contextlib
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
 
 from kickback.api import deps
+from kickback.core.auth_cache import ApiPrincipal
+from kickback.core.ndjson import iter_ndjson_lines
+from kickback.core.settings import get_settings
 from kickback.domain import schemas
+from kickback.infra.spool import IngestSpool, SpoolFullError
+from kickback.services.ingest_buffer import SignalBufferFullError, SignalWriteBuffer
+from kickback.services.ingest_spool import spool_signal
 from kickback.services.signals import PermissionDeniedError, SignalConflictError, SignalsService
 
-
-router = APIRouter(dependencies=[Depends(deps.enforce_rate_limit)])
+router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
-@router.post("/signals", response_model=schemas.SignalRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/signals",
+    response_model=schemas.SignalRead,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": schemas.SignalAccepted}},
+    dependencies=[Depends(deps.enforce_rate_limit)],
+)
 async def ingest_signal(
     payload: schemas.SignalCreate,
+    spool: IngestSpool | None = Depends(deps.get_spool),
     service: SignalsService = Depends(deps.get_signals_service),
-) -> schemas.SignalRead:
+) -> schemas.SignalRead | JSONResponse:
     try:
-        return await service.ingest_signal(payload)
+        if spool is None:
+            return await service.ingest_signal(payload)
+        # With the spool enabled a stalled database is answered with 202 instead of a timeout.
+        try:
+            return await asyncio.wait_for(
+                _ingest_and_commit(service, payload),
+                timeout=get_settings().spool.db_timeout_seconds,
+            )
+        except (DBAPIError, TimeoutError):
+            logger.warning("Database unavailable; spooling signal", exc_info=True)
+            await _discard(service)
+            ack_id = await _spool(spool, payload)
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=schemas.SignalAccepted(ack_id=ack_id).model_dump(),
+            )
     except PermissionDeniedError:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
     except SignalConflictError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Duplicate signal")
+
+
+@router.post(
+    "/signals:async",
+    response_model=schemas.SignalAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(deps.enforce_rate_limit)],
+)
+async def enqueue_signal(
+    payload: schemas.SignalCreate,
+    buffer: SignalWriteBuffer | None = Depends(deps.get_write_buffer),
+    spool: IngestSpool | None = Depends(deps.get_spool),
+    service: SignalsService = Depends(deps.get_signals_service),
+) -> schemas.SignalAccepted:
+    if spool is None and buffer is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Asynchronous ingestion disabled",
+        )
+    try:
+        if spool is not None:
+            # Only a database that does not answer defers the permission check to replay.
+            try:
+                await asyncio.wait_for(
+                    service.authorize(payload), timeout=get_settings().spool.db_timeout_seconds
+                )
+            except (DBAPIError, TimeoutError):
+                logger.warning("Database unavailable; spooling signal unchecked", exc_info=True)
+                await _discard(service)
+            return schemas.SignalAccepted(ack_id=await _spool(spool, payload))
+
+        await service.authorize(payload)
+        ack_id = buffer.submit(payload)
+    except PermissionDeniedError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
+    except SignalConflictError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Duplicate signal")
+    except SignalBufferFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingest queue full",
+            headers={"Retry-After": "1"},
+        )
+    return schemas.SignalAccepted(ack_id=ack_id)
+
+
+async def _ingest_and_commit(
+    service: SignalsService, payload: schemas.SignalCreate
+) -> schemas.SignalRead:
+    # Commit here rather than in the request's session teardown, so the timeout covers it.
+    signal = await service.ingest_signal(payload)
+    await service.session.commit()
+    return signal
+
+
+async def _spool(spool: IngestSpool, payload: schemas.SignalCreate) -> str:
+    try:
+        return await spool_signal(spool, payload)
+    except SpoolFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingest spool full",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def _discard(service: SignalsService) -> None:
+    # Nothing was committed yet; make sure the request's session does not commit it later.
+    with contextlib.suppress(Exception):
+        await service.session.rollback()
+
+
+@router.post("/signals:batch", response_model=schemas.SignalBatchResult)
+async def ingest_signal_batch(
+    payload: schemas.SignalBatchCreate,
+    api_key: ApiPrincipal = Depends(deps.require_api_key),
+    service: SignalsService = Depends(deps.get_signals_service),
+) -> schemas.SignalBatchResult:
+    if len(payload.signals) > get_settings().ingest.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Batch too large"
+        )
+    await deps.charge_rate_limit(api_key, cost=len(payload.signals))
+    return await service.ingest_batch(payload.signals)
+
+
+@router.post("/signals:stream", response_model=schemas.SignalStreamResult)
+async def ingest_signal_stream(
+    request: Request,
+    api_key: ApiPrincipal = Depends(deps.require_api_key),
+    service: SignalsService = Depends(deps.get_signals_service),
+) -> schemas.SignalStreamResult:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != "application/x-ndjson":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected application/x-ndjson",
+        )
+
+    settings = get_settings().ingest
+
+    async def charge(count: int) -> None:
+        await deps.wait_for_rate_limit(api_key, cost=count)
+
+    lines = iter_ndjson_lines(request.stream(), max_line_bytes=settings.stream_max_line_bytes)
+    return await service.ingest_stream(
+        lines,
+        chunk_size=settings.stream_chunk_size,
+        max_errors=settings.stream_max_errors,
+        before_flush=charge,
+    )
@@ -2,21 +2,33 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import json
 import logging
+from pathlib import Path
 from typing import Optional
 
 import typer
 import uvicorn
 
-from kickback.core.db import get_sessionmaker
+from kickback.core.db import get_engine, get_sessionmaker
+from kickback.core.settings import get_settings
+from kickback.core.types import PermissionRole, SignalKind
 from kickback.domain import models
 from kickback.domain.schemas import ApiKeyCreate
-from kickback.core.types import PermissionRole, SignalKind
+from kickback.infra.notify import SignalWakeup
+from kickback.infra.spool import IngestSpool, SpoolLockedError
 from kickback.services.api_keys import ApiKeyService
-from kickback.services.projector import SignalProjector
-
+from kickback.services.importer import SignalImporter
+from kickback.services.ingest_spool import SpoolReplayer, build_spool, spool_slots
+from kickback.services.leaderboard import RedisLeaderboard
+from kickback.services.projections import get_projections
+from kickback.services.projector import ProjectorReshard, ShardedProjectorRunner, ShardLayoutError
+from kickback.services.rebuild import LeaderboardRebuild, ProjectionRebuild
+from kickback.services.retention import SignalRetention
 
 app = typer.Typer(help="Kickback operational CLI")
+spool_app = typer.Typer(help="Inspect and replay the local ingest spool")
+app.add_typer(spool_app, name="spool")
 logger = logging.getLogger(__name__)
 
 
@@ -47,7 +59,7 @@ def seed():
             permission = models.Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.OWNER)
             session.add(permission)
 
-            now = dt.datetime.now(dt.timezone.utc)
+            now = dt.datetime.now(dt.UTC)
             session.add_all(
                 [
                     models.Signal(
@@ -70,15 +82,123 @@ def seed():
     _run_async(_seed)
 
 
-@app.command()
-def projector():
+projector_app = typer.Typer(help="Run or rebuild the search projection")
+app.add_typer(projector_app, name="projector")
+
+
+@projector_app.callback(invoke_without_command=True)
+def projector(
+    ctx: typer.Context,
+    shards: Optional[int] = typer.Option(
+        None,
+        min=1,
+        max=models.SHARD_BUCKETS,
+        help="Split documents into N shards (default: KICK_PROJECTOR__SHARDS)",
+    ),
+    workers: int = typer.Option(1, min=1, help="Concurrent workers sweeping the shards"),
+):
     """Run the projector continuously."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    async def _run():
+        settings = get_settings().projector
+        runner = ShardedProjectorRunner.from_settings(
+            get_sessionmaker(), settings, shards=shards, workers=workers
+        )
+        wakeup = None
+        if settings.listen:
+            wakeup = SignalWakeup(
+                get_engine(),
+                debounce_seconds=settings.notify_debounce_seconds,
+                fallback_seconds=settings.listen_fallback_seconds,
+            )
+            await wakeup.start()
+        try:
+            await runner.run_forever(sleep_seconds=settings.poll_interval_seconds, wakeup=wakeup)
+        finally:
+            if wakeup is not None:
+                await wakeup.close()
+
+    _run_projector(_run)
+
+
+@projector_app.command("reshard")
+def projector_reshard(
+    shards: int = typer.Option(..., min=1, max=models.SHARD_BUCKETS, help="New shard count"),
+):
+    """Move every projection's checkpoints to a new shard count."""
+
+    async def _reshard():
+        settings = get_settings().projector
+        job = ProjectorReshard(
+            get_sessionmaker(),
+            get_projections(settings.projections),
+            shards=shards,
+            batch_size=settings.batch_size,
+        )
+        for name, last_id in (await job.run()).items():
+            print(f"{name}: {shards} shard(s) from signal {last_id}")
+        if shards != settings.shards:
+            print(f"Set KICK_PROJECTOR__SHARDS={shards} before starting projectors")
+
+    _run_projector(_reshard)
+
+
+def _run_projector(func) -> None:
+    try:
+        _run_async(func)
+    except ShardLayoutError as exc:
+        print(f"Projector shard layout mismatch: {exc}")
+        raise typer.Exit(code=1)
+
+
+@projector_app.command("rebuild")
+def projector_rebuild(
+    workers: int = typer.Option(4, min=1, help="Concurrent id-range loaders"),
+    chunk_size: int = typer.Option(50_000, min=1, help="Signals fetched per query"),
+):
+    """Recompute the daily, hourly and weekly rollups into shadow tables and swap them in."""
+
+    async def _rebuild():
+        job = ProjectionRebuild(get_sessionmaker(), workers=workers, chunk_size=chunk_size)
+        result = await job.run()
+        print(
+            f"Rebuilt {result.rows} rows from {result.signals} signals "
+            f"(checkpoint {result.high_water_id}) in {result.seconds:.1f}s"
+        )
+
+    _run_async(_rebuild)
+
+
+@projector_app.command("leaderboard-rebuild")
+def projector_leaderboard_rebuild():
+    """Refill the Redis leaderboard from search_signals_daily."""
+
+    async def _rebuild():
+        job = LeaderboardRebuild(get_sessionmaker(), await RedisLeaderboard.connect())
+        rows = await job.run()
+        print(f"Loaded {rows} daily rows into the Redis leaderboard")
+
+    _run_async(_rebuild)
+
+
+@app.command()
+def retention():
+    """Create upcoming signal partitions and drop those past retention."""
 
     async def _run():
+        settings = get_settings().retention
         sessionmaker = get_sessionmaker()
         async with sessionmaker() as session:
-            projector = SignalProjector(session=session)
-            await projector.run_forever()
+            job = SignalRetention(
+                session=session,
+                retention_months=settings.signals_months,
+                premake_months=settings.premake_months,
+            )
+            result = await job.run_once()
+            await session.commit()
+        print(f"Created {len(result.created)} partitions, dropped {len(result.dropped)}")
 
     _run_async(_run)
 
@@ -93,7 +213,7 @@ def create_key(client: str, expires_in_days: Optional[int] = typer.Option(None,
             service = ApiKeyService(session=session)
             expires_at = None
             if expires_in_days:
-                expires_at = dt.datetime.now(dt.timezone.utc) + dt.timedelta(days=expires_in_days)
+                expires_at = dt.datetime.now(dt.UTC) + dt.timedelta(days=expires_in_days)
             key = await service.create(
                 ApiKeyCreate(client_name=client, roles={"admin": False}, expires_at=expires_at)
             )
@@ -103,5 +223,95 @@ def create_key(client: str, expires_in_days: Optional[int] = typer.Option(None,
     _run_async(_create)
 
 
+@app.command("import")
+def import_signals(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    fmt: str = typer.Option("ndjson", "--format", help="ndjson or csv"),
+    workers: int = typer.Option(1, min=1),
+    chunk_size: int = typer.Option(10_000, min=1),
+    start_offset: int = typer.Option(0, min=0, help="Resume a single-worker import at this offset"),
+    state_file: Optional[Path] = typer.Option(
+        None, help="Per-range progress for resuming (default: <path>.import-state)"
+    ),
+    project: bool = typer.Option(False, help="Run the projector until caught up afterwards"),
+):
+    """Bulk load historical signals (COPY on PostgreSQL, executemany elsewhere)."""
+    if fmt not in ("ndjson", "csv"):
+        raise typer.BadParameter("format must be ndjson or csv")
+
+    async def _import():
+        importer = SignalImporter(
+            get_engine(),
+            fmt=fmt,
+            workers=workers,
+            chunk_size=chunk_size,
+            state_path=state_file or path.with_name(f"{path.name}.import-state"),
+        )
+        try:
+            report = await importer.run(path, start_offset=start_offset)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc))
+        print(
+            f"Imported {report.inserted}/{report.rows} rows ({report.invalid} invalid) "
+            f"in {report.seconds:.1f}s, {report.rows_per_second:.0f} rows/s"
+        )
+
+        if project:
+            settings = get_settings().projector
+            runner = ShardedProjectorRunner.from_settings(get_sessionmaker(), settings)
+            await runner.run_until_caught_up()
+
+    _run_projector(_import)
+
+
+import_app = typer.Typer(help="Bulk load historical signals")
+import_app.command()(import_signals)
+
+
+@spool_app.command("inspect")
+def spool_inspect():
+    """Show size, checkpoint, pending and dead-lettered record counts of every spool slot."""
+    stats = []
+    for directory in spool_slots(get_settings().spool):
+        spool = _open_spool(directory)
+        if spool is None:
+            stats.append({"directory": str(directory), "locked": True})
+            continue
+        try:
+            stats.append(spool.stats())
+        finally:
+            spool.close()
+    print(json.dumps(stats, indent=2))
+
+
+@spool_app.command("replay")
+def spool_replay(batch_size: int = typer.Option(500, min=1)):
+    """Replay every pending spooled signal of every idle spool slot into the database."""
+
+    async def _replay():
+        replayed = 0
+        for directory in spool_slots(get_settings().spool):
+            spool = _open_spool(directory)
+            if spool is None:
+                print(f"Skipping {directory}: a running API process holds it and replays it")
+                continue
+            try:
+                replayer = SpoolReplayer(spool, get_sessionmaker(), batch_size=batch_size)
+                replayed += await replayer.drain()
+            finally:
+                spool.close()
+        print(f"Replayed {replayed} spooled signals")
+
+    _run_async(_replay)
+
+
+def _open_spool(directory: Path) -> IngestSpool | None:
+    """The slot's spool, or ``None`` while an API process holds it."""
+    try:
+        return build_spool(get_settings().spool, directory)
+    except SpoolLockedError:
+        return None
+
+
 def main():
     app()
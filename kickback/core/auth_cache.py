@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from .cache import get_redis
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ApiPrincipal:
+    """Verified caller identity, detached from the ORM session that loaded it."""
+
+    id: int
+    client_name: str
+    roles: dict[str, Any] = field(default_factory=dict)
+    expires_at: dt.datetime | None = None
+
+    @classmethod
+    def from_model(cls, api_key: Any) -> ApiPrincipal:
+        return cls(
+            id=api_key.id,
+            client_name=api_key.client_name,
+            roles=dict(api_key.roles or {}),
+            expires_at=api_key.expires_at,
+        )
+
+
+def _digest(raw_key: str) -> str:
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """Bounded LRU of verified principals keyed by a digest of the presented key.
+
+    Entries live for at most ``ttl_seconds`` and never past the key's own
+    ``expires_at``, so a disabled key that misses its invalidation message is
+    still rejected once the window elapses.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[ApiPrincipal, float]] = OrderedDict()
+        self._digests_by_id: dict[int, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, raw_key: str) -> ApiPrincipal | None:
+        digest = _digest(raw_key)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        principal, deadline = entry
+        if deadline <= time.monotonic():
+            self._discard(digest)
+            return None
+        self._entries.move_to_end(digest)
+        return principal
+
+    def put(self, raw_key: str, principal: ApiPrincipal) -> None:
+        ttl = self.ttl_seconds
+        if principal.expires_at is not None:
+            remaining = (principal.expires_at - dt.datetime.now(dt.UTC)).total_seconds()
+            ttl = min(ttl, remaining)
+        if ttl <= 0:
+            return
+
+        digest = _digest(raw_key)
+        self._entries[digest] = (principal, time.monotonic() + ttl)
+        self._entries.move_to_end(digest)
+        self._digests_by_id.setdefault(principal.id, set()).add(digest)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+
+    def invalidate(self, api_key_id: int) -> None:
+        for digest in self._digests_by_id.pop(api_key_id, set()):
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._digests_by_id.clear()
+
+    def _discard(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        digests = self._digests_by_id.get(entry[0].id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_id[entry[0].id]
+
+
+_cache: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings().auth_cache
+        _cache = PrincipalCache(max_entries=settings.max_entries, ttl_seconds=settings.ttl_seconds)
+    return _cache
+
+
+async def publish_invalidation(api_key_id: int) -> None:
+    """Drop ``api_key_id`` locally and tell every other worker to do the same."""
+    get_principal_cache().invalidate(api_key_id)
+    redis = await get_redis()
+    await redis.publish(get_settings().auth_cache.channel, str(api_key_id))
+
+
+async def run_invalidation_listener(reconnect_seconds: float = 1.0) -> None:
+    """Apply invalidations published by other workers until cancelled.
+
+    The whole cache is cleared after every (re)subscribe because messages sent
+    while disconnected are lost.
+    """
+    channel = get_settings().auth_cache.channel
+    cache = get_principal_cache()
+    while True:
+        try:
+            redis = await get_redis()
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(channel)
+            cache.clear()
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        cache.invalidate(int(message["data"]))
+                    except (TypeError, ValueError):
+                        logger.warning(
+                            "Ignoring malformed auth invalidation", extra={"data": message["data"]}
+                        )
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Auth invalidation listener disconnected")
+            cache.clear()
+            await asyncio.sleep(reconnect_seconds)
@@ -13,3 +13,23 @@ def cache_enabled() -> bool:
 
 def idempotency_guard_enabled() -> bool:
     return get_settings().flags.ff_idempotency_redis_guard
+
+
+def auth_cache_enabled() -> bool:
+    return get_settings().flags.ff_auth_cache_enabled
+
+
+def signal_write_behind_enabled() -> bool:
+    return get_settings().flags.ff_signal_write_behind
+
+
+def ingest_spool_enabled() -> bool:
+    return get_settings().flags.ff_ingest_spool
+
+
+def redis_leaderboard_enabled() -> bool:
+    return get_settings().flags.ff_redis_leaderboard
+
+
+def leaderboard_snapshots_enabled() -> bool:
+    return get_settings().flags.ff_leaderboard_snapshots
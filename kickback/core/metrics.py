@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections import deque
+from threading import Lock
+from typing import Any
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(_labels(labels), 0)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Gauge:
+    def __init__(self) -> None:
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[_labels(labels)] = value
+
+    def get(self, **labels: Any) -> float | None:
+        return self._values.get(_labels(labels))
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (``le`` upper bounds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        # Per-bucket counts, then +Inf, sum and count.
+        series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 3))
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        result = []
+        for key, series in self._series.items():
+            cumulative = 0.0
+            buckets = {}
+            for bound, count in zip((*self.buckets, float("inf")), series, strict=False):
+                cumulative += count
+                buckets["+Inf" if bound == float("inf") else str(bound)] = int(cumulative)
+            result.append(
+                {
+                    "labels": dict(key),
+                    "buckets": buckets,
+                    "sum": series[-2],
+                    "count": int(series[-1]),
+                }
+            )
+        return result
+
+
+class RateMeter:
+    """Events per second over a sliding window."""
+
+    def __init__(self, window_seconds: float = 60.0) -> None:
+        self.window_seconds = window_seconds
+        self._events: dict[Labels, deque[tuple[float, float]]] = {}
+
+    def mark(self, amount: float = 1, **labels: Any) -> None:
+        now = time.monotonic()
+        events = self._events.setdefault(_labels(labels), deque())
+        events.append((now, amount))
+        self._trim(events, now)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        result = []
+        for key, events in self._events.items():
+            self._trim(events, now)
+            total = sum(amount for _, amount in events)
+            result.append({"labels": dict(key), "value": total / self.window_seconds})
+        return result
+
+    def _trim(self, events: deque[tuple[float, float]], now: float) -> None:
+        while events and events[0][0] < now - self.window_seconds:
+            events.popleft()
+
+
+class MetricsRegistry:
+    """Process-local metrics, exposed as JSON by admin endpoints."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Gauge | Histogram | RateMeter] = {}
+        self._lock = Lock()
+
+    def counter(self, name: str) -> Counter:
+        return self._get(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get(name, Gauge)
+
+    def histogram(
+        self, name: str, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get(name, lambda: Histogram(buckets))
+
+    def meter(self, name: str, window_seconds: float = 60.0) -> RateMeter:
+        return self._get(name, lambda: RateMeter(window_seconds))
+
+    def snapshot(self, prefix: str = "") -> dict[str, list[dict[str, Any]]]:
+        return {
+            name: metric.snapshot()
+            for name, metric in sorted(self._metrics.items())
+            if name.startswith(prefix)
+        }
+
+    def clear(self) -> None:
+        self._metrics.clear()
+
+    def _get(self, name: str, factory: Any) -> Any:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _registry
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator, NamedTuple
+
+
+class NdjsonLine(NamedTuple):
+    number: int
+    offset: int
+    data: bytes
+    too_long: bool = False
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int, start_offset: int = 0
+) -> AsyncIterator[NdjsonLine]:
+    """Split a byte stream into newline-delimited records without buffering it whole.
+
+    At most ``max_line_bytes`` are held for any one line; longer lines are
+    skipped up to the next newline and yielded with ``too_long`` set and no
+    data. Blank lines are dropped but still counted. ``offset`` is the byte
+    position of the line start, shifted by ``start_offset``.
+    """
+    buffer = bytearray()
+    number = 0
+    line_start = start_offset
+    position = start_offset
+    overflow = False
+
+    async for chunk in chunks:
+        view = memoryview(chunk)
+        cursor = 0
+        while cursor < len(view):
+            newline = chunk.find(b"\n", cursor)
+            end = len(view) if newline == -1 else newline
+            if not overflow:
+                buffer += view[cursor:end]
+                if len(buffer) > max_line_bytes:
+                    overflow = True
+                    buffer.clear()
+            position += end - cursor
+            cursor = end
+            if newline == -1:
+                break
+
+            number += 1
+            line = _finish(number, line_start, buffer, overflow)
+            if line is not None:
+                yield line
+            buffer.clear()
+            overflow = False
+            cursor += 1
+            position += 1
+            line_start = position
+
+    if buffer or overflow:
+        line = _finish(number + 1, line_start, buffer, overflow)
+        if line is not None:
+            yield line
+
+
+def _finish(number: int, offset: int, buffer: bytearray, overflow: bool) -> NdjsonLine | None:
+    if overflow:
+        return NdjsonLine(number, offset, b"", too_long=True)
+    data = bytes(buffer).strip()
+    if not data:
+        return None
+    return NdjsonLine(number, offset, data)
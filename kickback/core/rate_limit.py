@@ -10,47 +10,165 @@ from redis.asyncio import Redis
 from .cache import get_redis
 from .settings import get_settings
 
-
 logger = logging.getLogger(__name__)
 
-_script_sha: str | None = None
+_SCRIPTS = {
+    "token_bucket": "ratelimit_lua.lua",
+    "gcra": "ratelimit_gcra.lua",
+}
+_script_shas: dict[str, str] = {}
 _sha_lock = asyncio.Lock()
 
 
-async def _load_script(client: Redis) -> str:
-    global _script_sha
-    if _script_sha:
-        return _script_sha
+async def _load_script(client: Redis, algorithm: str = "token_bucket") -> str:
+    sha = _script_shas.get(algorithm)
+    if sha:
+        return sha
 
     async with _sha_lock:
-        if _script_sha is None:
-            script_path = Path(__file__).with_name("ratelimit_lua.lua")
+        if algorithm not in _script_shas:
+            script_path = Path(__file__).with_name(_SCRIPTS[algorithm])
             source = script_path.read_text(encoding="utf-8")
-            _script_sha = await client.script_load(source)
-            logger.info("Loaded rate limit Lua script", extra={"sha": _script_sha})
-    assert _script_sha is not None
-    return _script_sha
+            _script_shas[algorithm] = await client.script_load(source)
+            logger.info(
+                "Loaded rate limit Lua script",
+                extra={"algorithm": algorithm, "sha": _script_shas[algorithm]},
+            )
+    return _script_shas[algorithm]
 
 
 class RateLimitResult:
-    __slots__ = ("allowed", "remaining")
+    __slots__ = ("allowed", "remaining", "retry_after")
 
-    def __init__(self, allowed: bool, remaining: float):
+    def __init__(self, allowed: bool, remaining: float, retry_after: float = 0.0):
         self.allowed = allowed
         self.remaining = remaining
+        self.retry_after = retry_after
+
+
+class _Lease:
+    __slots__ = ("exhausted", "expires_at", "refill_at", "tokens")
+
+    def __init__(self, tokens: int, expires_at: float, exhausted: bool, refill_at: float = 0.0):
+        self.tokens = tokens
+        self.expires_at = expires_at
+        # The bucket could not fill the lease; deny locally until it expires.
+        self.exhausted = exhausted
+        # When the bucket will have refilled the missing tokens, on the monotonic clock.
+        self.refill_at = refill_at
+
 
+_leases: dict[str, _Lease] = {}
+_lease_locks: dict[str, asyncio.Lock] = {}
 
-async def check_rate_limit(client_key: str) -> RateLimitResult:
-    settings = get_settings()
-    rate = settings.rate_limit.per_min / 60
-    burst = settings.rate_limit.burst
+
+async def _take_tokens(
+    client_key: str, requested: int, allow_partial: bool
+) -> tuple[int, float, float]:
+    """Take up to ``requested`` tokens from the shared bucket.
+
+    Returns ``(granted, remaining, retry_after_seconds)``, where ``retry_after``
+    is how long until the tokens not granted have refilled.
+    """
+    settings = get_settings().rate_limit
+    rate = settings.per_min / 60
 
     redis = await get_redis()
-    sha = await _load_script(redis)
+    sha = await _load_script(redis, settings.algorithm)
+
+    if settings.algorithm == "gcra":
+        interval_us = round(1_000_000 / rate)
+        granted, remaining, retry_after = await redis.evalsha(
+            sha,
+            1,
+            f"rl:{client_key}:tat",
+            settings.burst,
+            interval_us,
+            requested,
+            int(allow_partial),
+        )
+        return int(granted), float(remaining), float(retry_after)
 
     now = time.time()
-    allowed, remaining = await redis.evalsha(
-        sha, 2, f"rl:{client_key}:tokens", f"rl:{client_key}:ts", burst, rate, now, 1
+    granted, remaining = await redis.evalsha(
+        sha,
+        2,
+        f"rl:{client_key}:tokens",
+        f"rl:{client_key}:ts",
+        settings.burst,
+        rate,
+        now,
+        requested,
+        int(allow_partial),
     )
-
-    return RateLimitResult(bool(allowed), float(remaining))
+    missing = requested - int(granted)
+    retry_after = 0.0 if missing <= 0 else max(0.0, missing - float(remaining)) / rate
+    return int(granted), float(remaining), retry_after
+
+
+def _spend_lease(client_key: str, cost: int) -> RateLimitResult | None:
+    lease = _leases.get(client_key)
+    if lease is None or lease.expires_at <= time.monotonic():
+        return None
+    if lease.tokens < cost:
+        if not lease.exhausted:
+            return None
+        retry_at = max(lease.expires_at, lease.refill_at)
+        return RateLimitResult(False, lease.tokens, retry_after=retry_at - time.monotonic())
+    lease.tokens -= cost
+    return RateLimitResult(True, lease.tokens)
+
+
+async def _check_leased(client_key: str, cost: int) -> RateLimitResult:
+    """Spend tokens from a worker-local lease, refilling it from Redis when exhausted.
+
+    Tokens are debited from the shared bucket when leased, so a client can never
+    exceed the global limit; the error is under-admission of at most
+    ``lease_size`` tokens per worker, lost when a lease expires unspent, plus
+    up to ``lease_ttl_seconds`` of refill while a worker denies from an
+    exhausted lease.
+    """
+    spent = _spend_lease(client_key, cost)
+    if spent is not None:
+        return spent
+
+    lock = _lease_locks.setdefault(client_key, asyncio.Lock())
+    async with lock:
+        spent = _spend_lease(client_key, cost)
+        if spent is not None:
+            return spent
+
+        settings = get_settings().rate_limit
+        now = time.monotonic()
+        lease = _leases.get(client_key)
+        carried = lease.tokens if lease is not None and lease.expires_at > now else 0
+        requested = max(cost, settings.lease_size)
+        granted, _, refill = await _take_tokens(
+            client_key, requested=requested, allow_partial=True
+        )
+        available = carried + granted
+        allowed = available >= cost
+        if allowed:
+            available -= cost
+        _leases[client_key] = _Lease(
+            available,
+            now + settings.lease_ttl_seconds,
+            exhausted=granted < requested,
+            refill_at=now + refill,
+        )
+        if allowed:
+            return RateLimitResult(True, available)
+        # The exhausted lease denies locally until it expires, so never advertise less.
+        return RateLimitResult(
+            False, available, retry_after=max(refill, settings.lease_ttl_seconds)
+        )
+
+
+async def check_rate_limit(client_key: str, cost: int = 1) -> RateLimitResult:
+    if get_settings().rate_limit.mode == "leased":
+        return await _check_leased(client_key, cost)
+
+    granted, remaining, retry_after = await _take_tokens(
+        client_key, requested=cost, allow_partial=False
+    )
+    return RateLimitResult(granted >= cost, remaining, retry_after=retry_after)
@@ -0,0 +1,47 @@
+-- Generic cell rate algorithm (GCRA) rate limiter.
+-- Stores a single theoretical arrival time (TAT) per client and reads the
+-- clock from Redis so API nodes with skewed clocks share one timeline.
+-- KEYS[1] = theoretical arrival time key (microseconds)
+-- ARGV[1] = burst capacity
+-- ARGV[2] = emission interval in microseconds
+-- ARGV[3] = tokens requested
+-- ARGV[4] = 1 to grant as many whole tokens as are available (leases), 0 for all-or-nothing
+-- Returns {tokens granted, tokens left, retry after in seconds (string)}, where retry after
+-- is how long until the tokens not granted are available.
+
+local tat_key = KEYS[1]
+
+local burst = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local allow_partial = tonumber(ARGV[4] or "0") == 1
+
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tolerance = burst * interval
+
+local tat = tonumber(redis.call("GET", tat_key))
+if tat == nil or tat < now then
+  tat = now
+end
+
+local available = math.max(0, math.floor((now + tolerance - tat) / interval))
+
+local granted = 0
+if available >= requested then
+  granted = requested
+elseif allow_partial then
+  granted = available
+end
+
+if granted > 0 then
+  tat = tat + granted * interval
+  redis.call("SET", tat_key, string.format("%.0f", tat), "PX", math.ceil((tat - now) / 1000))
+end
+
+local retry_after = 0
+if granted < requested then
+  retry_after = math.max(0, tat + (requested - granted) * interval - tolerance - now) / 1000000
+end
+
+return {granted, available - granted, tostring(retry_after)}
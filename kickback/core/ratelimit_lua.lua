@@ -5,6 +5,8 @@
 -- ARGV[2] = refill rate per second
 -- ARGV[3] = current timestamp
 -- ARGV[4] = tokens requested
+-- ARGV[5] = 1 to grant as many whole tokens as are available (leases), 0 for all-or-nothing
+-- Returns {tokens granted, tokens left in the bucket}.
 
 local tokens_key = KEYS[1]
 local timestamp_key = KEYS[2]
@@ -13,6 +15,7 @@ local capacity = tonumber(ARGV[1])
 local refill_rate = tonumber(ARGV[2])
 local now = tonumber(ARGV[3])
 local requested = tonumber(ARGV[4])
+local allow_partial = tonumber(ARGV[5] or "0") == 1
 
 local tokens = tonumber(redis.call("GET", tokens_key))
 if tokens == nil then
@@ -30,14 +33,15 @@ local refill = delta * refill_rate
 tokens = math.min(capacity, tokens + refill)
 local ttl = math.ceil(capacity / math.max(refill_rate, 0.001))
 
-if tokens < requested then
-  redis.call("SET", tokens_key, tokens, "EX", ttl)
-  redis.call("SET", timestamp_key, now, "EX", ttl)
-  return {0, tokens}
+local granted = 0
+if tokens >= requested then
+  granted = requested
+elseif allow_partial then
+  granted = math.floor(tokens)
 end
 
-tokens = tokens - requested
+tokens = tokens - granted
 redis.call("SET", tokens_key, tokens, "EX", ttl)
 redis.call("SET", timestamp_key, now, "EX", ttl)
 
-return {1, tokens}
+return {granted, tokens}
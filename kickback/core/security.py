@@ -4,9 +4,10 @@ import hashlib
 import secrets
 from dataclasses import dataclass
 
-
 API_KEY_BYTES = 32
 API_KEY_SALT_BYTES = 16
+API_KEY_ID_BYTES = 6
+API_KEY_SCHEME = "kb"
 
 
 def _sha256(value: str) -> str:
@@ -24,15 +25,35 @@ def verify_api_key(raw_key: str, salt: str, expected_hash: str) -> bool:
     return secrets.compare_digest(candidate, expected_hash)
 
 
+def parse_key_id(raw_key: str) -> str | None:
+    """Return the public key id embedded in a ``kb_<id>_<secret>`` key.
+
+    Keys issued before the prefixed format carry no id and return ``None``.
+    """
+    scheme, sep, rest = raw_key.partition("_")
+    if not sep or scheme != API_KEY_SCHEME:
+        return None
+    key_id, sep, secret = rest.partition("_")
+    if not sep or not secret or len(key_id) != API_KEY_ID_BYTES * 2:
+        return None
+    try:
+        int(key_id, 16)
+    except ValueError:
+        return None
+    return key_id
+
+
 @dataclass(frozen=True)
 class GeneratedApiKey:
     raw_key: str
     salt: str
     key_hash: str
+    key_id: str
 
 
 def generate_api_key() -> GeneratedApiKey:
     salt = secrets.token_hex(API_KEY_SALT_BYTES)
-    raw_key = secrets.token_urlsafe(API_KEY_BYTES)
+    key_id = secrets.token_hex(API_KEY_ID_BYTES)
+    raw_key = f"{API_KEY_SCHEME}_{key_id}_{secrets.token_urlsafe(API_KEY_BYTES)}"
     key_hash = hash_api_key(raw_key=raw_key, salt=salt)
-    return GeneratedApiKey(raw_key=raw_key, salt=salt, key_hash=key_hash)
+    return GeneratedApiKey(raw_key=raw_key, salt=salt, key_hash=key_hash, key_id=key_id)
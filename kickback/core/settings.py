@@ -10,12 +10,122 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class RateLimitSettings(BaseModel):
     per_min: int = Field(default=100, ge=1)
     burst: int = Field(default=100, ge=1)
+    # "gcra" keeps one key per client and uses the Redis clock instead of the caller's.
+    algorithm: Literal["token_bucket", "gcra"] = "token_bucket"
+    # "leased" spends per-worker blocks of tokens locally and only calls Redis to refill them.
+    mode: Literal["direct", "leased"] = "direct"
+    lease_size: int = Field(default=10, ge=1)
+    lease_ttl_seconds: float = Field(default=1.0, gt=0)
+
+
+class AuthCacheSettings(BaseModel):
+    ttl_seconds: float = Field(default=30.0, gt=0)
+    max_entries: int = Field(default=10_000, ge=1)
+    channel: str = "kickback:auth:invalidate"
+
+
+class IngestSettings(BaseModel):
+    # Batches are charged to the rate limiter per item, so keep this at or below the burst.
+    batch_max_items: int = Field(default=100, ge=1)
+    stream_chunk_size: int = Field(default=100, ge=1)
+    stream_max_line_bytes: int = Field(default=16_384, ge=256)
+    stream_max_errors: int = Field(default=100, ge=0)
+    write_behind_queue_size: int = Field(default=10_000, ge=1)
+    write_behind_flush_items: int = Field(default=500, ge=1)
+    write_behind_flush_interval_seconds: float = Field(default=0.05, gt=0)
+    # Acknowledged signals whose batch still fails after retries are appended here.
+    write_behind_dead_letter_path: str = "var/dead-letter/write-behind.jsonl"
+
+
+class SpoolSettings(BaseModel):
+    # Each API process claims its own worker-<n> slot under this directory.
+    directory: str = "var/spool"
+    segment_max_bytes: int = Field(default=64 * 1024 * 1024, ge=4096)
+    # Per slot, so the disk budget is this times the number of API processes.
+    max_total_bytes: int = Field(default=1024 * 1024 * 1024, ge=4096)
+    # "always" fsyncs every record; "interval" at most once per fsync_interval_seconds.
+    fsync: Literal["always", "interval", "never"] = "interval"
+    fsync_interval_seconds: float = Field(default=1.0, gt=0)
+    replay_batch_size: int = Field(default=500, ge=1)
+    replay_interval_seconds: float = Field(default=1.0, gt=0)
+    # Database calls on the ingest path give up and spool the signal after this long.
+    db_timeout_seconds: float = Field(default=2.0, gt=0)
+
+
+class RetentionSettings(BaseModel):
+    # Whole monthly signal partitions older than this are dropped by kickback-retention.
+    signals_months: int = Field(default=13, ge=1)
+    premake_months: int = Field(default=3, ge=1)
+
+
+class ProjectorSettings(BaseModel):
+    poll_interval_seconds: float = Field(default=2.0, gt=0)
+    # Batches grow while they finish within target_batch_seconds and shrink when caught up.
+    batch_size: int = Field(default=500, ge=1)
+    min_batch_size: int = Field(default=100, ge=1)
+    max_batch_size: int = Field(default=20_000, ge=1)
+    target_batch_seconds: float = Field(default=0.5, gt=0)
+    # Split of signals.shard_bucket (models.SHARD_BUCKETS) used by every projector entry
+    # point; change it with "reshard".
+    shards: int = Field(default=1, ge=1, le=1024)
+    # Registered projections fed by the shared scan; see kickback.services.projections.
+    projections: list[str] = [
+        "search_signals_projector",
+        "search_signals_hourly",
+        "search_signals_weekly",
+    ]
+    backfill_batches: int = Field(default=20, ge=1)
+    # The status endpoint stops counting a checkpoint's unprojected signals here unless
+    # asked for ?exact=true.
+    status_lag_cap: int = Field(default=10_000, ge=1)
+    # On PostgreSQL, LISTEN for insert notifications and only poll as a safety net.
+    listen: bool = True
+    listen_fallback_seconds: float = Field(default=30.0, gt=0)
+    notify_debounce_seconds: float = Field(default=0.05, ge=0)
+
+
+class ScoringSettings(BaseModel):
+    # Applied at query time to each rollup bucket by its age, so rankings never go stale.
+    decay: Literal["exponential", "linear", "none"] = "exponential"
+    half_life_hours: float = Field(default=72.0, gt=0)
+    # Linear decay reaches zero at this age.
+    horizon_hours: float = Field(default=240.0, gt=0)
+    edit_weight: float = Field(default=2.0, ge=0)
+
+
+class SearchSettings(BaseModel):
+    # Results are keyed by the projector checkpoints, so new data never serves stale
+    # entries; the TTL only bounds how far decayed scores drift while nothing changes.
+    cache_ttl_seconds: int = Field(default=300, ge=1)
+    # Longest leaderboard range, as a window or as from/to days; longer requests are rejected.
+    max_window_days: int = Field(default=366, ge=1)
+
+
+class LeaderboardSettings(BaseModel):
+    # Redis sorted sets per day, fed by the "redis_leaderboard" projection.
+    key_prefix: str = "lb"
+    # Longest "<n>d" window served from Redis; day keys expire a day after leaving it.
+    max_window_days: int = Field(default=90, ge=1)
+    # Window unions are reused for this long before being recomputed.
+    union_ttl_seconds: int = Field(default=30, ge=1)
+    # In-process top-K kept as encoded responses (ff_leaderboard_snapshots).
+    snapshot_windows: list[str] = ["1d", "7d", "30d"]
+    snapshot_size: int = Field(default=100, ge=1)
+    snapshot_poll_seconds: float = Field(default=1.0, gt=0)
+    # Recomputed at least this often so decayed scores stay current; not served once older
+    # than twice this, e.g. while the database is unreachable.
+    snapshot_max_age_seconds: float = Field(default=60.0, gt=0)
 
 
 class FlagSettings(BaseModel):
     ff_projector_enabled: bool = True
     ff_cache_enabled: bool = True
     ff_idempotency_redis_guard: bool = False
+    ff_auth_cache_enabled: bool = True
+    ff_signal_write_behind: bool = False
+    ff_ingest_spool: bool = False
+    ff_redis_leaderboard: bool = False
+    ff_leaderboard_snapshots: bool = False
 
 
 class Settings(BaseSettings):
@@ -27,7 +137,17 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
     api_key_header: str = "X-API-KEY"
+    # Fall back to scanning unprefixed (pre key-id) keys; disable once they are rotated out.
+    api_key_legacy_lookup: bool = True
     rate_limit: RateLimitSettings = RateLimitSettings()
+    auth_cache: AuthCacheSettings = AuthCacheSettings()
+    ingest: IngestSettings = IngestSettings()
+    spool: SpoolSettings = SpoolSettings()
+    retention: RetentionSettings = RetentionSettings()
+    projector: ProjectorSettings = ProjectorSettings()
+    scoring: ScoringSettings = ScoringSettings()
+    search: SearchSettings = SearchSettings()
+    leaderboard: LeaderboardSettings = LeaderboardSettings()
     flags: FlagSettings = FlagSettings()
 
 
@@ -11,10 +11,11 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from kickback.core.db import Base
 from kickback.core.types import ApiKeyStatus, PermissionRole, SignalKind
 
-
 TZDateTime = sa.types.DateTime(timezone=True)
 JSONType = JSONB(astext_type=sa.Text()).with_variant(JSON(), "sqlite")
 PKType = sa.BigInteger().with_variant(sa.Integer(), "sqlite")
+# signals.shard_bucket is doc_id modulo this; projector shards own contiguous bucket ranges.
+SHARD_BUCKETS = 1024
 
 
 class User(Base):
@@ -59,10 +60,21 @@ class Permission(Base):
 
 
 class Signal(Base):
+    # On PostgreSQL this table is range-partitioned by month on occurred_at (migration
+    # 0003), so the physical primary key is (id, occurred_at) and idem_key is unique
+    # per occurred_at; signal_idem_keys keeps it unique globally. ids still come from
+    # one sequence, so the mapping keeps id alone.
     __tablename__ = "signals"
+    __table_args__ = (
+        sa.Index("ix_signals_doc_id_occurred_at", "doc_id", "occurred_at"),
+        sa.Index("ix_signals_shard_bucket_id", "shard_bucket", "id"),
+    )
 
     id: Mapped[int] = mapped_column(PKType, primary_key=True, autoincrement=True)
     doc_id: Mapped[int] = mapped_column(PKType, sa.ForeignKey("documents.id"), nullable=False)
+    shard_bucket: Mapped[int] = mapped_column(
+        sa.SmallInteger, sa.Computed(f"doc_id % {SHARD_BUCKETS}", persisted=True), nullable=False
+    )
     user_id: Mapped[int] = mapped_column(PKType, sa.ForeignKey("users.id"), nullable=False)
     kind: Mapped[SignalKind] = mapped_column(sa.Enum(SignalKind, name="signal_kind"), nullable=False)
     occurred_at: Mapped[dt.datetime] = mapped_column(TZDateTime, nullable=False)
@@ -72,11 +84,24 @@ class Signal(Base):
     user: Mapped[User] = relationship("User")
 
 
+class SignalIdemKey(Base):
+    # Global idem_key registry for PostgreSQL, where the partitioned signals table can only
+    # enforce UNIQUE (idem_key, occurred_at). Retention drops keys with their partitions.
+    __tablename__ = "signal_idem_keys"
+    __table_args__ = (sa.Index("ix_signal_idem_keys_occurred_at", "occurred_at"),)
+
+    idem_key: Mapped[str] = mapped_column(sa.String(255), primary_key=True)
+    occurred_at: Mapped[dt.datetime] = mapped_column(TZDateTime, nullable=False)
+
+
 class ApiKey(Base):
     __tablename__ = "api_keys"
 
     id: Mapped[int] = mapped_column(PKType, primary_key=True, autoincrement=True)
     client_name: Mapped[str] = mapped_column(sa.String(255), nullable=False)
+    key_id: Mapped[Optional[str]] = mapped_column(
+        sa.String(32), unique=True, index=True, nullable=True
+    )
     key_hash: Mapped[str] = mapped_column(sa.String(64), nullable=False, unique=True)
     salt: Mapped[str] = mapped_column(sa.String(64), nullable=False)
     roles: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
@@ -91,13 +116,60 @@ class ApiKey(Base):
 
 class SearchSignalsDaily(Base):
     __tablename__ = "search_signals_daily"
-    __table_args__ = (sa.PrimaryKeyConstraint("doc_id", "day"),)
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("doc_id", "day"),
+        # Covers the leaderboard's range scan on day (index-only on PostgreSQL).
+        sa.Index(
+            "ix_search_signals_daily_day_doc_id",
+            "day",
+            "doc_id",
+            postgresql_include=["views", "edits"],
+        ),
+    )
 
     doc_id: Mapped[int] = mapped_column(PKType, nullable=False)
     day: Mapped[dt.date] = mapped_column(sa.Date, nullable=False)
     views: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
     edits: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
-    recency_score: Mapped[float] = mapped_column(sa.Numeric(scale=4, precision=12), nullable=False, default=0.0)
+
+
+class SearchSignalsHourly(Base):
+    __tablename__ = "search_signals_hourly"
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("doc_id", "hour"),
+        # Covers the leaderboard's range scan on hour (index-only on PostgreSQL).
+        sa.Index(
+            "ix_search_signals_hourly_hour_doc_id",
+            "hour",
+            "doc_id",
+            postgresql_include=["views", "edits"],
+        ),
+    )
+
+    doc_id: Mapped[int] = mapped_column(PKType, nullable=False)
+    hour: Mapped[dt.datetime] = mapped_column(TZDateTime, nullable=False)
+    views: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    edits: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+
+
+class SearchSignalsWeekly(Base):
+    __tablename__ = "search_signals_weekly"
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("doc_id", "week"),
+        # Covers the leaderboard's range scan on week (index-only on PostgreSQL).
+        sa.Index(
+            "ix_search_signals_weekly_week_doc_id",
+            "week",
+            "doc_id",
+            postgresql_include=["views", "edits"],
+        ),
+    )
+
+    doc_id: Mapped[int] = mapped_column(PKType, nullable=False)
+    # Monday of the ISO week.
+    week: Mapped[dt.date] = mapped_column(sa.Date, nullable=False)
+    views: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    edits: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
 
 
 class ProjectorState(Base):
@@ -106,3 +178,17 @@ class ProjectorState(Base):
     name: Mapped[str] = mapped_column(sa.String(100), primary_key=True)
     last_signal_id: Mapped[int] = mapped_column(PKType, nullable=False, default=0)
     updated_at: Mapped[dt.datetime] = mapped_column(TZDateTime, server_default=sa.func.now(), nullable=False)
+    # Totals over the batches committed under this checkpoint, by any process.
+    batches: Mapped[int] = mapped_column(
+        sa.BigInteger, nullable=False, default=0, server_default="0"
+    )
+    signals_projected: Mapped[int] = mapped_column(
+        sa.BigInteger, nullable=False, default=0, server_default="0"
+    )
+    upserts: Mapped[int] = mapped_column(
+        sa.BigInteger, nullable=False, default=0, server_default="0"
+    )
+    batch_seconds: Mapped[float] = mapped_column(
+        sa.Float, nullable=False, default=0.0, server_default="0"
+    )
+    last_batch_seconds: Mapped[float | None] = mapped_column(sa.Float, nullable=True)
@@ -40,6 +40,43 @@ class SignalRead(BaseModel):
     idem_key: str | None
 
 
+class SignalAccepted(BaseModel):
+    ack_id: str
+
+
+class SignalBatchCreate(BaseModel):
+    signals: list[SignalCreate] = Field(min_length=1)
+
+
+class SignalBatchItem(BaseModel):
+    index: int
+    status: Literal["created", "duplicate", "forbidden"]
+    id: int | None = None
+
+
+class SignalBatchResult(BaseModel):
+    created: int
+    duplicates: int
+    forbidden: int
+    items: list[SignalBatchItem]
+
+
+class SignalStreamError(BaseModel):
+    line: int
+    offset: int
+    error: str
+
+
+class SignalStreamResult(BaseModel):
+    lines: int
+    created: int
+    duplicates: int
+    forbidden: int
+    invalid: int
+    errors: list[SignalStreamError]
+    errors_truncated: bool = False
+
+
 class LeaderboardQuery(BaseModel):
     window: str = Field(default="7d")
     limit: int = Field(default=10, ge=1, le=100)
@@ -52,6 +89,13 @@ class LeaderboardEntry(BaseModel):
     edits: int
 
 
+class LeaderboardPage(BaseModel):
+    entries: list[LeaderboardEntry]
+    # Scores are decayed to this instant; later pages reuse it so their scores line up.
+    as_of: dt.datetime
+    next_cursor: str | None = None
+
+
 class SignalsDailyQuery(BaseModel):
     doc_id: int
 
@@ -64,6 +108,39 @@ class SignalsDailyEntry(BaseModel):
     recency_score: float
 
 
+class SignalsDailyPage(BaseModel):
+    entries: list[SignalsDailyEntry]
+    next_cursor: str | None = None
+
+
+class ProjectorCheckpointStatus(BaseModel):
+    name: str
+    projection: str
+    shard: Optional[int] = None
+    shards: Optional[int] = None
+    last_signal_id: int
+    # Signals on this checkpoint's shard that it has not projected yet.
+    lag_signals: int
+    # lag_signals stopped at the count cap; the real lag is at least that.
+    lag_signals_capped: bool = False
+    # Age of the oldest unprojected signal's occurred_at; 0 when caught up.
+    lag_seconds: float
+    checkpoint_age_seconds: Optional[float] = None
+    # Totals over every batch committed under this checkpoint, from any process.
+    batches: int = 0
+    signals_projected: int = 0
+    upserts: int = 0
+    signals_per_second: Optional[float] = None
+    last_batch_seconds: Optional[float] = None
+
+
+class ProjectorStatus(BaseModel):
+    max_signal_id: int
+    checkpoints: list[ProjectorCheckpointStatus]
+    # Process-local counters, histograms and rates from projector runs in this process.
+    metrics: dict[str, list[dict[str, Any]]]
+
+
 class ApiKeyCreate(BaseModel):
     client_name: str
     roles: dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Must match the trigger installed by migration 0004_signals_notify.
+SIGNALS_CHANNEL = "kickback_signals"
+
+
+class SignalWakeup:
+    """Wake projector workers when ``signals`` receives inserts.
+
+    On PostgreSQL a statement-level trigger calls ``pg_notify`` on every insert
+    into ``signals``; this holds one dedicated connection that ``LISTEN``s on the
+    channel and sets each worker's event. Other dialects never notify, so
+    ``wait`` degrades to sleeping for ``wait_seconds``, i.e. plain polling.
+
+    While the connection is up, waits stretch to ``fallback_seconds`` since a
+    notification ends them early. Once it is lost, every wait first tries to
+    reconnect and, until that succeeds, polls every ``wait_seconds`` again.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str = SIGNALS_CHANNEL,
+        debounce_seconds: float = 0.05,
+        fallback_seconds: float | None = None,
+    ):
+        self.engine = engine
+        self.channel = channel
+        self.debounce_seconds = debounce_seconds
+        self.fallback_seconds = fallback_seconds
+        self._conn: AsyncConnection | None = None
+        self._stale: AsyncConnection | None = None
+        self._events: list[asyncio.Event] = []
+
+    @property
+    def listening(self) -> bool:
+        return self._conn is not None
+
+    async def start(self) -> bool:
+        if self.engine.dialect.name != "postgresql":
+            return False
+        if self._stale is not None:
+            await self._close(self._stale)
+            self._stale = None
+        try:
+            conn = await self.engine.connect()
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            await driver.add_listener(self.channel, self._on_notify)
+            driver.add_termination_listener(self._on_terminated)
+        except Exception:  # pragma: no cover - network path
+            logger.warning("Signal LISTEN unavailable; polling instead", exc_info=True)
+            return False
+        self._conn = conn
+        logger.info("Listening for signal inserts", extra={"channel": self.channel})
+        return True
+
+    def waiter(self) -> asyncio.Event:
+        """Register a worker; its event is set on every notification."""
+        event = asyncio.Event()
+        self._events.append(event)
+        return event
+
+    async def wait(self, event: asyncio.Event, wait_seconds: float) -> bool:
+        """Wait up to ``wait_seconds`` for a notification; return True if woken by one.
+
+        After a wakeup, sleep ``debounce_seconds`` so a burst of inserts is
+        picked up by one projector pass instead of one pass per statement.
+        """
+        if not self.listening:
+            await self.start()
+        if self.listening and self.fallback_seconds is not None:
+            wait_seconds = max(wait_seconds, self.fallback_seconds)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=wait_seconds)
+        except TimeoutError:
+            return False
+        if self.debounce_seconds:
+            await asyncio.sleep(self.debounce_seconds)
+        event.clear()
+        return True
+
+    async def close(self) -> None:
+        for conn in (self._conn, self._stale):
+            if conn is not None:
+                await self._close(conn)
+        self._conn = self._stale = None
+
+    async def _close(self, conn: AsyncConnection) -> None:
+        try:
+            await conn.close()
+        except Exception:  # pragma: no cover - network path
+            logger.debug("Failed to close listener connection", exc_info=True)
+
+    def _on_notify(self, *_: Any) -> None:
+        for event in self._events:
+            event.set()
+
+    def _on_terminated(self, *_: Any) -> None:
+        # Notifications sent while reconnecting are lost, so wake everyone for a catch-up pass.
+        logger.warning("Signal listener connection lost")
+        self._stale, self._conn = self._conn, None
+        self._on_notify()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import datetime as dt
+import re
+
+SIGNALS_TABLE = "signals"
+DEFAULT_PARTITION = "signals_default"
+_PARTITION_RE = re.compile(r"^signals_p(\d{4})(\d{2})$")
+
+
+def month_start(day: dt.date) -> dt.date:
+    return day.replace(day=1)
+
+
+def add_months(month: dt.date, months: int) -> dt.date:
+    index = month.year * 12 + (month.month - 1) + months
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"signals_p{month.year:04d}{month.month:02d}"
+
+
+def parse_partition_name(name: str) -> dt.date | None:
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return dt.date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: dt.date) -> str:
+    """DDL for the monthly ``signals`` partition covering ``month`` (UTC bounds)."""
+    upper = add_months(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {SIGNALS_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+
+def premake_partition_sql(month: dt.date) -> list[str]:
+    """Statements creating ``month``'s partition even if the default partition has rows in it.
+
+    ``CREATE TABLE ... PARTITION OF`` fails when the default partition already
+    holds rows in the new range, so the partition is built standalone, those
+    rows are moved into it, and it is then attached. Run them in one transaction.
+    """
+    name = partition_name(month)
+    lower = f"'{month.isoformat()} 00:00:00+00'"
+    upper = f"'{add_months(month, 1).isoformat()} 00:00:00+00'"
+    return [
+        f"CREATE TABLE {name} (LIKE {SIGNALS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE occurred_at >= {lower} AND occurred_at < {upper} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {SIGNALS_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ({lower}) TO ({upper})",
+    ]
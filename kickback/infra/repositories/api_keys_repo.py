@@ -20,9 +20,11 @@ class ApiKeyRepository:
         salt: str,
         roles: dict,
         expires_at: dt.datetime | None,
+        key_id: str | None = None,
     ) -> models.ApiKey:
         record = models.ApiKey(
             client_name=client_name,
+            key_id=key_id,
             key_hash=key_hash,
             salt=salt,
             roles=roles,
@@ -39,7 +41,17 @@ class ApiKeyRepository:
         )
         result = await self._session.execute(stmt)
         api_key = result.scalar_one_or_none()
-        if api_key and api_key.expires_at and api_key.expires_at < dt.datetime.now(dt.timezone.utc):
+        if api_key and api_key.expires_at and api_key.expires_at < dt.datetime.now(dt.UTC):
+            return None
+        return api_key
+
+    async def get_active_by_key_id(self, key_id: str) -> models.ApiKey | None:
+        stmt = sa.select(models.ApiKey).where(
+            models.ApiKey.key_id == key_id, models.ApiKey.status == ApiKeyStatus.ACTIVE
+        )
+        result = await self._session.execute(stmt)
+        api_key = result.scalar_one_or_none()
+        if api_key and api_key.expires_at and api_key.expires_at < dt.datetime.now(dt.UTC):
             return None
         return api_key
 
@@ -48,11 +60,13 @@ class ApiKeyRepository:
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
-    async def fetch_active(self) -> list[models.ApiKey]:
+    async def fetch_active(self, legacy_only: bool = False) -> list[models.ApiKey]:
         stmt = sa.select(models.ApiKey).where(models.ApiKey.status == ApiKeyStatus.ACTIVE)
+        if legacy_only:
+            stmt = stmt.where(models.ApiKey.key_id.is_(None))
         result = await self._session.execute(stmt)
         keys = list(result.scalars().all())
-        now = dt.datetime.now(dt.timezone.utc)
+        now = dt.datetime.now(dt.UTC)
         return [key for key in keys if not key.expires_at or key.expires_at >= now]
 
     async def disable(self, api_key_id: int) -> None:
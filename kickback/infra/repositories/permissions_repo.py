@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +21,18 @@ class PermissionRepository:
         role = result.scalar_one_or_none()
         return PermissionRole(role) if role else None
 
+    async def get_roles(
+        self, pairs: Iterable[tuple[int, int]]
+    ) -> dict[tuple[int, int], PermissionRole]:
+        keys = list(set(pairs))
+        if not keys:
+            return {}
+        stmt = sa.select(
+            models.Permission.doc_id, models.Permission.user_id, models.Permission.role
+        ).where(sa.tuple_(models.Permission.doc_id, models.Permission.user_id).in_(keys))
+        result = await self._session.execute(stmt)
+        return {(doc_id, user_id): PermissionRole(role) for doc_id, user_id, role in result.all()}
+
     async def assign(self, doc_id: int, user_id: int, role: PermissionRole) -> models.Permission:
         permission = models.Permission(doc_id=doc_id, user_id=user_id, role=role)
         self._session.add(permission)
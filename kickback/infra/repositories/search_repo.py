@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Sequence
+from typing import Any, AsyncIterator, Callable, Iterable, NamedTuple, Sequence
 
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -10,72 +10,304 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from kickback.domain import models
 
+# Rows per multi-row upsert; five bind parameters each.
+UPSERT_CHUNK_SIZE = 1000
+
+
+class DailyDelta(NamedTuple):
+    doc_id: int
+    day: dt.date
+    views: int
+    edits: int
+
+
+class HourlyDelta(NamedTuple):
+    doc_id: int
+    hour: dt.datetime
+    views: int
+    edits: int
+
+
+class WeeklyDelta(NamedTuple):
+    doc_id: int
+    week: dt.date
+    views: int
+    edits: int
+
+
+class WindowPlan(NamedTuple):
+    """Half-open bucket ranges per rollup table; an upper bound of ``None`` is open-ended."""
+
+    hours: list[tuple[dt.datetime, dt.datetime | None]]
+    days: list[tuple[dt.date, dt.date | None]]
+    weeks: list[tuple[dt.date, dt.date | None]]
+
+
+class BucketWeights(NamedTuple):
+    """Score multiplier per bucket start; buckets not listed weigh zero."""
+
+    hours: dict[dt.datetime, float]
+    days: dict[dt.date, float]
+    weeks: dict[dt.date, float]
+
+
+class WindowTotal(NamedTuple):
+    doc_id: int
+    views: int
+    edits: int
+    score: float
+
 
 class SearchRepository:
     def __init__(self, session: AsyncSession):
         self._session = session
 
-    async def upsert_daily(
-        self,
-        doc_id: int,
-        day: dt.date,
-        views: int,
-        edits: int,
-        recency_score: float,
+    async def merge_daily(
+        self, deltas: Sequence[DailyDelta], table: sa.Table | None = None
     ) -> None:
-        bind = self._session.get_bind()
-        dialect = bind.dialect.name if bind is not None else "postgresql"
+        """Add per-(doc_id, day) counts from one batch with multi-row upserts.
 
-        if dialect == "sqlite":
-            insert_stmt = sqlite_insert(models.SearchSignalsDaily)
-        else:
-            insert_stmt = pg_insert(models.SearchSignalsDaily)
-
-        stmt = insert_stmt.values(
-            doc_id=doc_id,
-            day=day,
-            views=views,
-            edits=edits,
-            recency_score=recency_score,
+        Counts are summed into existing rows; scores are derived at query time.
+        ``table`` defaults to ``search_signals_daily``; rebuilds pass their
+        shadow copy.
+        """
+        if not deltas:
+            return
+        if table is None:
+            table = models.SearchSignalsDaily.__table__
+        await self._upsert_additive(
+            table,
+            ["doc_id", "day"],
+            [delta._asdict() for delta in deltas],
+            lambda excluded: {
+                "views": table.c.views + excluded.views,
+                "edits": table.c.edits + excluded.edits,
+            },
         )
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["doc_id", "day"],
-            set_={
-                "views": views,
-                "edits": edits,
-                "recency_score": recency_score,
+
+    async def merge_hourly(
+        self, deltas: Sequence[HourlyDelta], table: sa.Table | None = None
+    ) -> None:
+        """Add per-(doc_id, hour) counts from one batch; ``table`` as for ``merge_daily``."""
+        if not deltas:
+            return
+        if table is None:
+            table = models.SearchSignalsHourly.__table__
+        await self._upsert_additive(
+            table,
+            ["doc_id", "hour"],
+            [delta._asdict() for delta in deltas],
+            lambda excluded: {
+                "views": table.c.views + excluded.views,
+                "edits": table.c.edits + excluded.edits,
+            },
+        )
+
+    async def merge_weekly(
+        self, deltas: Sequence[WeeklyDelta], table: sa.Table | None = None
+    ) -> None:
+        """Add per-(doc_id, week) counts from one batch; ``table`` as for ``merge_daily``."""
+        if not deltas:
+            return
+        if table is None:
+            table = models.SearchSignalsWeekly.__table__
+        await self._upsert_additive(
+            table,
+            ["doc_id", "week"],
+            [delta._asdict() for delta in deltas],
+            lambda excluded: {
+                "views": table.c.views + excluded.views,
+                "edits": table.c.edits + excluded.edits,
             },
         )
-        await self._session.execute(stmt)
 
-    async def leaderboard(self, since: dt.date, limit: int) -> Sequence[models.SearchSignalsDaily]:
+    async def _upsert_additive(
+        self,
+        table: sa.Table,
+        keys: list[str],
+        rows: list[dict[str, Any]],
+        updates: Callable[[Any], dict[str, Any]],
+    ) -> None:
+        bind = self._session.get_bind()
+        dialect = bind.dialect.name if bind is not None else "postgresql"
+
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            if dialect == "sqlite":
+                insert_stmt = sqlite_insert(table)
+            else:
+                insert_stmt = pg_insert(table)
+
+            stmt = insert_stmt.values(rows[start : start + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates(stmt.excluded))
+            await self._session.execute(stmt)
+
+    async def window_leaderboard(
+        self,
+        plan: WindowPlan,
+        limit: int,
+        weights: BucketWeights,
+        edit_weight: float = 2.0,
+        after: tuple[float, int] | None = None,
+    ) -> list[WindowTotal]:
+        """Rank documents over every bucket in ``plan``, one row per document.
+
+        Each bucket contributes ``(views + edit_weight * edits) * weight``, with
+        the per-bucket weights inlined as a ``CASE`` so decay needs no extra
+        table or join. Every range is served by the rollup's ``(bucket, doc_id)``
+        covering index, an index-only scan on PostgreSQL. ``after`` is the
+        ``(score, doc_id)`` keyset of the previous page's last row.
+        """
+        hourly = models.SearchSignalsHourly.__table__
+        daily = models.SearchSignalsDaily.__table__
+        weekly = models.SearchSignalsWeekly.__table__
+        parts = []
+        for table, column, ranges, bucket_weights in (
+            (hourly, hourly.c.hour, plan.hours, weights.hours),
+            (daily, daily.c.day, plan.days, weights.days),
+            (weekly, weekly.c.week, plan.weeks, weights.weeks),
+        ):
+            if not bucket_weights:
+                continue
+            weight = sa.case(
+                *((column == bucket, factor) for bucket, factor in bucket_weights.items()),
+                else_=0.0,
+            )
+            bucket_score = (table.c.views + table.c.edits * edit_weight) * weight
+            for low, high in ranges:
+                condition = column >= low
+                if high is not None:
+                    condition = condition & (column < high)
+                parts.append(
+                    sa.select(
+                        table.c.doc_id,
+                        table.c.views,
+                        table.c.edits,
+                        bucket_score.label("score"),
+                    ).where(condition)
+                )
+        if not parts:
+            return []
+
+        buckets = sa.union_all(*parts).subquery()
+        views = sa.func.sum(buckets.c.views)
+        edits = sa.func.sum(buckets.c.edits)
+        score = sa.func.sum(buckets.c.score)
         stmt = (
-            sa.select(models.SearchSignalsDaily)
-            .where(models.SearchSignalsDaily.day >= since)
-            .order_by(models.SearchSignalsDaily.recency_score.desc())
+            sa.select(buckets.c.doc_id, views, edits, score)
+            .group_by(buckets.c.doc_id)
+            .order_by(score.desc(), buckets.c.doc_id)
             .limit(limit)
         )
+        if after is not None:
+            last_score, last_doc_id = after
+            stmt = stmt.having(
+                (score < last_score) | ((score == last_score) & (buckets.c.doc_id > last_doc_id))
+            )
         result = await self._session.execute(stmt)
+        return [
+            WindowTotal(doc_id, int(view_count), int(edit_count), float(total))
+            for doc_id, view_count, edit_count, total in result
+        ]
+
+    async def projector_states(self) -> Sequence[models.ProjectorState]:
+        result = await self._session.execute(
+            sa.select(models.ProjectorState).order_by(models.ProjectorState.name)
+        )
         return result.scalars().all()
 
-    async def daily_for_doc(self, doc_id: int) -> Sequence[models.SearchSignalsDaily]:
+    async def projector_checkpoints(self) -> dict[str, int]:
+        result = await self._session.execute(
+            sa.select(models.ProjectorState.name, models.ProjectorState.last_signal_id)
+        )
+        return {name: last_id for name, last_id in result}
+
+    async def stream_daily_since(
+        self, day: dt.date, chunk_size: int = 10_000
+    ) -> AsyncIterator[list[DailyDelta]]:
+        """Yield every daily row from ``day`` onwards in chunks, without loading them all."""
+        table = models.SearchSignalsDaily.__table__
+        stmt = (
+            sa.select(table.c.doc_id, table.c.day, table.c.views, table.c.edits)
+            .where(table.c.day >= day)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self._session.stream(stmt)
+        async for partition in result.partitions():
+            yield [DailyDelta(*row) for row in partition]
+
+    async def daily_for_doc(
+        self,
+        doc_id: int,
+        limit: int | None = None,
+        start_day: dt.date | None = None,
+        end_day: dt.date | None = None,
+        before_day: dt.date | None = None,
+    ) -> Sequence[DailyDelta]:
+        """Newest-first rows for ``doc_id``; a range scan on the ``(doc_id, day)`` key.
+
+        ``start_day``/``end_day`` are inclusive; ``before_day`` is the keyset of
+        the previous page.
+        """
+        table = models.SearchSignalsDaily.__table__
         stmt = (
-            sa.select(models.SearchSignalsDaily)
-            .where(models.SearchSignalsDaily.doc_id == doc_id)
-            .order_by(models.SearchSignalsDaily.day.desc())
+            sa.select(table.c.doc_id, table.c.day, table.c.views, table.c.edits)
+            .where(table.c.doc_id == doc_id)
+            .order_by(table.c.day.desc())
         )
+        if start_day is not None:
+            stmt = stmt.where(table.c.day >= start_day)
+        if end_day is not None:
+            stmt = stmt.where(table.c.day <= end_day)
+        if before_day is not None:
+            stmt = stmt.where(table.c.day < before_day)
+        if limit is not None:
+            stmt = stmt.limit(limit)
         result = await self._session.execute(stmt)
-        return result.scalars().all()
+        return [DailyDelta(*row) for row in result]
 
     async def get_projector_state(self, name: str) -> models.ProjectorState | None:
-        stmt = sa.select(models.ProjectorState).where(models.ProjectorState.name == name)
+        # Checkpoints are shared between workers; never trust a copy already in the identity map.
+        stmt = (
+            sa.select(models.ProjectorState)
+            .where(models.ProjectorState.name == name)
+            .execution_options(populate_existing=True)
+        )
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def update_projector_state(self, name: str, last_signal_id: int) -> None:
-        existing = await self.get_projector_state(name)
-        if existing:
-            existing.last_signal_id = last_signal_id
+    async def delete_projector_states(self, names: Iterable[str]) -> None:
+        names = list(names)
+        if names:
+            await self._session.execute(
+                sa.delete(models.ProjectorState).where(models.ProjectorState.name.in_(names))
+            )
+
+    async def update_projector_state(
+        self,
+        name: str,
+        last_signal_id: int,
+        signals: int = 0,
+        upserts: int = 0,
+        seconds: float | None = None,
+    ) -> None:
+        """Move checkpoint ``name``; with ``seconds``, also add one batch to its totals."""
+        state = await self.get_projector_state(name)
+        if state:
+            state.last_signal_id = last_signal_id
+            state.updated_at = dt.datetime.now(dt.UTC)
         else:
-            state = models.ProjectorState(name=name, last_signal_id=last_signal_id)
+            state = models.ProjectorState(
+                name=name,
+                last_signal_id=last_signal_id,
+                batches=0,
+                signals_projected=0,
+                upserts=0,
+                batch_seconds=0.0,
+            )
             self._session.add(state)
+        if seconds is not None:
+            state.batches += 1
+            state.signals_projected += signals
+            state.upserts += upserts
+            state.batch_seconds += seconds
+            state.last_batch_seconds = seconds
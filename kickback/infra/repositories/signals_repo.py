@@ -1,20 +1,65 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Iterable, List
+from typing import Iterable, List, Sequence
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from kickback.core.types import SignalKind
 from kickback.domain import models, schemas
 
+# Rows per multi-row INSERT; keeps bind parameters well under the driver limits.
+INSERT_CHUNK_SIZE = 1000
+
+# (id, doc_id, user_id, kind, occurred_at)
+SignalScanRow = tuple[int, int, int, SignalKind, dt.datetime]
+
+
+def shard_buckets(shard: int, shards: int) -> tuple[int, int]:
+    """The ``[start, stop)`` range of ``signals.shard_bucket`` that ``shard`` owns."""
+    return (
+        -(-shard * models.SHARD_BUCKETS // shards),
+        -(-(shard + 1) * models.SHARD_BUCKETS // shards),
+    )
+
+
+def shard_of(doc_id: int, shards: int) -> int:
+    """The shard whose bucket range holds ``doc_id``."""
+    return doc_id % models.SHARD_BUCKETS * shards // models.SHARD_BUCKETS
+
+
+def _in_shard(stmt: sa.Select, shard: int, shards: int) -> sa.Select:
+    if shards <= 1:
+        return stmt
+    start, stop = shard_buckets(shard, shards)
+    return stmt.where(models.Signal.shard_bucket >= start, models.Signal.shard_bucket < stop)
+
+
+def _after_id(
+    stmt: sa.Select, last_id: int, limit: int, shard: int, shards: int, until_id: int | None = None
+) -> sa.Select:
+    # Partitions are ranged on occurred_at, so the id filter cannot prune any: every
+    # partition is probed through its (id, occurred_at) primary key and the results
+    # merged. Retention keeps the partition count, and so the probes, bounded.
+    # A shard reads its bucket range through (shard_bucket, id), so it only touches
+    # its own rows past the checkpoint and shards do not multiply the scan.
+    stmt = stmt.where(models.Signal.id > last_id).order_by(models.Signal.id).limit(limit)
+    if until_id is not None:
+        stmt = stmt.where(models.Signal.id <= until_id)
+    return _in_shard(stmt, shard, shards)
+
 
 class SignalRepository:
     def __init__(self, session: AsyncSession):
         self._session = session
 
     async def create(self, payload: schemas.SignalCreate) -> models.Signal:
+        if payload.idem_key is not None and not await self._claim_idem_keys([payload]):
+            raise DuplicateSignalError
         signal = models.Signal(
             doc_id=payload.doc_id,
             user_id=payload.user_id,
@@ -29,25 +74,158 @@ class SignalRepository:
             raise DuplicateSignalError from exc
         return signal
 
-    async def fetch_batch(self, last_id: int, limit: int) -> list[models.Signal]:
+    async def bulk_create(self, payloads: Sequence[schemas.SignalCreate]) -> list[int | None]:
+        """Insert many signals with multi-row statements.
+
+        Returns the new id for each payload, in order, or ``None`` where the
+        ``idem_key`` already exists (in the table or earlier in ``payloads``).
+        """
+        ids: list[int | None] = [None] * len(payloads)
+        keyed: dict[str, int] = {}
+        unkeyed: list[int] = []
+        for index, payload in enumerate(payloads):
+            if payload.idem_key is None:
+                unkeyed.append(index)
+            elif payload.idem_key not in keyed:
+                keyed[payload.idem_key] = index
+
+        keyed_indexes = list(keyed.values())
+        for start in range(0, len(keyed_indexes), INSERT_CHUNK_SIZE):
+            chunk = keyed_indexes[start : start + INSERT_CHUNK_SIZE]
+            claimed = await self._claim_idem_keys([payloads[index] for index in chunk])
+            chunk = [index for index in chunk if payloads[index].idem_key in claimed]
+            if not chunk:
+                continue
+            stmt = (
+                self._insert()
+                .values([_row(payloads[index]) for index in chunk])
+                .on_conflict_do_nothing()
+                .returning(models.Signal.id, models.Signal.idem_key)
+            )
+            result = await self._session.execute(stmt)
+            for signal_id, idem_key in result.all():
+                ids[keyed[idem_key]] = signal_id
+
+        for start in range(0, len(unkeyed), INSERT_CHUNK_SIZE):
+            chunk = unkeyed[start : start + INSERT_CHUNK_SIZE]
+            stmt = sa.insert(models.Signal).returning(
+                models.Signal.id, sort_by_parameter_order=True
+            )
+            result = await self._session.execute(stmt, [_row(payloads[index]) for index in chunk])
+            for index, signal_id in zip(chunk, result.scalars().all(), strict=True):
+                ids[index] = signal_id
+
+        return ids
+
+    async def _claim_idem_keys(self, payloads: Sequence[schemas.SignalCreate]) -> set[str]:
+        """Register the payloads' idem keys; returns those that were not taken yet.
+
+        Only PostgreSQL needs the registry: elsewhere ``signals.idem_key`` is
+        unique on its own, and every key is reported as claimed. A claim is
+        part of the caller's transaction, so a concurrent claim of the same key
+        waits for it and a rollback releases it.
+        """
+        keys = {payload.idem_key: payload.occurred_at for payload in payloads if payload.idem_key}
+        if not keys or self._dialect() == "sqlite":
+            return set(keys)
         stmt = (
-            sa.select(models.Signal)
-            .where(models.Signal.id > last_id)
-            .order_by(models.Signal.id)
-            .limit(limit)
+            pg_insert(models.SignalIdemKey)
+            .values([{"idem_key": key, "occurred_at": at} for key, at in keys.items()])
+            .on_conflict_do_nothing()
+            .returning(models.SignalIdemKey.idem_key)
         )
         result = await self._session.execute(stmt)
+        return set(result.scalars().all())
+
+    def _dialect(self) -> str:
+        bind = self._session.get_bind()
+        return bind.dialect.name if bind is not None else "postgresql"
+
+    def _insert(self):
+        if self._dialect() == "sqlite":
+            return sqlite_insert(models.Signal)
+        return pg_insert(models.Signal)
+
+    async def fetch_batch(
+        self, last_id: int, limit: int, shard: int = 0, shards: int = 1
+    ) -> list[models.Signal]:
+        stmt = _after_id(sa.select(models.Signal), last_id, limit, shard, shards)
+        result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
-    async def events_in_window(self, doc_ids: Iterable[int], since: dt.datetime) -> list[models.Signal]:
+    async def fetch_rows(
+        self,
+        last_id: int,
+        limit: int,
+        shard: int = 0,
+        shards: int = 1,
+        until_id: int | None = None,
+    ) -> list[SignalScanRow]:
+        """Like ``fetch_batch`` but only the projected columns, as plain tuples.
+
+        Skips ORM identity-map bookkeeping, which dominates large catch-up batches.
+        """
+        columns = sa.select(
+            models.Signal.id,
+            models.Signal.doc_id,
+            models.Signal.user_id,
+            models.Signal.kind,
+            models.Signal.occurred_at,
+        )
+        stmt = _after_id(columns, last_id, limit, shard, shards, until_id)
+        result = await self._session.execute(stmt)
+        return [tuple(row) for row in result]
+
+    async def max_id(self) -> int:
+        return int(await self._session.scalar(sa.select(sa.func.max(models.Signal.id))) or 0)
+
+    async def count_after(
+        self, last_id: int, shard: int = 0, shards: int = 1, limit: int | None = None
+    ) -> int:
+        """Signals a checkpoint at ``last_id`` on ``shard`` has not seen, up to ``limit``."""
+        pending = _in_shard(
+            sa.select(models.Signal.id).where(models.Signal.id > last_id), shard, shards
+        )
+        if limit is not None:
+            pending = pending.limit(limit)
+        stmt = sa.select(sa.func.count()).select_from(pending.subquery())
+        return int(await self._session.scalar(stmt) or 0)
+
+    async def first_occurred_after(
+        self, last_id: int, shard: int = 0, shards: int = 1
+    ) -> dt.datetime | None:
+        """``occurred_at`` of the next signal a checkpoint at ``last_id`` has not seen."""
+        stmt = _after_id(sa.select(models.Signal.occurred_at), last_id, 1, shard, shards)
+        return await self._session.scalar(stmt)
+
+    async def events_in_window(
+        self,
+        doc_ids: Iterable[int],
+        since: dt.datetime,
+        until: dt.datetime | None = None,
+    ) -> list[models.Signal]:
+        # Compare the bare partition key against bound timestamps so the planner can
+        # prune partitions outside [since, until).
         stmt = (
             sa.select(models.Signal)
             .where(models.Signal.doc_id.in_(list(doc_ids)))
             .where(models.Signal.occurred_at >= since)
         )
+        if until is not None:
+            stmt = stmt.where(models.Signal.occurred_at < until)
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
 
+def _row(payload: schemas.SignalCreate) -> dict:
+    return {
+        "doc_id": payload.doc_id,
+        "user_id": payload.user_id,
+        "kind": payload.kind,
+        "occurred_at": payload.occurred_at,
+        "idem_key": payload.idem_key,
+    }
+
+
 class DuplicateSignalError(Exception):
     ...
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+logger = logging.getLogger(__name__)
+
+# Each record is framed as <payload length><crc32 of payload><payload>, big endian.
+_HEADER = struct.Struct(">II")
+_SEGMENT_SUFFIX = ".seg"
+_CHECKPOINT_NAME = "replay.offset"
+_LOCK_NAME = "spool.lock"
+_DEAD_LETTER_NAME = "dead-letter.jsonl"
+
+FsyncPolicy = Literal["always", "interval", "never"]
+
+
+class SpoolFullError(Exception):
+    ...
+
+
+class SpoolLockedError(Exception):
+    ...
+
+
+@dataclass(frozen=True)
+class SpoolPosition:
+    segment: int
+    offset: int
+
+
+@dataclass(frozen=True)
+class SpoolRecord:
+    # Position just past this record; committing it acknowledges the record.
+    position: SpoolPosition
+    data: dict[str, Any]
+
+
+class DeadLetterFile:
+    """JSON-lines file of records that were accepted but could not be stored.
+
+    Entries are appended and fsynced so an operator can inspect and re-submit
+    them; nothing in the service reads the file back.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, entries: list[dict[str, Any]]) -> None:
+        if not entries:
+            return
+        lines = b"".join(
+            json.dumps(entry, default=str, separators=(",", ":")).encode("utf-8") + b"\n"
+            for entry in entries
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as handle:
+                handle.write(lines)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def count(self) -> int:
+        if not self.path.exists():
+            return 0
+        with self.path.open("rb") as handle:
+            return sum(1 for _ in handle)
+
+
+class IngestSpool:
+    """Append-only, segmented on-disk log of accepted records.
+
+    Writers append JSON records to the newest segment and roll to a new one
+    past ``segment_max_bytes``. A reader replays from the persisted checkpoint
+    and calls :meth:`commit` once records are safely stored elsewhere, which
+    deletes fully replayed segments. A torn record at the tail (crash during
+    append) ends replay of that segment; a corrupt record in a sealed segment
+    is logged and the rest of that segment skipped.
+
+    Opening a spool takes an exclusive ``flock`` on ``spool.lock`` for the
+    life of the object, so the API process and the CLI never truncate,
+    replay or delete segments under each other; the second opener gets
+    :class:`SpoolLockedError`. Each API process therefore uses its own
+    directory (see ``claim_spool``). Records the replayer cannot store go to
+    ``dead-letter.jsonl`` in the same directory.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_max_bytes: int,
+        max_total_bytes: int,
+        fsync: FsyncPolicy = "interval",
+        fsync_interval_seconds: float = 1.0,
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.fsync = fsync
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self._lock = threading.Lock()
+        self._handle: Any = None
+        self._active_segment = 0
+        self._active_size = 0
+        self._last_fsync = 0.0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_handle: Any = self._acquire_lock()
+        self.dead_letters = DeadLetterFile(self.directory / _DEAD_LETTER_NAME)
+        segments = self._segments()
+        self._active_segment = segments[-1] if segments else 1
+        if segments:
+            self._truncate_torn_tail(self._segment_path(self._active_segment))
+        self._total_bytes = self._disk_bytes()
+
+    def append(self, record: dict[str, Any]) -> None:
+        payload = json.dumps(record, default=str, separators=(",", ":")).encode("utf-8")
+        frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._total_bytes + len(frame) > self.max_total_bytes:
+                raise SpoolFullError
+            handle = self._writer(len(frame))
+            handle.write(frame)
+            handle.flush()
+            self._active_size += len(frame)
+            self._total_bytes += len(frame)
+            now = time.monotonic()
+            if self.fsync == "always" or (
+                self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval_seconds
+            ):
+                os.fsync(handle.fileno())
+                self._last_fsync = now
+
+    def read(self, limit: int) -> list[SpoolRecord]:
+        """Return up to ``limit`` records after the checkpoint, oldest first."""
+        records: list[SpoolRecord] = []
+        for record in self._iter_from(self.checkpoint()):
+            records.append(record)
+            if len(records) >= limit:
+                break
+        return records
+
+    def commit(self, position: SpoolPosition) -> None:
+        with self._lock:
+            tmp = self.directory / f"{_CHECKPOINT_NAME}.tmp"
+            tmp.write_text(f"{position.segment} {position.offset}", encoding="utf-8")
+            os.replace(tmp, self.directory / _CHECKPOINT_NAME)
+            for seq in self._segments():
+                if seq >= position.segment or seq == self._active_segment:
+                    break
+                self._segment_path(seq).unlink()
+            self._total_bytes = self._disk_bytes()
+
+    def checkpoint(self) -> SpoolPosition:
+        path = self.directory / _CHECKPOINT_NAME
+        if not path.exists():
+            segments = self._segments()
+            return SpoolPosition(segments[0] if segments else 1, 0)
+        segment, offset = path.read_text(encoding="utf-8").split()
+        return SpoolPosition(int(segment), int(offset))
+
+    def stats(self) -> dict[str, Any]:
+        pending = sum(1 for _ in self._iter_from(self.checkpoint()))
+        checkpoint = self.checkpoint()
+        return {
+            "directory": str(self.directory),
+            "segments": len(self._segments()),
+            "bytes": self._disk_bytes(),
+            "pending_records": pending,
+            "dead_letters": self.dead_letters.count(),
+            "checkpoint": {"segment": checkpoint.segment, "offset": checkpoint.offset},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+                if self.fsync != "never":
+                    os.fsync(self._handle.fileno())
+                self._handle.close()
+                self._handle = None
+            if self._lock_handle is not None:
+                fcntl.flock(self._lock_handle.fileno(), fcntl.LOCK_UN)
+                self._lock_handle.close()
+                self._lock_handle = None
+
+    def _acquire_lock(self) -> Any:
+        handle = (self.directory / _LOCK_NAME).open("ab")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as exc:
+            handle.close()
+            raise SpoolLockedError(f"{self.directory} is in use by another process") from exc
+        return handle
+
+    def _disk_bytes(self) -> int:
+        return sum(self._segment_path(seq).stat().st_size for seq in self._segments())
+
+    def _writer(self, frame_size: int) -> Any:
+        if self._handle is None:
+            path = self._segment_path(self._active_segment)
+            self._handle = path.open("ab")
+            self._active_size = path.stat().st_size
+        if self._active_size and self._active_size + frame_size > self.segment_max_bytes:
+            if self.fsync != "never":
+                os.fsync(self._handle.fileno())
+            self._handle.close()
+            self._active_segment += 1
+            self._handle = self._segment_path(self._active_segment).open("ab")
+            self._active_size = 0
+        return self._handle
+
+    def _iter_from(self, start: SpoolPosition) -> Iterator[SpoolRecord]:
+        for seq in self._segments():
+            if seq < start.segment:
+                continue
+            offset = start.offset if seq == start.segment else 0
+            with self._segment_path(seq).open("rb") as handle:
+                handle.seek(offset)
+                while True:
+                    header = handle.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        break
+                    length, checksum = _HEADER.unpack(header)
+                    payload = handle.read(length)
+                    if len(payload) < length:
+                        break
+                    if zlib.crc32(payload) != checksum:
+                        logger.warning(
+                            "Spool record failed checksum; skipping rest of segment",
+                            extra={"segment": seq, "offset": offset},
+                        )
+                        break
+                    offset += _HEADER.size + length
+                    yield SpoolRecord(SpoolPosition(seq, offset), json.loads(payload))
+
+    def _truncate_torn_tail(self, path: Path) -> None:
+        valid = 0
+        with path.open("rb") as handle:
+            while True:
+                header = handle.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                length, checksum = _HEADER.unpack(header)
+                payload = handle.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                valid += _HEADER.size + length
+        size = path.stat().st_size
+        if valid < size:
+            logger.warning(
+                "Truncating torn spool tail",
+                extra={"segment": path.name, "dropped_bytes": size - valid},
+            )
+            os.truncate(path, valid)
+
+    def _segments(self) -> list[int]:
+        return sorted(
+            int(path.stem)
+            for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}")
+            if path.stem.isdigit()
+        )
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"{seq:016d}{_SEGMENT_SUFFIX}"
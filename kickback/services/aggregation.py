@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Callable, Sequence
+
+from kickback.core.types import SignalKind
+from kickback.infra.repositories.search_repo import DailyDelta, HourlyDelta, WeeklyDelta
+from kickback.infra.repositories.signals_repo import SignalScanRow
+
+try:  # optional: pip install kickback[fast]
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+
+# Below this many rows the NumPy setup costs more than it saves.
+VECTORIZE_MIN_ROWS = 2_000
+
+
+def aggregate_daily(
+    rows: Sequence[SignalScanRow], vectorize: bool | None = None
+) -> list[DailyDelta]:
+    """Fold ``(id, doc_id, kind, occurred_at)`` rows into per-(doc, day) deltas.
+
+    Uses NumPy grouping when it is installed and the batch is large enough,
+    otherwise a flat dict of ``[views, edits]`` counters. Both produce the same
+    deltas in first-seen order.
+    """
+    if vectorize is None:
+        vectorize = np is not None and len(rows) >= VECTORIZE_MIN_ROWS
+    if not rows:
+        return []
+    count = _count_numpy if vectorize else _count_python
+    doc_ids, days, views, edits = count(rows, _day)
+    return [
+        DailyDelta(doc_id=doc_id, day=dt.date.fromordinal(day), views=view_count, edits=edit_count)
+        for doc_id, day, view_count, edit_count in zip(doc_ids, days, views, edits, strict=True)
+    ]
+
+
+def aggregate_hourly(
+    rows: Sequence[SignalScanRow], vectorize: bool | None = None
+) -> list[HourlyDelta]:
+    """Fold rows into per-(doc, UTC hour) view/edit counts."""
+    if vectorize is None:
+        vectorize = np is not None and len(rows) >= VECTORIZE_MIN_ROWS
+    if not rows:
+        return []
+    count = _count_numpy if vectorize else _count_python
+    doc_ids, hours, views, edits = count(rows, _hour)
+    return [
+        HourlyDelta(doc_id=doc_id, hour=hour_start(hour), views=view_count, edits=edit_count)
+        for doc_id, hour, view_count, edit_count in zip(doc_ids, hours, views, edits, strict=True)
+    ]
+
+
+def aggregate_weekly(
+    rows: Sequence[SignalScanRow], vectorize: bool | None = None
+) -> list[WeeklyDelta]:
+    """Fold rows into per-(doc, ISO week) view/edit counts, keyed by the week's Monday."""
+    if vectorize is None:
+        vectorize = np is not None and len(rows) >= VECTORIZE_MIN_ROWS
+    if not rows:
+        return []
+    count = _count_numpy if vectorize else _count_python
+    doc_ids, weeks, views, edits = count(rows, _week)
+    return [
+        WeeklyDelta(doc_id=doc_id, week=week_start(week), views=view_count, edits=edit_count)
+        for doc_id, week, view_count, edit_count in zip(doc_ids, weeks, views, edits, strict=True)
+    ]
+
+
+def week_start(week: int) -> dt.date:
+    # Ordinal 1 (0001-01-01) is a Monday, so weeks are 7-day blocks counted from it.
+    return dt.date.fromordinal(week * 7 + 1)
+
+
+def hour_start(hour: int) -> dt.datetime:
+    day, hour_of_day = divmod(hour, 24)
+    return dt.datetime.combine(dt.date.fromordinal(day), dt.time(hour_of_day), dt.UTC)
+
+
+Counts = tuple[list[int], list[int], list[int], list[int]]
+Bucket = Callable[[dt.datetime], int]
+
+
+def _utc(occurred_at: dt.datetime) -> dt.datetime:
+    # Naive values (SQLite) are already UTC; aware ones may carry any offset.
+    if occurred_at.tzinfo is not None:
+        return occurred_at.astimezone(dt.UTC)
+    return occurred_at
+
+
+def _day(occurred_at: dt.datetime) -> int:
+    return _utc(occurred_at).toordinal()
+
+
+def _week(occurred_at: dt.datetime) -> int:
+    return (_utc(occurred_at).toordinal() - 1) // 7
+
+
+def _hour(occurred_at: dt.datetime) -> int:
+    occurred_at = _utc(occurred_at)
+    return occurred_at.toordinal() * 24 + occurred_at.hour
+
+
+def _count_python(rows: Sequence[SignalScanRow], bucket: Bucket) -> Counts:
+    counts: dict[tuple[int, int], list[int]] = {}
+    view = SignalKind.VIEW
+    for _, doc_id, _, kind, occurred_at in rows:
+        key = (doc_id, bucket(occurred_at))
+        counter = counts.get(key)
+        if counter is None:
+            counter = counts[key] = [0, 0]
+        counter[kind != view] += 1
+    doc_ids = [doc_id for doc_id, _ in counts]
+    buckets = [key for _, key in counts]
+    views = [counter[0] for counter in counts.values()]
+    edits = [counter[1] for counter in counts.values()]
+    return doc_ids, buckets, views, edits
+
+
+def _count_numpy(rows: Sequence[SignalScanRow], bucket: Bucket) -> Counts:
+    if np is None:
+        raise RuntimeError("numpy is not installed")
+    _, doc_column, _, kind_column, time_column = zip(*rows, strict=True)
+    doc_ids = np.array(doc_column, dtype=np.int64)
+    buckets = np.array([bucket(occurred_at) for occurred_at in time_column], dtype=np.int64)
+    view = SignalKind.VIEW
+    edits = np.fromiter((kind != view for kind in kind_column), dtype=bool, count=len(rows))
+
+    # One int64 key per (doc, bucket): doc offset * bucket span + bucket offset.
+    low = int(buckets.min())
+    keys = (doc_ids - int(doc_ids.min())) * (int(buckets.max()) - low + 1) + (buckets - low)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    totals = np.bincount(inverse)
+    edit_totals = np.bincount(inverse, weights=edits).astype(np.int64)
+
+    order = np.argsort(first, kind="stable")
+    firsts = first[order]
+    return (
+        doc_ids[firsts].tolist(),
+        buckets[firsts].tolist(),
+        (totals - edit_totals)[order].tolist(),
+        edit_totals[order].tolist(),
+    )
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from kickback.core import flags
+from kickback.core.auth_cache import publish_invalidation
 from kickback.core.security import generate_api_key
 from kickback.domain import schemas
 from kickback.infra.repositories.api_keys_repo import ApiKeyRepository
@@ -24,6 +26,7 @@ class ApiKeyService:
             salt=generated.salt,
             roles=payload.roles,
             expires_at=payload.expires_at,
+            key_id=generated.key_id,
         )
         return schemas.ApiKeyWithSecret(
             id=record.id,
@@ -49,3 +52,8 @@ class ApiKeyService:
 
     async def disable(self, api_key_id: int) -> None:
         await self.repo.disable(api_key_id)
+        if flags.auth_cache_enabled():
+            # Commit first: a replica that evicts and re-reads before the commit
+            # would cache the key as still active.
+            await self.session.commit()
+            await publish_invalidation(api_key_id)
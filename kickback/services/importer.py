@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import datetime as dt
+import itertools
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from kickback.core.types import SignalKind
+from kickback.domain import models
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+SignalRow = tuple[int, int, str, dt.datetime, str | None]
+
+_COLUMNS = ("doc_id", "user_id", "kind", "occurred_at", "idem_key")
+# ImportProgress fields persisted to the state file.
+_STATE_FIELDS = ("worker", "start", "end", "committed_offset", "done")
+_STAGING_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS signals_import (
+    doc_id bigint, user_id bigint, kind text, occurred_at timestamptz, idem_key varchar(255)
+) ON COMMIT DELETE ROWS
+"""
+# Keyed rows are only merged once their idem_key is claimed in signal_idem_keys, which
+# keeps keys unique across the monthly partitions; DISTINCT ON drops in-chunk repeats.
+_STAGING_MERGE = """
+WITH keyed AS (
+    SELECT DISTINCT ON (idem_key) * FROM signals_import
+    WHERE idem_key IS NOT NULL ORDER BY idem_key, occurred_at
+), claimed AS (
+    INSERT INTO signal_idem_keys (idem_key, occurred_at)
+    SELECT idem_key, occurred_at FROM keyed
+    ON CONFLICT DO NOTHING
+    RETURNING idem_key
+)
+INSERT INTO signals (doc_id, user_id, kind, occurred_at, idem_key)
+SELECT doc_id, user_id, kind::signal_kind, occurred_at, idem_key FROM signals_import
+WHERE idem_key IS NULL
+UNION ALL
+SELECT doc_id, user_id, kind::signal_kind, occurred_at, idem_key FROM keyed
+WHERE idem_key IN (SELECT idem_key FROM claimed)
+ON CONFLICT DO NOTHING
+"""
+
+
+@dataclass
+class ImportProgress:
+    worker: int
+    start: int
+    end: int
+    committed_offset: int
+    rows: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    done: bool = False
+
+
+@dataclass
+class ImportReport:
+    rows: int
+    inserted: int
+    invalid: int
+    seconds: float
+    resume_offset: int | None
+    workers: list[ImportProgress] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class SignalImporter:
+    """Load historical signals from CSV or NDJSON files.
+
+    On PostgreSQL each chunk is binary-COPYed into a temporary staging table
+    with asyncpg and merged with ``INSERT ... SELECT ... ON CONFLICT DO
+    NOTHING``, so rows with an existing ``idem_key`` are skipped instead of
+    failing the chunk. Other dialects fall back to chunked executemany.
+
+    The file is split into ``workers`` newline-aligned byte ranges, each loaded
+    on its own connection. CSV files need a header row and no quoted newlines.
+
+    With ``state_path`` set, every range's ``committed_offset`` is written there
+    after each chunk commits, and a later run over the same file resumes each
+    range from its own offset, so committed rows are not imported twice. Only a
+    crash between a chunk's commit and the state write replays that one chunk.
+    The file is removed once every range finished. ``start_offset`` is a single
+    position and so only resumes single-worker imports.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        fmt: ImportFormat,
+        workers: int = 1,
+        chunk_size: int = 10_000,
+        report_every_seconds: float = 5.0,
+        state_path: str | Path | None = None,
+    ):
+        self.engine = engine
+        self.fmt = fmt
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.report_every_seconds = report_every_seconds
+        self.state_path = Path(state_path) if state_path is not None else None
+
+    async def run(self, path: str | Path, start_offset: int = 0) -> ImportReport:
+        path = Path(path)
+        size = path.stat().st_size
+        header, data_start = self._read_header(path)
+        progress = self._load_state(path, size)
+        if progress is not None:
+            if start_offset:
+                raise ValueError(f"{self.state_path} exists; resume from it without a start offset")
+            logger.info("Resuming import", extra={"state_file": str(self.state_path)})
+        else:
+            if start_offset and self.workers > 1:
+                raise ValueError(
+                    "A start offset only resumes single-worker imports; "
+                    "parallel imports resume from their state file"
+                )
+            start = max(start_offset, data_start)
+            progress = [
+                ImportProgress(worker=index, start=lo, end=hi, committed_offset=lo)
+                for index, (lo, hi) in enumerate(self._split(path, start, size))
+            ]
+        state = {"path": str(path.resolve()), "size": size, "format": self.fmt}
+        self._save_state(state, progress)
+
+        started = time.perf_counter()
+        reporter = asyncio.create_task(self._report(progress, started))
+        try:
+            # A TaskGroup cancels the other ranges when one fails, so the state stops moving.
+            async with asyncio.TaskGroup() as group:
+                for item in progress:
+                    group.create_task(self._load_range(path, header, item, state, progress))
+        except* Exception as failure:
+            logger.error(
+                "Import failed",
+                extra={
+                    "resume_offset": _resume_offset(progress),
+                    "state_file": str(self.state_path) if self.state_path else None,
+                },
+            )
+            raise failure.exceptions[0] from None
+        finally:
+            reporter.cancel()
+        if self.state_path is not None:
+            self.state_path.unlink(missing_ok=True)
+
+        elapsed = time.perf_counter() - started
+        report = ImportReport(
+            rows=sum(item.rows for item in progress),
+            inserted=sum(item.inserted for item in progress),
+            invalid=sum(item.invalid for item in progress),
+            seconds=elapsed,
+            resume_offset=_resume_offset(progress),
+            workers=progress,
+        )
+        logger.info(
+            "Import finished",
+            extra={
+                "rows": report.rows,
+                "inserted": report.inserted,
+                "invalid": report.invalid,
+                "rows_per_sec": round(report.rows_per_second, 1),
+            },
+        )
+        return report
+
+    def _read_header(self, path: Path) -> tuple[list[str] | None, int]:
+        if self.fmt != "csv":
+            return None, 0
+        with path.open("rb") as handle:
+            first = handle.readline()
+        header = [name.strip() for name in next(csv.reader([first.decode("utf-8")]))]
+        missing = set(_COLUMNS) - {"idem_key"} - set(header)
+        if missing:
+            raise ValueError(f"CSV header missing columns: {sorted(missing)}")
+        return header, len(first)
+
+    def _split(self, path: Path, start: int, end: int) -> list[tuple[int, int]]:
+        if start >= end:
+            return []
+        step = max(1, (end - start) // self.workers)
+        bounds = [start]
+        with path.open("rb") as handle:
+            for index in range(1, self.workers):
+                handle.seek(start + index * step - 1)
+                handle.readline()
+                bounds.append(min(max(handle.tell(), bounds[-1]), end))
+        bounds.append(end)
+        return [(lo, hi) for lo, hi in itertools.pairwise(bounds) if hi > lo]
+
+    async def _load_range(
+        self,
+        path: Path,
+        header: list[str] | None,
+        progress: ImportProgress,
+        state: dict[str, Any],
+        ranges: list[ImportProgress],
+    ) -> None:
+        if progress.done:
+            return
+        chunk: list[SignalRow] = []
+        for offset, row in self._iter_rows(path, header, progress):
+            if row is None:
+                progress.invalid += 1
+            else:
+                chunk.append(row)
+            progress.rows += 1
+            if len(chunk) >= self.chunk_size:
+                await self._commit_chunk(chunk, progress, offset, state, ranges)
+                chunk = []
+        await self._commit_chunk(chunk, progress, progress.end, state, ranges)
+
+    async def _commit_chunk(
+        self,
+        chunk: list[SignalRow],
+        progress: ImportProgress,
+        offset: int,
+        state: dict[str, Any],
+        ranges: list[ImportProgress],
+    ) -> None:
+        """Write ``chunk`` and record ``offset``, shielded so a failing sibling range
+        cannot cancel the task between the commit and the state write."""
+
+        async def commit() -> None:
+            if chunk:
+                progress.inserted += await self._write(chunk)
+            progress.committed_offset = offset
+            progress.done = offset == progress.end
+            self._save_state(state, ranges)
+
+        task = asyncio.ensure_future(commit())
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            await task
+            raise
+
+    def _load_state(self, path: Path, size: int) -> list[ImportProgress] | None:
+        if self.state_path is None or not self.state_path.exists():
+            return None
+        state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        expected = {"path": str(path.resolve()), "size": size, "format": self.fmt}
+        if {key: state.get(key) for key in expected} != expected:
+            raise ValueError(f"{self.state_path} is from another import; remove it to start over")
+        ranges = state["ranges"]
+        return [ImportProgress(**{key: item[key] for key in _STATE_FIELDS}) for item in ranges]
+
+    def _save_state(self, state: dict[str, Any], progress: list[ImportProgress]) -> None:
+        if self.state_path is None:
+            return
+        ranges = [{key: getattr(item, key) for key in _STATE_FIELDS} for item in progress]
+        tmp = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        tmp.write_text(json.dumps({**state, "ranges": ranges}), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def _iter_rows(
+        self, path: Path, header: list[str] | None, progress: ImportProgress
+    ) -> Iterator[tuple[int, SignalRow | None]]:
+        with path.open("rb") as handle:
+            handle.seek(progress.committed_offset)
+            offset = progress.committed_offset
+            while offset < progress.end:
+                line = handle.readline()
+                if not line:
+                    break
+                offset += len(line)
+                text = line.decode("utf-8").strip()
+                if not text:
+                    continue
+                yield offset, self._parse(text, header)
+
+    def _parse(self, text: str, header: list[str] | None) -> SignalRow | None:
+        try:
+            if header is not None:
+                record: dict[str, Any] = dict(zip(header, next(csv.reader([text])), strict=False))
+            else:
+                record = json.loads(text)
+            occurred_at = dt.datetime.fromisoformat(str(record["occurred_at"]))
+            if occurred_at.tzinfo is None:
+                occurred_at = occurred_at.replace(tzinfo=dt.UTC)
+            idem_key = record.get("idem_key") or None
+            return (
+                int(record["doc_id"]),
+                int(record["user_id"]),
+                SignalKind(record["kind"]).value,
+                occurred_at,
+                idem_key,
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.debug("Skipping invalid import row", extra={"row": text[:200]})
+            return None
+
+    async def _write(self, rows: list[SignalRow]) -> int:
+        if self.engine.dialect.name == "postgresql":
+            return await self._copy(rows)
+        params = [dict(zip(_COLUMNS, row, strict=True)) for row in rows]
+        for param in params:
+            param["kind"] = SignalKind(param["kind"])
+        stmt = sqlite_insert(models.Signal.__table__).on_conflict_do_nothing()
+        async with self.engine.begin() as conn:
+            result = await conn.execute(stmt, params)
+        return max(result.rowcount, 0)
+
+    async def _copy(self, rows: list[SignalRow]) -> int:
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            async with driver.transaction():
+                await driver.execute(_STAGING_DDL)
+                await driver.copy_records_to_table(
+                    "signals_import", records=rows, columns=list(_COLUMNS)
+                )
+                status = await driver.execute(_STAGING_MERGE)
+        return int(status.rsplit(" ", 1)[-1])
+
+    async def _report(self, progress: list[ImportProgress], started: float) -> None:
+        while True:
+            await asyncio.sleep(self.report_every_seconds)
+            rows = sum(item.rows for item in progress)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Import progress",
+                extra={
+                    "rows": rows,
+                    "rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+                    "resume_offset": _resume_offset(progress),
+                },
+            )
+
+
+def _resume_offset(progress: list[ImportProgress]) -> int | None:
+    """Lowest offset below which every row is committed; ``None`` once all ranges finished."""
+    for item in sorted(progress, key=lambda entry: entry.start):
+        if not item.done:
+            return item.committed_offset
+    return None
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from kickback.core.retrying import retry_async
+from kickback.domain import schemas
+from kickback.infra.repositories.signals_repo import SignalRepository
+from kickback.infra.spool import DeadLetterFile
+
+logger = logging.getLogger(__name__)
+
+
+class SignalBufferFullError(Exception):
+    ...
+
+
+@dataclass(frozen=True)
+class QueuedSignal:
+    ack_id: str
+    payload: schemas.SignalCreate
+
+
+class SignalWriteBuffer:
+    """Bounded in-process queue of accepted signals, flushed to the DB in micro-batches.
+
+    A flush happens once ``flush_max_items`` signals are queued or
+    ``flush_interval_seconds`` after the first one arrived, whichever is first.
+    Signals still queued when the process dies are lost; callers that need
+    durability across restarts should use the disk spool instead. A batch that
+    still fails after retries is appended to ``dead_letters`` rather than
+    dropped, since every signal in it was already acknowledged.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        max_queue: int,
+        flush_max_items: int,
+        flush_interval_seconds: float,
+        dead_letters: DeadLetterFile | None = None,
+    ):
+        self._sessionmaker = sessionmaker
+        self.dead_letters = dead_letters
+        self._queue: asyncio.Queue[QueuedSignal] = asyncio.Queue(maxsize=max_queue)
+        self.flush_max_items = flush_max_items
+        self.flush_interval_seconds = flush_interval_seconds
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, payload: schemas.SignalCreate) -> str:
+        if self._stopping:
+            raise SignalBufferFullError
+        queued = QueuedSignal(ack_id=uuid.uuid4().hex, payload=payload)
+        try:
+            self._queue.put_nowait(queued)
+        except asyncio.QueueFull as exc:
+            raise SignalBufferFullError from exc
+        return queued.ack_id
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="signal-write-buffer")
+
+    async def stop(self) -> None:
+        """Stop accepting signals and wait until everything queued is flushed."""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._flush(batch)
+
+    async def _collect(self) -> list[QueuedSignal]:
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval_seconds)
+        except TimeoutError:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.flush_max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping:
+                batch.extend(self._drain_nowait(self.flush_max_items - len(batch)))
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    def _drain_nowait(self, limit: int) -> list[QueuedSignal]:
+        drained: list[QueuedSignal] = []
+        while len(drained) < limit and not self._queue.empty():
+            drained.append(self._queue.get_nowait())
+        return drained
+
+    async def _flush(self, batch: list[QueuedSignal]) -> None:
+        async def _write() -> list[int | None]:
+            async with self._sessionmaker() as session:
+                ids = await SignalRepository(session).bulk_create([item.payload for item in batch])
+                await session.commit()
+                return ids
+
+        try:
+            ids = await retry_async(_write)
+        except Exception as exc:
+            extra = {"ack_ids": [item.ack_id for item in batch]}
+            if self.dead_letters is None:
+                logger.exception("Dropping write-behind batch after retries", extra=extra)
+                return
+            logger.exception("Dead-lettering write-behind batch after retries", extra=extra)
+            await self._dead_letter(batch, repr(exc))
+            return
+
+        duplicates = [
+            item.ack_id for item, signal_id in zip(batch, ids, strict=True) if signal_id is None
+        ]
+        if duplicates:
+            logger.info("Write-behind duplicates skipped", extra={"ack_ids": duplicates})
+        logger.debug("Write-behind batch flushed", extra={"size": len(batch)})
+
+    async def _dead_letter(self, batch: list[QueuedSignal], error: str) -> None:
+        entries = [
+            {"ack_id": item.ack_id, "signal": item.payload.model_dump(mode="json"), "error": error}
+            for item in batch
+        ]
+        try:
+            await asyncio.to_thread(self.dead_letters.append, entries)
+        except OSError:
+            logger.exception(
+                "Could not write write-behind dead letters",
+                extra={"ack_ids": [item.ack_id for item in batch]},
+            )
+
+
+_buffer: SignalWriteBuffer | None = None
+
+
+def get_signal_buffer() -> SignalWriteBuffer | None:
+    return _buffer
+
+
+def set_signal_buffer(buffer: SignalWriteBuffer | None) -> None:
+    global _buffer
+    _buffer = buffer
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from kickback.core.settings import SpoolSettings
+from kickback.domain import schemas
+from kickback.infra.spool import IngestSpool, SpoolLockedError, SpoolRecord
+from kickback.services.signals import SignalsService
+
+logger = logging.getLogger(__name__)
+
+_IDEM_PREFIX = "spool:"
+# Each API process spools into its own slot directory under SpoolSettings.directory.
+_SLOT_PREFIX = "worker-"
+# Errors that mean the database is unavailable rather than that a record is bad.
+_TRANSIENT_ERRORS = (OperationalError, InterfaceError, TimeoutError, OSError)
+
+
+def build_spool(settings: SpoolSettings, directory: str | Path) -> IngestSpool:
+    return IngestSpool(
+        directory,
+        segment_max_bytes=settings.segment_max_bytes,
+        max_total_bytes=settings.max_total_bytes,
+        fsync=settings.fsync,
+        fsync_interval_seconds=settings.fsync_interval_seconds,
+    )
+
+
+def claim_spool(settings: SpoolSettings) -> IngestSpool:
+    """Open the first slot no other process holds, creating it if needed.
+
+    Every API worker (``uvicorn --workers N``) gets its own slot, so they never
+    contend for one spool lock. A restarted worker reclaims a free slot and
+    replays whatever its predecessor left there.
+    """
+    root = Path(settings.directory)
+    for slot in itertools.count():
+        try:
+            return build_spool(settings, root / f"{_SLOT_PREFIX}{slot}")
+        except SpoolLockedError:
+            continue
+    raise AssertionError("unreachable")
+
+
+def spool_slots(settings: SpoolSettings) -> list[Path]:
+    """Every slot directory under the spool root, in slot order.
+
+    The root itself comes first when it holds a spool from before slots existed.
+    """
+    root = Path(settings.directory)
+    if not root.is_dir():
+        return []
+    slots = [
+        path
+        for path in root.iterdir()
+        if path.is_dir()
+        and path.name.startswith(_SLOT_PREFIX)
+        and path.name[len(_SLOT_PREFIX) :].isdigit()
+    ]
+    slots.sort(key=lambda path: int(path.name[len(_SLOT_PREFIX) :]))
+    if (root / "spool.lock").exists():
+        slots.insert(0, root)
+    return slots
+
+
+async def spool_signal(spool: IngestSpool, payload: schemas.SignalCreate) -> str:
+    """Durably accept ``payload`` without touching the database.
+
+    Signals without an ``idem_key`` get one derived from the ack id so replay
+    after a crash between the DB commit and the spool checkpoint is a no-op.
+    """
+    ack_id = uuid.uuid4().hex
+    signal = payload.model_dump(mode="json")
+    if signal["idem_key"] is None:
+        signal["idem_key"] = f"{_IDEM_PREFIX}{ack_id}"
+    await asyncio.to_thread(spool.append, {"ack_id": ack_id, "signal": signal})
+    return ack_id
+
+
+@dataclass
+class SpoolReplayer:
+    spool: IngestSpool
+    sessionmaker: async_sessionmaker[AsyncSession]
+    batch_size: int = 500
+
+    async def replay_once(self) -> int:
+        """Store the next batch, dead-lettering records that can never be stored.
+
+        Forbidden and malformed records, and records the database rejects on
+        their own, go to the spool's dead-letter file so one poison record does
+        not block the checkpoint. Errors that mean the database is unavailable
+        propagate and leave the checkpoint where it is.
+        """
+        records = await asyncio.to_thread(self.spool.read, self.batch_size)
+        if not records:
+            return 0
+
+        dead: list[dict[str, Any]] = []
+        valid: list[tuple[SpoolRecord, schemas.SignalCreate]] = []
+        for record in records:
+            try:
+                valid.append((record, schemas.SignalCreate.model_validate(record.data["signal"])))
+            except (KeyError, TypeError, ValidationError) as exc:
+                dead.append(_dead_letter(record, f"invalid: {exc}"))
+
+        outcomes: list[tuple[SpoolRecord, str]] = []
+        try:
+            if valid:
+                result = await self._ingest([payload for _, payload in valid])
+                outcomes = [
+                    (record, item.status)
+                    for (record, _), item in zip(valid, result.items, strict=True)
+                ]
+        except _TRANSIENT_ERRORS:
+            raise
+        except Exception:
+            logger.warning("Spooled batch rejected; replaying records one by one", exc_info=True)
+            for record, payload in valid:
+                try:
+                    single = await self._ingest([payload])
+                except _TRANSIENT_ERRORS:
+                    raise
+                except Exception as exc:
+                    dead.append(_dead_letter(record, f"rejected: {exc!r}"))
+                else:
+                    outcomes.append((record, single.items[0].status))
+
+        dead.extend(
+            _dead_letter(record, "forbidden")
+            for record, status in outcomes
+            if status == "forbidden"
+        )
+        created = sum(status == "created" for _, status in outcomes)
+        duplicates = sum(status == "duplicate" for _, status in outcomes)
+
+        if dead:
+            await asyncio.to_thread(self.spool.dead_letters.append, dead)
+            ack_ids = [entry["ack_id"] for entry in dead]
+            logger.warning("Dead-lettered spooled signals", extra={"ack_ids": ack_ids})
+        await asyncio.to_thread(self.spool.commit, records[-1].position)
+        logger.info(
+            "Spool replayed",
+            extra={"records": len(records), "created": created, "duplicates": duplicates},
+        )
+        return len(records)
+
+    async def _ingest(self, payloads: list[schemas.SignalCreate]) -> schemas.SignalBatchResult:
+        async with self.sessionmaker() as session:
+            result = await SignalsService(session).ingest_batch(payloads)
+            await session.commit()
+        return result
+
+    async def drain(self) -> int:
+        total = 0
+        while processed := await self.replay_once():
+            total += processed
+        return total
+
+    async def run_forever(self, interval_seconds: float, max_backoff_seconds: float = 30.0) -> None:
+        """Replay continuously, backing off while the database is unavailable."""
+        backoff = interval_seconds
+        while True:
+            try:
+                processed = await self.replay_once()
+            except Exception:
+                logger.exception("Spool replay failed; retrying", extra={"backoff": backoff})
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, max_backoff_seconds)
+                continue
+            backoff = interval_seconds
+            if processed == 0:
+                await asyncio.sleep(interval_seconds)
+
+
+def _dead_letter(record: SpoolRecord, error: str) -> dict[str, Any]:
+    return {
+        "ack_id": record.data.get("ack_id"),
+        "signal": record.data.get("signal"),
+        "error": error,
+    }
+
+
+_spool: IngestSpool | None = None
+
+
+def get_ingest_spool() -> IngestSpool | None:
+    return _spool
+
+
+def set_ingest_spool(spool: IngestSpool | None) -> None:
+    global _spool
+    _spool = spool
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+from redis.asyncio import Redis
+
+from kickback.core.cache import get_redis
+from kickback.core.settings import LeaderboardSettings, get_settings
+from kickback.infra.repositories.search_repo import DailyDelta, WindowTotal
+
+FIELDS = ("views", "edits")
+
+
+@dataclass
+class RedisLeaderboard:
+    """Per-day sorted sets of view and edit counts, keyed ``lb:{day}:{field}``.
+
+    The ``redis_leaderboard`` projection increments them from every projector
+    batch, together with the last signal id applied under the batch's
+    checkpoint (``lb:applied:{checkpoint}``) in one ``MULTI``, so a batch
+    retried after its database commit failed is not counted twice. A window is
+    answered by a weighted ``ZUNIONSTORE`` over its day keys, which is kept for
+    ``union_ttl_seconds`` under a digest of its weights so concurrent requests
+    with the same scoring share it, and then a top-K ``ZREVRANGE``. Day keys
+    expire once they are past the longest supported window. Redis is only a
+    cache of ``search_signals_daily`` and can be refilled from it with
+    ``kickback-projector leaderboard-rebuild``.
+    """
+
+    redis: Redis
+    settings: LeaderboardSettings
+
+    @classmethod
+    async def connect(cls, settings: LeaderboardSettings | None = None) -> RedisLeaderboard:
+        return cls(await get_redis(), settings or get_settings().leaderboard)
+
+    def day_key(self, day: dt.date, field: str) -> str:
+        return f"{self.settings.key_prefix}:{day.isoformat()}:{field}"
+
+    def applied_key(self, checkpoint: str) -> str:
+        return f"{self.settings.key_prefix}:applied:{checkpoint}"
+
+    def oldest_day(self, today: dt.date) -> dt.date:
+        return today - dt.timedelta(days=self.settings.max_window_days)
+
+    async def applied(self, checkpoint: str) -> int:
+        """Last signal id already counted under ``checkpoint``; 0 if none."""
+        return int(await self.redis.get(self.applied_key(checkpoint)) or 0)
+
+    async def set_applied(self, checkpoints: Mapping[str, int]) -> None:
+        if checkpoints:
+            keys = {self.applied_key(name): last_id for name, last_id in checkpoints.items()}
+            await self.redis.mset(keys)
+
+    async def add(
+        self,
+        deltas: Sequence[DailyDelta],
+        today: dt.date,
+        checkpoint: str | None = None,
+        last_id: int | None = None,
+    ) -> None:
+        """Add one batch's counts; with ``checkpoint``, record ``last_id`` as applied atomically."""
+        oldest = self.oldest_day(today)
+        pipe = self.redis.pipeline(transaction=checkpoint is not None)
+        if checkpoint is not None:
+            pipe.set(self.applied_key(checkpoint), last_id)
+        days: set[dt.date] = set()
+        for delta in deltas:
+            if delta.day < oldest:
+                continue
+            days.add(delta.day)
+            if delta.views:
+                pipe.zincrby(self.day_key(delta.day, "views"), delta.views, delta.doc_id)
+            if delta.edits:
+                pipe.zincrby(self.day_key(delta.day, "edits"), delta.edits, delta.doc_id)
+        if not days and checkpoint is None:
+            return
+        for day in days:
+            for field in FIELDS:
+                pipe.expireat(self.day_key(day, field), self._expires_at(day))
+        await pipe.execute()
+
+    async def clear(self, today: dt.date) -> None:
+        """Drop every day key a window could read."""
+        day = self.oldest_day(today)
+        keys = []
+        while day <= today:
+            keys.extend(self.day_key(day, field) for field in FIELDS)
+            day += dt.timedelta(days=1)
+        await self.redis.delete(*keys)
+
+    async def top(
+        self, weights: Mapping[dt.date, float], limit: int, edit_weight: float, offset: int = 0
+    ) -> list[WindowTotal]:
+        """Rank documents over the days in ``weights``, each scaled by its decay weight.
+
+        ``offset`` skips that many of the top ranks, for later pages.
+        """
+        if not weights:
+            return []
+        days = sorted(weights)
+        base = (
+            f"{self.settings.key_prefix}:window:{days[0].isoformat()}:{days[-1].isoformat()}:"
+            f"{_weights_digest(weights, edit_weight)}"
+        )
+        score_key, views_key, edits_key = f"{base}:score", f"{base}:views", f"{base}:edits"
+        if not await self.redis.exists(score_key):
+            score_weights: dict[str, float] = {}
+            for day in days:
+                score_weights[self.day_key(day, "views")] = weights[day]
+                score_weights[self.day_key(day, "edits")] = weights[day] * edit_weight
+            ttl = self.settings.union_ttl_seconds
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zunionstore(score_key, score_weights)
+            pipe.zunionstore(views_key, [self.day_key(day, "views") for day in days])
+            pipe.zunionstore(edits_key, [self.day_key(day, "edits") for day in days])
+            for key in (score_key, views_key, edits_key):
+                pipe.expire(key, ttl)
+            await pipe.execute()
+
+        ranked = await self.redis.zrevrange(score_key, offset, offset + limit - 1, withscores=True)
+        if not ranked:
+            return []
+        members = [member for member, _ in ranked]
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zmscore(views_key, members)
+        pipe.zmscore(edits_key, members)
+        views, edits = await pipe.execute()
+        return [
+            WindowTotal(int(member), int(view_count or 0), int(edit_count or 0), float(score))
+            for (member, score), view_count, edit_count in zip(ranked, views, edits, strict=True)
+        ]
+
+    def _expires_at(self, day: dt.date) -> int:
+        # One spare day past the longest window, so "<max>d" never reads an expired key.
+        expiry = day + dt.timedelta(days=self.settings.max_window_days + 2)
+        return int(dt.datetime.combine(expiry, dt.time(), dt.UTC).timestamp())
+
+
+def _weights_digest(weights: Mapping[dt.date, float], edit_weight: float) -> str:
+    # Decayed weights drift continuously, so exact values would give every request its own
+    # union. Four significant digits keep scores within 0.05% while requests share it.
+    parts = [f"{day.isoformat()}={weight:.4g}" for day, weight in sorted(weights.items())]
+    parts.append(f"edit={edit_weight:.4g}")
+    return hashlib.blake2b(";".join(parts).encode("utf-8"), digest_size=8).hexdigest()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.infra.repositories.signals_repo import SignalScanRow
+from kickback.services.aggregation import aggregate_daily, aggregate_hourly, aggregate_weekly
+from kickback.services.leaderboard import RedisLeaderboard
+
+
+class SinkUnavailableError(Exception):
+    """A projection's sink outside the database cannot be written right now.
+
+    Raised by ``apply`` before it touches the session. The pipeline leaves that
+    projection's checkpoint where it is and commits the batch for the others,
+    so the projection falls behind and backfills once its sink is back.
+    """
+
+
+class Projection(Protocol):
+    """A read model fed from the shared ``signals`` scan.
+
+    ``name`` is also the projection's ``projector_state`` checkpoint (suffixed
+    per shard). ``apply`` aggregates one batch and writes it to the sink inside
+    the caller's transaction; the caller advances ``checkpoint`` (the suffixed
+    name) and commits. Sinks must be additive so a batch is never applied
+    twice; sinks outside the database key their own record of applied batches
+    by ``checkpoint``. ``apply`` returns the number of sink rows it upserted.
+    """
+
+    name: str
+
+    async def apply(
+        self,
+        session: AsyncSession,
+        rows: Sequence[SignalScanRow],
+        now: dt.datetime,
+        checkpoint: str,
+    ) -> int: ...
+
+
+@dataclass(frozen=True)
+class SearchDailyProjection:
+    """Per-(doc, day) counts in ``search_signals_daily``."""
+
+    name: str = "search_signals_projector"
+
+    async def apply(
+        self,
+        session: AsyncSession,
+        rows: Sequence[SignalScanRow],
+        now: dt.datetime,
+        checkpoint: str,
+    ) -> int:
+        deltas = aggregate_daily(rows)
+        await SearchRepository(session).merge_daily(deltas)
+        return len(deltas)
+
+
+@dataclass(frozen=True)
+class SearchHourlyProjection:
+    """Per-(doc, UTC hour) counts in ``search_signals_hourly``."""
+
+    name: str = "search_signals_hourly"
+
+    async def apply(
+        self,
+        session: AsyncSession,
+        rows: Sequence[SignalScanRow],
+        now: dt.datetime,
+        checkpoint: str,
+    ) -> int:
+        deltas = aggregate_hourly(rows)
+        await SearchRepository(session).merge_hourly(deltas)
+        return len(deltas)
+
+
+@dataclass(frozen=True)
+class SearchWeeklyProjection:
+    """Per-(doc, ISO week) counts in ``search_signals_weekly``."""
+
+    name: str = "search_signals_weekly"
+
+    async def apply(
+        self,
+        session: AsyncSession,
+        rows: Sequence[SignalScanRow],
+        now: dt.datetime,
+        checkpoint: str,
+    ) -> int:
+        deltas = aggregate_weekly(rows)
+        await SearchRepository(session).merge_weekly(deltas)
+        return len(deltas)
+
+
+@dataclass(frozen=True)
+class RedisLeaderboardProjection:
+    """Per-day view/edit sorted sets in Redis for ``ff_redis_leaderboard``.
+
+    A Redis outage only holds back this projection's checkpoint; reads fall
+    back to the rollups meanwhile. Redis is written before the batch's
+    transaction commits. The increments
+    and the batch's last signal id go in together, so when a failed commit
+    makes the projector fetch the same signals again, those already counted
+    under ``checkpoint`` are skipped. ``kickback-projector leaderboard-rebuild``
+    resets the sets from ``search_signals_daily`` if Redis lost data.
+    """
+
+    name: str = "redis_leaderboard"
+
+    async def apply(
+        self,
+        session: AsyncSession,
+        rows: Sequence[SignalScanRow],
+        now: dt.datetime,
+        checkpoint: str,
+    ) -> int:
+        try:
+            board = await RedisLeaderboard.connect()
+            applied = await board.applied(checkpoint)
+            deltas = aggregate_daily([row for row in rows if row[0] > applied])
+            # A retry may fetch a smaller batch than the attempt that got counted; keep its mark.
+            last_id = max(applied, rows[-1][0])
+            await board.add(deltas, now.date(), checkpoint=checkpoint, last_id=last_id)
+        except RedisError as exc:
+            raise SinkUnavailableError(f"Redis leaderboard unavailable: {exc}") from exc
+        return len(deltas)
+
+
+_registry: dict[str, Projection] = {}
+
+
+def register_projection(projection: Projection) -> Projection:
+    if projection.name in _registry:
+        raise ValueError(f"Projection {projection.name!r} is already registered")
+    _registry[projection.name] = projection
+    return projection
+
+
+def get_projection(name: str) -> Projection:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown projection {name!r}; known: {sorted(_registry)}") from None
+
+
+def get_projections(names: Sequence[str]) -> list[Projection]:
+    return [get_projection(name) for name in names]
+
+
+register_projection(SearchDailyProjection())
+register_projection(SearchHourlyProjection())
+register_projection(SearchWeeklyProjection())
+register_projection(RedisLeaderboardProjection())
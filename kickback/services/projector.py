@@ -2,68 +2,637 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import hashlib
 import logging
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, Tuple
+import time
+from dataclasses import dataclass, field
+from typing import Mapping, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from kickback.core.types import SignalKind
+from kickback.core.metrics import get_metrics
+from kickback.core.settings import ProjectorSettings
+from kickback.domain import schemas
+from kickback.infra.notify import SignalWakeup
 from kickback.infra.repositories.search_repo import SearchRepository
-from kickback.infra.repositories.signals_repo import SignalRepository
-
+from kickback.infra.repositories.signals_repo import SignalRepository, SignalScanRow
+from kickback.services.projections import (
+    Projection,
+    SearchDailyProjection,
+    SinkUnavailableError,
+    get_projections,
+)
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_PROJECTOR_NAME = SearchDailyProjection.name
+
+
+class ShardLayoutError(Exception):
+    ...
+
+
+def shard_name(base: str, shard: int, shards: int) -> str:
+    return f"{base}:shard-{shard}-of-{shards}"
+
+
+def checkpoint_name(base: str, shard: int, shards: int) -> str:
+    return shard_name(base, shard, shards) if shards > 1 else base
+
+
+def parse_shard_name(name: str) -> tuple[str, int | None, int | None]:
+    """Split a checkpoint name into ``(projection, shard, shards)``; unsharded gives ``None``s."""
+    base, sep, suffix = name.partition(":shard-")
+    shard, of, shards = suffix.partition("-of-")
+    if not sep or not of or not shard.isdigit() or not shards.isdigit():
+        return name, None, None
+    return base, int(shard), int(shards)
+
+
+def record_batch(
+    name: str, signals: Sequence[SignalScanRow], upserts: int, seconds: float
+) -> None:
+    """Record one committed batch for checkpoint ``name`` in the process metrics."""
+    metrics = get_metrics()
+    metrics.histogram("projector_batch_seconds").observe(seconds, checkpoint=name)
+    metrics.counter("projector_signals_total").inc(len(signals), checkpoint=name)
+    metrics.meter("projector_signals_per_second").mark(len(signals), checkpoint=name)
+    metrics.counter("projector_upserts_total").inc(upserts, checkpoint=name)
+    metrics.gauge("projector_checkpoint_id").set(signals[-1][0], checkpoint=name)
+    occurred_at = signals[-1][4]
+    if occurred_at.tzinfo is None:
+        occurred_at = occurred_at.replace(tzinfo=dt.UTC)
+    metrics.gauge("projector_checkpoint_time").set(occurred_at.timestamp(), checkpoint=name)
+
+
+def _layouts(checkpoints: Mapping[str, int], base: str) -> dict[int, dict[str, int]]:
+    """``base``'s checkpoints grouped by shard count: ``{shards: {name: last_signal_id}}``."""
+    layouts: dict[int, dict[str, int]] = {}
+    for name, last_id in checkpoints.items():
+        projection, _, shards = parse_shard_name(name)
+        if projection == base:
+            layouts.setdefault(shards or 1, {})[name] = last_id
+    return layouts
+
+
+async def check_shard_layout(
+    session: AsyncSession, projections: Sequence[Projection], shards: int
+) -> None:
+    """Refuse to project with ``shards`` while checkpoints of another shard count hold progress.
+
+    Projecting the same signals under two layouts would count them twice; move
+    between counts with :class:`ProjectorReshard` instead.
+    """
+    checkpoints = await SearchRepository(session).projector_checkpoints()
+    await session.commit()
+    for projection in projections:
+        for count, names in _layouts(checkpoints, projection.name).items():
+            if count != shards and any(names.values()):
+                raise ShardLayoutError(
+                    f"{projection.name} has checkpoints for {count} shard(s), not {shards}; "
+                    f"run `kickback-projector reshard --shards {shards}` first"
+                )
+
+
+def advisory_key(name: str) -> int:
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
 @dataclass
 class SignalProjector:
+    """Projects ``signals`` into one projection (``search_signals_daily`` by default).
+
+    With ``shards > 1`` the projector only sees documents whose
+    ``signals.shard_bucket`` lies in the shard's range (see
+    :func:`~kickback.infra.repositories.signals_repo.shard_buckets`) and
+    checkpoints under its own
+    ``projector_state`` row. On PostgreSQL each batch first takes a
+    transaction-scoped advisory lock on that name, so any number of workers in
+    any number of processes can be pointed at the same shard safely.
+    This class drives a single checkpoint and does not check the shard layout;
+    service entry points use :class:`ShardedProjectorRunner`, which does.
+    """
+
     session: AsyncSession
     batch_size: int = 500
-    name: str = "search_signals_projector"
+    name: str = DEFAULT_PROJECTOR_NAME
+    shard: int = 0
+    shards: int = 1
+    projection: Projection = field(default_factory=SearchDailyProjection)
 
     def __post_init__(self) -> None:
+        if self.shards > 1 and self.name == DEFAULT_PROJECTOR_NAME:
+            self.name = shard_name(self.name, self.shard, self.shards)
         self.signals_repo = SignalRepository(self.session)
         self.search_repo = SearchRepository(self.session)
 
     async def run_once(self) -> int:
+        started = time.perf_counter()
+        if not await self._try_lock():
+            return 0
         state = await self.search_repo.get_projector_state(self.name)
         last_id = state.last_signal_id if state else 0
-        signals = await self.signals_repo.fetch_batch(last_id=last_id, limit=self.batch_size)
+        signals = await self.signals_repo.fetch_rows(
+            last_id=last_id, limit=self.batch_size, shard=self.shard, shards=self.shards
+        )
         if not signals:
             logger.info("Projector caught up", extra={"last_id": last_id})
             return 0
 
-        aggregates: Dict[Tuple[int, dt.date], Dict[str, float]] = defaultdict(lambda: {"views": 0, "edits": 0})
-        max_id = last_id
-        now = dt.datetime.now(dt.timezone.utc)
-
-        for signal in signals:
-            max_id = max(max_id, signal.id)
-            key = (signal.doc_id, signal.occurred_at.date())
-            if signal.kind == SignalKind.VIEW:
-                aggregates[key]["views"] += 1
-            else:
-                aggregates[key]["edits"] += 1
-
-        for (doc_id, day), data in aggregates.items():
-            age_days = (now.date() - day).days
-            recency_score = data["views"] + data["edits"] * 2 + max(0, 10 - age_days)
-            await self.search_repo.upsert_daily(
-                doc_id=doc_id,
-                day=day,
-                views=int(data["views"]),
-                edits=int(data["edits"]),
-                recency_score=float(recency_score),
-            )
+        max_id = signals[-1][0]
+        upserts = await self.projection.apply(
+            self.session, signals, dt.datetime.now(dt.UTC), self.name
+        )
 
-        await self.search_repo.update_projector_state(self.name, max_id)
+        seconds = time.perf_counter() - started
+        await self.search_repo.update_projector_state(
+            self.name, max_id, signals=len(signals), upserts=upserts, seconds=seconds
+        )
+        record_batch(self.name, signals, upserts, seconds)
         logger.info("Projector advanced", extra={"processed": len(signals), "last_id": max_id})
         return len(signals)
 
-    async def run_forever(self, sleep_seconds: float = 2.0) -> None:
+    async def run_forever(
+        self, sleep_seconds: float = 2.0, wakeup: SignalWakeup | None = None
+    ) -> None:
+        # Registered before the first pass, so inserts landing mid-pass still wake us.
+        event = wakeup.waiter() if wakeup else None
         while True:
             processed = await self.run_once()
             if processed == 0:
-                await asyncio.sleep(sleep_seconds)
+                await _idle(sleep_seconds, wakeup, event)
+
+    async def _try_lock(self) -> bool:
+        return await _try_advisory_lock(self.session, self.name)
+
+
+class BatchSizer:
+    """Pick the next projector batch size from the last one's outcome.
+
+    A full batch means there is backlog: grow while batches finish inside
+    ``target_seconds`` and scale down proportionally when they overrun. A short
+    batch means we are caught up, so drift back to ``minimum`` to keep idle
+    queries cheap.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_seconds: float):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.target_seconds = target_seconds
+        self.size = self._clamp(initial)
+
+    def observe(self, requested: int, fetched: int, seconds: float) -> int:
+        if fetched < requested:
+            self.size = self._clamp(max(fetched, self.size // 2))
+        elif seconds > self.target_seconds:
+            self.size = self._clamp(int(self.size * max(0.5, self.target_seconds / seconds)))
+        elif seconds < self.target_seconds / 2:
+            self.size = self._clamp(self.size * 2)
+        return self.size
+
+    def _clamp(self, size: int) -> int:
+        return min(self.maximum, max(self.minimum, size))
+
+
+@dataclass
+class ProjectorPipeline:
+    """Feed one shared ``signals`` scan to several projections.
+
+    Projections whose checkpoints agree form a group that is served by one
+    fetch per batch. The most advanced group drains until caught up; lagging
+    groups (e.g. a newly registered projection backfilling from id 0) get at
+    most ``backfill_batches`` per drain, so they catch up steadily without
+    delaying the live ones. Once a laggard reaches the leader's checkpoint the
+    two share a scan again.
+
+    Within a group, batch N+1 is read on its own session while batch N is
+    aggregated and written on another, so each batch costs roughly max(fetch,
+    write) instead of their sum. Writes take every member's advisory lock and
+    re-check its checkpoint first; if another worker advanced one meanwhile the
+    prefetched batch is discarded and the group stops.
+    """
+
+    sessionmaker: async_sessionmaker[AsyncSession]
+    sizer: BatchSizer
+    projections: Sequence[Projection] = (SearchDailyProjection(),)
+    shard: int = 0
+    shards: int = 1
+    backfill_batches: int = 20
+    # Caps batches per group and drain (None drains the leading group until caught up).
+    max_batches: int | None = None
+    # Stop at this signal id instead of the newest one.
+    until_id: int | None = None
+
+    def checkpoint_name(self, projection: Projection) -> str:
+        return checkpoint_name(projection.name, self.shard, self.shards)
+
+    async def drain(self) -> int:
+        processed = 0
+        async with self.sessionmaker() as fetch_session, self.sessionmaker() as write_session:
+            search_repo = SearchRepository(write_session)
+            groups: dict[int, list[Projection]] = {}
+            for projection in self.projections:
+                state = await search_repo.get_projector_state(self.checkpoint_name(projection))
+                groups.setdefault(state.last_signal_id if state else 0, []).append(projection)
+            await write_session.commit()
+
+            for index, last_id in enumerate(sorted(groups, reverse=True)):
+                max_batches = self.max_batches
+                if index > 0:
+                    max_batches = min(self.backfill_batches, max_batches or self.backfill_batches)
+                processed += await self._drain_group(
+                    fetch_session, write_session, groups[last_id], last_id, max_batches
+                )
+        return processed
+
+    async def _drain_group(
+        self,
+        fetch_session: AsyncSession,
+        write_session: AsyncSession,
+        members: list[Projection],
+        last_id: int,
+        max_batches: int | None,
+    ) -> int:
+        names = [self.checkpoint_name(projection) for projection in members]
+        processed = batches = 0
+        requested = self.sizer.size
+        pending = asyncio.create_task(self._fetch(fetch_session, last_id, requested))
+        try:
+            while pending is not None:
+                started = time.perf_counter()
+                signals = await pending
+                pending = None
+                if not signals:
+                    break
+                batches += 1
+                next_id = signals[-1][0]
+                next_requested = self.sizer.size
+                if len(signals) == requested and (max_batches is None or batches < max_batches):
+                    pending = asyncio.create_task(
+                        self._fetch(fetch_session, next_id, next_requested)
+                    )
+                upserts = await self._write(
+                    write_session, members, signals, last_id, next_id, started
+                )
+                if upserts is None:
+                    logger.info("Projector checkpoint moved; yielding", extra={"names": names})
+                    break
+                seconds = time.perf_counter() - started
+                for name, count in zip(names, upserts, strict=True):
+                    if count is not None:
+                        record_batch(name, signals, count, seconds)
+                if None in upserts:
+                    # Members whose sink is down stay behind; the rest carry on without them.
+                    members = [
+                        member
+                        for member, count in zip(members, upserts, strict=True)
+                        if count is not None
+                    ]
+                    names = [self.checkpoint_name(projection) for projection in members]
+                    if not members:
+                        break
+                self.sizer.observe(requested, len(signals), seconds)
+                processed += len(signals)
+                last_id = next_id
+                requested = next_requested
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+        if processed:
+            logger.info(
+                "Projector advanced",
+                extra={
+                    "names": names,
+                    "processed": processed,
+                    "last_id": last_id,
+                    "batch": self.sizer.size,
+                },
+            )
+        return processed
+
+    async def _fetch(self, session: AsyncSession, last_id: int, limit: int) -> list[SignalScanRow]:
+        signals = await SignalRepository(session).fetch_rows(
+            last_id=last_id,
+            limit=limit,
+            shard=self.shard,
+            shards=self.shards,
+            until_id=self.until_id,
+        )
+        await session.commit()
+        return signals
+
+    async def _write(
+        self,
+        session: AsyncSession,
+        members: list[Projection],
+        signals: list[SignalScanRow],
+        last_id: int,
+        next_id: int,
+        started: float,
+    ) -> list[int | None] | None:
+        """Apply one batch to every member; ``None`` if a checkpoint moved or is locked.
+
+        A member whose sink is unavailable gets ``None`` instead of an upsert
+        count, and its checkpoint is left where it was.
+        """
+        search_repo = SearchRepository(session)
+        names = [self.checkpoint_name(projection) for projection in members]
+        for name in sorted(names):
+            if not await _try_advisory_lock(session, name):
+                await session.rollback()
+                return None
+            state = await search_repo.get_projector_state(name)
+            if (state.last_signal_id if state else 0) != last_id:
+                await session.rollback()
+                return None
+        now = dt.datetime.now(dt.UTC)
+        upserts: list[int | None] = []
+        for projection, name in zip(members, names, strict=True):
+            try:
+                upserts.append(await projection.apply(session, signals, now, name))
+            except SinkUnavailableError:
+                logger.warning("Projection sink unavailable; holding its checkpoint", exc_info=True)
+                upserts.append(None)
+        seconds = time.perf_counter() - started
+        for name, count in zip(names, upserts, strict=True):
+            if count is None:
+                continue
+            await search_repo.update_projector_state(
+                name, next_id, signals=len(signals), upserts=count, seconds=seconds
+            )
+        await session.commit()
+        return upserts
+
+
+async def _try_advisory_lock(session: AsyncSession, name: str) -> bool:
+    """Take a transaction-scoped advisory lock for checkpoint ``name`` (PostgreSQL only)."""
+    bind = session.get_bind()
+    if bind is None or bind.dialect.name != "postgresql":
+        return True
+    stmt = sa.select(sa.func.pg_try_advisory_xact_lock(advisory_key(name)))
+    return bool(await session.scalar(stmt))
+
+
+@dataclass
+class ShardedProjectorRunner:
+    """Runs ``workers`` coroutines over ``shards`` projector shards.
+
+    Each worker sweeps every shard, starting from its own offset, and drains
+    it with a ``ProjectorPipeline``. Every batch commits separately, which
+    releases that shard's advisory lock, so shards with a backlog are shared by
+    whichever workers (in this or another process) reach them first. A worker
+    sleeps only after a sweep found no work anywhere. Batch sizes adapt per
+    worker and shard between ``min_batch_size`` and ``max_batch_size``.
+
+    Every sweep first checks that no checkpoints of another shard count hold
+    progress and raises :class:`ShardLayoutError` if they do.
+    """
+
+    sessionmaker: async_sessionmaker[AsyncSession]
+    shards: int
+    workers: int = 1
+    batch_size: int = 500
+    min_batch_size: int = 100
+    max_batch_size: int = 20_000
+    target_batch_seconds: float = 0.5
+    projections: Sequence[Projection] = (SearchDailyProjection(),)
+    backfill_batches: int = 20
+    _sizers: dict[tuple[int, int], BatchSizer] = field(default_factory=dict, init=False)
+
+    @classmethod
+    def from_settings(
+        cls,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        settings: ProjectorSettings,
+        shards: int | None = None,
+        workers: int = 1,
+    ) -> ShardedProjectorRunner:
+        return cls(
+            sessionmaker,
+            shards=shards or settings.shards,
+            workers=workers,
+            batch_size=settings.batch_size,
+            min_batch_size=settings.min_batch_size,
+            max_batch_size=settings.max_batch_size,
+            target_batch_seconds=settings.target_batch_seconds,
+            projections=get_projections(settings.projections),
+            backfill_batches=settings.backfill_batches,
+        )
+
+    async def run_once(self) -> int:
+        """One batch per shard and checkpoint group."""
+        return await self.run_sweep(max_batches=1)
+
+    async def run_until_caught_up(self) -> int:
+        processed = 0
+        while swept := await self.run_sweep():
+            processed += swept
+        return processed
+
+    async def run_forever(
+        self, sleep_seconds: float = 2.0, wakeup: SignalWakeup | None = None
+    ) -> None:
+        await asyncio.gather(
+            *(self._worker(index, sleep_seconds, wakeup) for index in range(self.workers))
+        )
+
+    async def run_sweep(self, worker: int = 0, max_batches: int | None = None) -> int:
+        async with self.sessionmaker() as session:
+            await check_shard_layout(session, self.projections, self.shards)
+        processed = 0
+        for offset in range(self.shards):
+            shard = (worker + offset) % self.shards
+            pipeline = ProjectorPipeline(
+                self.sessionmaker,
+                self._sizer(worker, shard),
+                projections=self.projections,
+                shard=shard,
+                shards=self.shards,
+                backfill_batches=self.backfill_batches,
+                max_batches=max_batches,
+            )
+            processed += await pipeline.drain()
+        return processed
+
+    def _sizer(self, worker: int, shard: int) -> BatchSizer:
+        key = (worker, shard)
+        if key not in self._sizers:
+            self._sizers[key] = BatchSizer(
+                self.batch_size, self.min_batch_size, self.max_batch_size, self.target_batch_seconds
+            )
+        return self._sizers[key]
+
+    async def _worker(
+        self, index: int, sleep_seconds: float, wakeup: SignalWakeup | None
+    ) -> None:
+        event = wakeup.waiter() if wakeup else None
+        while True:
+            if await self.run_sweep(index) == 0:
+                await _idle(sleep_seconds, wakeup, event)
+
+
+@dataclass
+class ProjectorReshard:
+    """Move projections to a new shard count without counting any signal twice.
+
+    The old layout's checkpoints are first drained up to the most advanced of
+    them, so together they cover exactly the signals up to one id. Then, in a
+    single transaction holding every old and new checkpoint's advisory lock,
+    that is verified, the new checkpoints are seeded at that id and the old
+    ones deleted. Stop workers that run with the old count first: a batch they
+    write meanwhile fails the verification, and once the old checkpoints are
+    gone they refuse to start.
+    """
+
+    sessionmaker: async_sessionmaker[AsyncSession]
+    projections: Sequence[Projection]
+    shards: int
+    batch_size: int = 500
+
+    async def run(self) -> dict[str, int]:
+        """Reshard every projection; returns the id each one's new checkpoints start at."""
+        return {projection.name: await self._reshard(projection) for projection in self.projections}
+
+    async def _reshard(self, projection: Projection) -> int:
+        async with self.sessionmaker() as session:
+            checkpoints = await SearchRepository(session).projector_checkpoints()
+        layouts = _layouts(checkpoints, projection.name)
+        current = layouts.pop(self.shards, {})
+        old = {name: last_id for names in layouts.values() for name, last_id in names.items()}
+        if not any(old.values()):
+            return max(current.values(), default=0)
+        if any(current.values()):
+            raise ShardLayoutError(
+                f"{projection.name} already has progress under {self.shards} shard(s) "
+                "and under another count; rebuild it instead"
+            )
+
+        high_water = max(old.values())
+        sizer = BatchSizer(self.batch_size, self.batch_size, self.batch_size, target_seconds=1.0)
+        for name, last_id in old.items():
+            if last_id < high_water:
+                _, shard, shards = parse_shard_name(name)
+                await ProjectorPipeline(
+                    self.sessionmaker,
+                    sizer,
+                    projections=(projection,),
+                    shard=shard or 0,
+                    shards=shards or 1,
+                    until_id=high_water,
+                ).drain()
+
+        new = [checkpoint_name(projection.name, shard, self.shards) for shard in range(self.shards)]
+        async with self.sessionmaker() as session:
+            if _dialect(session) == "postgresql":
+                for name in sorted({*old, *new}):
+                    lock = sa.func.pg_advisory_xact_lock(advisory_key(name))
+                    await session.execute(sa.select(lock))
+            search_repo = SearchRepository(session)
+            signals_repo = SignalRepository(session)
+            checkpoints = await search_repo.projector_checkpoints()
+            for name in old:
+                _, shard, shards = parse_shard_name(name)
+                behind = await signals_repo.fetch_rows(
+                    checkpoints.get(name, 0), 1, shard or 0, shards or 1, until_id=high_water
+                )
+                if behind or checkpoints.get(name, 0) > high_water:
+                    raise ShardLayoutError(
+                        f"{name} moved while resharding; stop workers using the old shard count"
+                    )
+            await search_repo.delete_projector_states(old)
+            for name in new:
+                await search_repo.update_projector_state(name, high_water)
+            await session.commit()
+        logger.info(
+            "Projection resharded",
+            extra={"projection": projection.name, "shards": self.shards, "last_id": high_water},
+        )
+        return high_water
+
+
+@dataclass
+class ProjectorMonitor:
+    """Checkpoint freshness for ``GET /admin/projector/status``.
+
+    Lag and the batch totals stored with each checkpoint come from the
+    database, so they cover every projector worker in every process. The
+    attached metrics are this process's only. ``lag_signals`` stops counting at
+    ``lag_cap`` unless ``exact`` is asked for.
+    """
+
+    session: AsyncSession
+    lag_cap: int = 10_000
+
+    async def status(
+        self, now: dt.datetime | None = None, exact: bool = False
+    ) -> schemas.ProjectorStatus:
+        now = now or dt.datetime.now(dt.UTC)
+        signals_repo = SignalRepository(self.session)
+        max_id = await signals_repo.max_id()
+        checkpoints = []
+        for state in await SearchRepository(self.session).projector_states():
+            projection, shard, shards = parse_shard_name(state.name)
+            oldest = None
+            lag_signals = 0
+            limit = None if exact else self.lag_cap
+            if state.last_signal_id < max_id:
+                oldest = await signals_repo.first_occurred_after(
+                    state.last_signal_id, shard or 0, shards or 1
+                )
+            if oldest is not None:
+                lag_signals = await signals_repo.count_after(
+                    state.last_signal_id, shard or 0, shards or 1, limit=limit
+                )
+            checkpoints.append(
+                schemas.ProjectorCheckpointStatus(
+                    name=state.name,
+                    projection=projection,
+                    shard=shard,
+                    shards=shards,
+                    last_signal_id=state.last_signal_id,
+                    lag_signals=lag_signals,
+                    lag_signals_capped=limit is not None and lag_signals >= limit,
+                    lag_seconds=_age(oldest, now) or 0.0,
+                    checkpoint_age_seconds=_age(state.updated_at, now),
+                    batches=state.batches,
+                    signals_projected=state.signals_projected,
+                    upserts=state.upserts,
+                    signals_per_second=(
+                        state.signals_projected / state.batch_seconds
+                        if state.batch_seconds
+                        else None
+                    ),
+                    last_batch_seconds=state.last_batch_seconds,
+                )
+            )
+        return schemas.ProjectorStatus(
+            max_signal_id=max_id,
+            checkpoints=checkpoints,
+            metrics=get_metrics().snapshot("projector_"),
+        )
+
+
+def _dialect(session: AsyncSession) -> str:
+    bind = session.get_bind()
+    return bind.dialect.name if bind is not None else "postgresql"
+
+
+def _age(value: dt.datetime | None, now: dt.datetime) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt.UTC)
+    return max(0.0, (now - value).total_seconds())
+
+
+async def _idle(
+    sleep_seconds: float, wakeup: SignalWakeup | None, event: asyncio.Event | None
+) -> None:
+    if wakeup is None or event is None:
+        await asyncio.sleep(sleep_seconds)
+    else:
+        await wakeup.wait(event, wait_seconds=sleep_seconds)
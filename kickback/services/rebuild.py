@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from kickback.domain import models
+from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.infra.repositories.signals_repo import SignalRepository, SignalScanRow
+from kickback.services.aggregation import aggregate_daily, aggregate_hourly, aggregate_weekly
+from kickback.services.leaderboard import RedisLeaderboard
+from kickback.services.projections import (
+    RedisLeaderboardProjection,
+    SearchDailyProjection,
+    SearchHourlyProjection,
+    SearchWeeklyProjection,
+)
+from kickback.services.projector import DEFAULT_PROJECTOR_NAME, advisory_key, parse_shard_name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """A rollup table the rebuild recomputes, with the projection that maintains it."""
+
+    projection: str
+    table: sa.Table
+    aggregate: Callable[[Sequence[SignalScanRow]], Sequence[Any]]
+    merge: Callable[..., Awaitable[None]]
+
+    @property
+    def shadow_name(self) -> str:
+        return f"{self.table.name}_rebuild"
+
+    @property
+    def retired_name(self) -> str:
+        return f"{self.table.name}_retired"
+
+
+ROLLUPS = (
+    Rollup(
+        SearchDailyProjection.name,
+        models.SearchSignalsDaily.__table__,
+        aggregate_daily,
+        SearchRepository.merge_daily,
+    ),
+    Rollup(
+        SearchHourlyProjection.name,
+        models.SearchSignalsHourly.__table__,
+        aggregate_hourly,
+        SearchRepository.merge_hourly,
+    ),
+    Rollup(
+        SearchWeeklyProjection.name,
+        models.SearchSignalsWeekly.__table__,
+        aggregate_weekly,
+        SearchRepository.merge_weekly,
+    ),
+)
+
+
+@dataclass
+class RebuildResult:
+    signals: int
+    rows: int
+    high_water_id: int
+    seconds: float
+
+
+class ProjectionRebuild:
+    """Recompute the daily, hourly and weekly rollups from scratch without disturbing reads.
+
+    Aggregates are written into one shadow table per rollup by ``workers``
+    coroutines, each taking id ranges below the high-water mark captured at
+    the start. The shadow tables then replace the live ones by rename in a
+    single transaction that also moves every rollup's projector checkpoints to
+    the high-water mark, on the shard layout of the daily projection, so the
+    incremental projector resumes exactly where the rebuild stopped and the
+    rollups stay usable for leaderboard windows. Until then readers (and the
+    running projector) keep using the old tables. The Redis leaderboard is not
+    touched; refill it with ``LeaderboardRebuild`` afterwards.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        workers: int = 4,
+        chunk_size: int = 50_000,
+        rollups: Sequence[Rollup] = ROLLUPS,
+    ):
+        self.sessionmaker = sessionmaker
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.rollups = tuple(rollups)
+        self.shadows: dict[str, sa.Table] = {}
+        for rollup in self.rollups:
+            shadow = rollup.table.to_metadata(sa.MetaData(), name=rollup.shadow_name)
+            # Secondary indexes are recreated under their live names after the swap.
+            shadow.indexes.clear()
+            self.shadows[rollup.projection] = shadow
+
+    async def run(self) -> RebuildResult:
+        started = time.perf_counter()
+        async with self.sessionmaker() as session:
+            bounds = sa.select(sa.func.min(models.Signal.id), sa.func.max(models.Signal.id))
+            low, high = (await session.execute(bounds)).one()
+            for rollup in self.rollups:
+                await self._create_shadow(session, rollup)
+            await session.commit()
+
+        ranges: asyncio.Queue[tuple[int, int]] = asyncio.Queue()
+        if high is not None:
+            for pair in _split(low - 1, high, self.workers * 4):
+                ranges.put_nowait(pair)
+        loaded = await asyncio.gather(
+            *(self._load(ranges) for _ in range(self.workers))
+        )
+
+        async with self.sessionmaker() as session:
+            rows = 0
+            for shadow in self.shadows.values():
+                rows += await session.scalar(sa.select(sa.func.count()).select_from(shadow)) or 0
+            await self._swap(session, high or 0)
+            await session.commit()
+
+        result = RebuildResult(
+            signals=sum(loaded),
+            rows=rows,
+            high_water_id=high or 0,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Projection rebuilt",
+            extra={"signals": result.signals, "rows": result.rows, "last_id": result.high_water_id},
+        )
+        return result
+
+    async def _create_shadow(self, session: AsyncSession, rollup: Rollup) -> None:
+        shadow_name = rollup.shadow_name
+        await session.execute(sa.text(f"DROP TABLE IF EXISTS {shadow_name}"))
+        if _dialect(session) == "postgresql":
+            # LIKE ... INCLUDING ALL copies defaults, constraints and every index, including
+            # ones added by later migrations that the ORM model does not know about.
+            await session.execute(
+                sa.text(f"CREATE TABLE {shadow_name} (LIKE {rollup.table.name} INCLUDING ALL)")
+            )
+        else:
+            shadow = self.shadows[rollup.projection]
+            await session.run_sync(lambda sync: shadow.create(sync.connection()))
+
+    async def _load(self, ranges: asyncio.Queue[tuple[int, int]]) -> int:
+        processed = 0
+        while not ranges.empty():
+            last_id, until_id = ranges.get_nowait()
+            async with self.sessionmaker() as session:
+                signals_repo = SignalRepository(session)
+                search_repo = SearchRepository(session)
+                while True:
+                    rows = await signals_repo.fetch_rows(
+                        last_id=last_id, limit=self.chunk_size, until_id=until_id
+                    )
+                    if not rows:
+                        break
+                    for rollup in self.rollups:
+                        shadow = self.shadows[rollup.projection]
+                        await rollup.merge(search_repo, rollup.aggregate(rows), table=shadow)
+                    await session.commit()
+                    processed += len(rows)
+                    last_id = rows[-1][0]
+        return processed
+
+    async def _swap(self, session: AsyncSession, high_water_id: int) -> None:
+        checkpoints = await SearchRepository(session).projector_checkpoints()
+        suffixes = _suffixes(checkpoints, DEFAULT_PROJECTOR_NAME) or {""}
+        names = {f"{rollup.projection}{suffix}" for rollup in self.rollups for suffix in suffixes}
+        # Checkpoints of another shard layout would count the rebuilt rows again.
+        stale = {
+            f"{rollup.projection}{suffix}"
+            for rollup in self.rollups
+            for suffix in _suffixes(checkpoints, rollup.projection)
+        } - names
+        postgres = _dialect(session) == "postgresql"
+        renames: list[tuple[str, str]] = []
+        if postgres:
+            # Block projector writes (they take the same per-checkpoint advisory locks)
+            # and wait for in-flight ones, then readers, before renaming.
+            for name in sorted(names | stale):
+                await session.execute(sa.select(sa.func.pg_advisory_xact_lock(advisory_key(name))))
+            for rollup in self.rollups:
+                live = rollup.table.name
+                await session.execute(sa.text(f"LOCK TABLE {live} IN ACCESS EXCLUSIVE MODE"))
+                renames.extend(await _index_renames(session, live, rollup.shadow_name))
+
+        for rollup in self.rollups:
+            live = rollup.table.name
+            await session.execute(sa.text(f"ALTER TABLE {live} RENAME TO {rollup.retired_name}"))
+            await session.execute(sa.text(f"ALTER TABLE {rollup.shadow_name} RENAME TO {live}"))
+            await session.execute(sa.text(f"DROP TABLE {rollup.retired_name}"))
+
+        if postgres:
+            for shadow_index, live_index in renames:
+                await session.execute(sa.text(f"ALTER INDEX {shadow_index} RENAME TO {live_index}"))
+        else:
+            for rollup in self.rollups:
+                for index in rollup.table.indexes:
+                    await session.run_sync(
+                        lambda sync, index=index: index.create(sync.connection(), checkfirst=True)
+                    )
+
+        search_repo = SearchRepository(session)
+        await search_repo.delete_projector_states(stale)
+        for name in names:
+            await search_repo.update_projector_state(name, high_water_id)
+
+
+class LeaderboardRebuild:
+    """Refill the Redis leaderboard from ``search_signals_daily``.
+
+    Runs with the daily and leaderboard checkpoints locked, so no batch lands
+    between reading the table and moving the ``redis_leaderboard`` checkpoints
+    to the daily ones. Use it after Redis lost data or after a full rebuild,
+    and to bootstrap the projection without replaying ``signals``.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        board: RedisLeaderboard,
+        projector_name: str = DEFAULT_PROJECTOR_NAME,
+        board_name: str = RedisLeaderboardProjection.name,
+    ):
+        self.sessionmaker = sessionmaker
+        self.board = board
+        self.projector_name = projector_name
+        self.board_name = board_name
+
+    async def run(self, today: dt.date | None = None) -> int:
+        today = today or dt.datetime.now(dt.UTC).date()
+        async with self.sessionmaker() as session:
+            search_repo = SearchRepository(session)
+            checkpoints = await search_repo.projector_checkpoints()
+            daily = {
+                name[len(self.projector_name) :]: last_id
+                for name, last_id in checkpoints.items()
+                if parse_shard_name(name)[0] == self.projector_name
+            }
+            if _dialect(session) == "postgresql":
+                bases = (self.projector_name, self.board_name)
+                for name in sorted(f"{base}{suffix}" for suffix in daily for base in bases):
+                    lock = sa.func.pg_advisory_xact_lock(advisory_key(name))
+                    await session.execute(sa.select(lock))
+
+            await self.board.clear(today)
+            rows = 0
+            async for chunk in search_repo.stream_daily_since(self.board.oldest_day(today)):
+                await self.board.add(chunk, today)
+                rows += len(chunk)
+            # Marking the sets as applied up to the daily checkpoints keeps batches the
+            # daily table already holds from being counted again.
+            board = {f"{self.board_name}{suffix}": last_id for suffix, last_id in daily.items()}
+            await self.board.set_applied(board)
+            for name, last_id in board.items():
+                await search_repo.update_projector_state(name, last_id)
+            await session.commit()
+
+        logger.info("Redis leaderboard rebuilt", extra={"rows": rows, "checkpoints": daily})
+        return rows
+
+
+async def _index_renames(session: AsyncSession, live: str, shadow: str) -> list[tuple[str, str]]:
+    """Pair each shadow index with the live index that has the same definition."""
+    stmt = sa.text(
+        "SELECT tablename, indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename IN (:live, :shadow)"
+    )
+    live_defs: dict[str, str] = {}
+    shadow_defs: dict[str, str] = {}
+    for table, name, definition in await session.execute(stmt, {"live": live, "shadow": shadow}):
+        key = definition.replace(f" {name} ON ", " ON ").replace(f".{table} ", ".t ")
+        (live_defs if table == live else shadow_defs)[key] = name
+    return [(shadow_defs[key], name) for key, name in live_defs.items() if key in shadow_defs]
+
+
+def _suffixes(checkpoints: Mapping[str, int], base: str) -> set[str]:
+    """Shard suffixes (``""`` when unsharded) of ``base``'s checkpoints."""
+    return {name[len(base) :] for name in checkpoints if parse_shard_name(name)[0] == base}
+
+
+def _dialect(session: AsyncSession) -> str:
+    bind = session.get_bind()
+    return bind.dialect.name if bind is not None else "postgresql"
+
+
+def _split(after_id: int, until_id: int, parts: int) -> list[tuple[int, int]]:
+    """Split ``(after_id, until_id]`` into up to ``parts`` contiguous ranges."""
+    span = until_id - after_id
+    bounds = sorted({after_id + span * index // parts for index in range(parts + 1)})
+    return list(itertools.pairwise(bounds))
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from dataclasses import dataclass, field
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from kickback.infra.partitions import (
+    SIGNALS_TABLE,
+    add_months,
+    month_start,
+    parse_partition_name,
+    partition_name,
+    premake_partition_sql,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionResult:
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SignalRetention:
+    """Maintain monthly ``signals`` partitions on PostgreSQL.
+
+    Creates partitions ``premake_months`` ahead so inserts never land in the
+    default partition (rows that already did are moved into the new partition),
+    and drops whole partitions that end more than ``retention_months`` before
+    the current month instead of deleting rows, along with their idem keys.
+    """
+
+    session: AsyncSession
+    retention_months: int
+    premake_months: int
+
+    async def run_once(self, today: dt.date | None = None) -> RetentionResult:
+        result = RetentionResult()
+        bind = self.session.get_bind()
+        if bind is None or bind.dialect.name != "postgresql":
+            logger.info("Signal partitions require PostgreSQL; skipping retention")
+            return result
+
+        current = month_start(today or dt.datetime.now(dt.UTC).date())
+        existing = await self._partitions()
+
+        for offset in range(self.premake_months + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                for statement in premake_partition_sql(month):
+                    await self.session.execute(sa.text(statement))
+                result.created.append(partition_name(month))
+
+        cutoff = add_months(current, -self.retention_months)
+        for month in sorted(existing):
+            if add_months(month, 1) > cutoff:
+                break
+            name = partition_name(month)
+            await self.session.execute(
+                sa.text(f"ALTER TABLE {SIGNALS_TABLE} DETACH PARTITION {name}")
+            )
+            await self.session.execute(sa.text(f"DROP TABLE {name}"))
+            result.dropped.append(name)
+        if result.dropped:
+            await self.session.execute(
+                sa.text("DELETE FROM signal_idem_keys WHERE occurred_at < :cutoff"),
+                {"cutoff": dt.datetime.combine(cutoff, dt.time(), dt.UTC)},
+            )
+
+        logger.info(
+            "Signal partitions maintained",
+            extra={"created": result.created, "dropped": result.dropped},
+        )
+        return result
+
+    async def _partitions(self) -> set[dt.date]:
+        stmt = sa.text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        )
+        rows = await self.session.execute(stmt, {"parent": SIGNALS_TABLE})
+        months = (parse_partition_name(name) for (name,) in rows.all())
+        return {month for month in months if month is not None}
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import datetime as dt
+import math
+from dataclasses import dataclass
+from typing import Iterator
+
+from kickback.core.settings import ScoringSettings
+from kickback.infra.repositories.search_repo import BucketWeights, WindowPlan
+
+_HOUR = dt.timedelta(hours=1)
+_DAY = dt.timedelta(days=1)
+_WEEK = dt.timedelta(weeks=1)
+
+
+@dataclass(frozen=True)
+class RecencyDecay:
+    """Score weight for activity of a given age, evaluated at query time.
+
+    Rollups only hold raw counts; every ranking multiplies each bucket's
+    ``views + edit_weight * edits`` by the weight of the bucket's midpoint age,
+    so the same rows rank correctly whenever they are read.
+    """
+
+    settings: ScoringSettings
+
+    def weight(self, age: dt.timedelta) -> float:
+        hours = max(age.total_seconds() / 3600, 0.0)
+        if self.settings.decay == "exponential":
+            return math.pow(0.5, hours / self.settings.half_life_hours)
+        if self.settings.decay == "linear":
+            return max(0.0, 1.0 - hours / self.settings.horizon_hours)
+        return 1.0
+
+    def activity(self, views: int, edits: int) -> float:
+        return views + self.settings.edit_weight * edits
+
+    def day_weight(self, day: dt.date, now: dt.datetime) -> float:
+        return self.weight(now - _start(day) - _DAY / 2)
+
+    def bucket_weights(self, plan: WindowPlan, now: dt.datetime) -> BucketWeights:
+        """Weights for every bucket the plan reads; open ranges stop at ``now``."""
+        hours = {
+            hour: self.weight(now - hour - _HOUR / 2)
+            for low, high in plan.hours
+            for hour in _steps(low, high, now, _HOUR)
+        }
+        days = {
+            day: self.weight(now - _start(day) - _DAY / 2)
+            for low, high in plan.days
+            for day in _date_steps(low, high, now, _DAY)
+        }
+        weeks = {
+            week: self.weight(now - _start(week) - _WEEK / 2)
+            for low, high in plan.weeks
+            for week in _date_steps(low, high, now, _WEEK)
+        }
+        return BucketWeights(hours=hours, days=days, weeks=weeks)
+
+
+def _start(day: dt.date) -> dt.datetime:
+    return dt.datetime.combine(day, dt.time(), dt.UTC)
+
+
+def _steps(
+    low: dt.datetime, high: dt.datetime | None, now: dt.datetime, step: dt.timedelta
+) -> Iterator[dt.datetime]:
+    stop = high if high is not None else now
+    current = low
+    while current < stop:
+        yield current
+        current += step
+
+
+def _date_steps(
+    low: dt.date, high: dt.date | None, now: dt.datetime, step: dt.timedelta
+) -> Iterator[dt.date]:
+    stop = high if high is not None else now.date() + _DAY
+    current = low
+    while current < stop:
+        yield current
+        current += step
@@ -1,54 +1,453 @@
 from __future__ import annotations
 
+import base64
 import datetime as dt
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Collection, Literal
 
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from kickback.core import flags
+from kickback.core.cache import cache_get_or_set
+from kickback.core.metrics import get_metrics
+from kickback.core.settings import get_settings
 from kickback.domain import schemas
-from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.infra.repositories.search_repo import SearchRepository, WindowPlan, WindowTotal
+from kickback.infra.repositories.signals_repo import shard_of
+from kickback.services.leaderboard import RedisLeaderboard
+from kickback.services.projections import (
+    RedisLeaderboardProjection,
+    SearchDailyProjection,
+    SearchHourlyProjection,
+    SearchWeeklyProjection,
+)
+from kickback.services.projector import parse_shard_name
+from kickback.services.scoring import RecencyDecay
+
+logger = logging.getLogger(__name__)
+
+
+Resolution = Literal["hour", "day", "week"]
+_ROLLUPS: dict[Resolution, str] = {
+    "hour": SearchHourlyProjection.name,
+    "week": SearchWeeklyProjection.name,
+}
+
+
+def plan_window(
+    start: dt.datetime, end: dt.datetime | None, resolutions: Collection[Resolution]
+) -> WindowPlan:
+    """Cover ``[start, end)`` with the fewest rollup buckets.
+
+    Whole ISO weeks come from ``search_signals_weekly``, whole days at either
+    side from ``search_signals_daily`` and the partial days at the very edges
+    from ``search_signals_hourly``. Without hourly rows the edges widen to
+    whole days; without weekly rows the middle is all days. ``end=None`` means
+    open-ended (up to now).
+    """
+    if "hour" not in resolutions:
+        start = _midnight(start.date())
+        if end is not None and end != _midnight(end.date()):
+            end = _midnight(end.date() + dt.timedelta(days=1))
+
+    first_day = start.date()
+    if start > _midnight(first_day):
+        first_day += dt.timedelta(days=1)
+    last_day = end.date() if end is not None else None
+    if last_day is not None and first_day > last_day:
+        return WindowPlan(hours=[(start, end)], days=[], weeks=[])
+
+    hours: list[tuple[dt.datetime, dt.datetime | None]] = []
+    if start < _midnight(first_day):
+        hours.append((start, _midnight(first_day)))
+    if end is not None and end > _midnight(last_day):
+        hours.append((_midnight(last_day), end))
+
+    days: list[tuple[dt.date, dt.date | None]] = []
+    weeks: list[tuple[dt.date, dt.date | None]] = []
+    first_week = first_day + dt.timedelta(days=-first_day.weekday() % 7)
+    last_week = last_day - dt.timedelta(days=last_day.weekday()) if last_day else None
+    if "week" in resolutions and (last_week is None or first_week < last_week):
+        if first_day < first_week:
+            days.append((first_day, first_week))
+        weeks.append((first_week, last_week))
+        if last_week is not None and last_week < last_day:
+            days.append((last_week, last_day))
+    elif last_day is None or first_day < last_day:
+        days.append((first_day, last_day))
+    return WindowPlan(hours=hours, days=days, weeks=weeks)
+
+
+def window_start(window: str, now: dt.datetime) -> dt.datetime:
+    """Start of ``window``: whole hours for ``"<n>h"``, midnight UTC for ``"<n>d"``."""
+    size = _window_size(window)
+    try:
+        if window.endswith("d"):
+            return _midnight((now - dt.timedelta(days=size)).date())
+        return (now - dt.timedelta(hours=size)).replace(minute=0, second=0, microsecond=0)
+    except OverflowError:
+        raise ValueError("Window is out of range") from None
+
+
+def _window_size(window: str) -> int:
+    """``n`` of a ``"<n>d"`` or ``"<n>h"`` window."""
+    count = window[:-1]
+    if window[-1:] not in ("d", "h") or not count.isascii() or not count.isdigit():
+        raise ValueError("Invalid window format")
+    if int(count) < 1:
+        raise ValueError("Window must be at least 1d or 1h")
+    return int(count)
+
+
+def _window_range(
+    window: str,
+    as_of: dt.datetime,
+    start_day: dt.date | None,
+    end_day: dt.date | None,
+    max_days: int,
+) -> tuple[dt.datetime, dt.datetime]:
+    """``[start, end)`` of a request: the window ending at ``as_of``, or explicit days.
+
+    Ranges longer than ``max_days`` and dates the range cannot be computed for
+    raise ``ValueError``.
+    """
+    if start_day is None and end_day is None:
+        size = _window_size(window)
+        if (size if window.endswith("d") else size / 24) > max_days:
+            raise ValueError(f"Window must not exceed {max_days}d")
+        return window_start(window, as_of), as_of
+    if start_day is None or end_day is None:
+        raise ValueError("from and to must be given together")
+    if start_day > end_day:
+        raise ValueError("from must not be after to")
+    if (end_day - start_day).days + 1 > max_days:
+        raise ValueError(f"from and to must not span more than {max_days} days")
+    try:
+        return _midnight(start_day), min(_midnight(end_day + dt.timedelta(days=1)), as_of)
+    except OverflowError:
+        raise ValueError("to is out of range") from None
+
+
+def leaderboard_cursor(
+    as_of: dt.datetime, last: schemas.LeaderboardEntry, board_offset: int | None = None
+) -> str:
+    """Cursor for the page after ``last``, scored as of the same instant.
+
+    Pages ranked in Redis carry ``board_offset``, the rank the next page starts
+    at, so they continue in Redis: its day-level scores do not line up with
+    the rollups' ``(score, doc_id)`` order.
+    """
+    payload: dict[str, Any] = {
+        "as_of": as_of.isoformat(),
+        "score": last.score,
+        "doc_id": last.doc_id,
+    }
+    if board_offset is not None:
+        payload["board_offset"] = board_offset
+    return _encode_cursor(payload)
+
+
+def _encode_cursor(payload: dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def _midnight(day: dt.date) -> dt.datetime:
+    return dt.datetime.combine(day, dt.time(), dt.UTC)
 
 
 @dataclass
 class SearchService:
     session: AsyncSession
+    decay: RecencyDecay = field(default_factory=lambda: RecencyDecay(get_settings().scoring))
+    # Set when ff_redis_leaderboard is on; day windows are then ranked in Redis.
+    board: RedisLeaderboard | None = None
 
     def __post_init__(self) -> None:
         self.repo = SearchRepository(self.session)
 
     async def leaderboard(self, window: str, limit: int) -> list[schemas.LeaderboardEntry]:
-        since_date = self._parse_window(window)
-        rows = await self.repo.leaderboard(since=since_date, limit=limit)
-        return [
-            schemas.LeaderboardEntry(
-                doc_id=row.doc_id,
-                score=float(row.recency_score),
-                views=row.views,
-                edits=row.edits,
+        """First page of the window's ranking."""
+        return (await self.leaderboard_page(window, limit)).entries
+
+    async def leaderboard_page(
+        self,
+        window: str,
+        limit: int,
+        start_day: dt.date | None = None,
+        end_day: dt.date | None = None,
+        cursor: str | None = None,
+        use_cache: bool = True,
+    ) -> schemas.LeaderboardPage:
+        """Top documents by decayed activity summed over the window's rollup buckets.
+
+        ``start_day``/``end_day`` (inclusive) replace the window. Pages continue
+        from ``(score, doc_id)`` of the previous page's last entry, with scores
+        decayed to the first page's ``as_of``, so pages line up; pages ranked in
+        Redis continue from their rank there. ``use_cache=False`` skips the Redis
+        result cache, for callers that keep their own copy.
+        """
+        after = None
+        board_offset = None
+        max_days = get_settings().search.max_window_days
+        now = dt.datetime.now(dt.UTC)
+        if cursor is not None:
+            token = _decode_cursor(cursor)
+            try:
+                as_of = dt.datetime.fromisoformat(token["as_of"])
+                after = (float(token["score"]), int(token["doc_id"]))
+                if "board_offset" in token:
+                    board_offset = int(token["board_offset"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Invalid cursor") from None
+            # as_of comes from the client: only accept instants this server could have issued.
+            if as_of.tzinfo is None or (board_offset is not None and board_offset < 0):
+                raise ValueError("Invalid cursor")
+            try:
+                expired = now - as_of > dt.timedelta(days=max_days)
+            except OverflowError:
+                raise ValueError("Invalid cursor") from None
+            if as_of > now:
+                raise ValueError("Invalid cursor")
+            if expired:
+                raise ValueError("Cursor has expired")
+        else:
+            as_of = now
+        start, end = _window_range(window, as_of, start_day, end_day, max_days)
+        checkpoints = await self.repo.projector_checkpoints()
+
+        async def ranked() -> schemas.LeaderboardPage:
+            return await self._leaderboard(
+                window, start, end, as_of, limit, checkpoints, after, board_offset
             )
-            for row in rows
-        ]
+
+        async def load() -> dict[str, Any]:
+            return (await ranked()).model_dump(mode="json")
+
+        if not use_cache or not flags.cache_enabled():
+            return await ranked()
+        # The range is part of the key, so a cached plan never outlives its window. A range
+        # that runs up to as_of is keyed as "now", or no two requests would share an entry.
+        bounds = f"{start.isoformat()}:{'now' if end == as_of else end.isoformat()}"
+        watermark = checkpoint_watermark(checkpoints)
+        key = f"search:leaderboard:{window}:{bounds}:{limit}:{watermark}"
+        if cursor is not None:
+            key = f"{key}:{cursor}"
+        return schemas.LeaderboardPage(**await _cached("leaderboard", key, load))
 
     async def daily(self, doc_id: int) -> list[schemas.SignalsDailyEntry]:
-        rows = await self.repo.daily_for_doc(doc_id=doc_id)
-        return [
+        """Most recent page of a document's daily counts."""
+        return (await self.daily_page(doc_id)).entries
+
+    async def daily_page(
+        self,
+        doc_id: int,
+        limit: int = 100,
+        start_day: dt.date | None = None,
+        end_day: dt.date | None = None,
+        cursor: str | None = None,
+    ) -> schemas.SignalsDailyPage:
+        """Newest-first daily counts between ``start_day`` and ``end_day`` (inclusive)."""
+        before_day = None
+        if cursor is not None:
+            try:
+                before_day = dt.date.fromisoformat(_decode_cursor(cursor)["before"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Invalid cursor") from None
+        now = dt.datetime.now(dt.UTC)
+
+        async def load() -> dict[str, Any]:
+            page = await self._daily(doc_id, now, limit, start_day, end_day, before_day)
+            return page.model_dump(mode="json")
+
+        if not flags.cache_enabled():
+            return await self._daily(doc_id, now, limit, start_day, end_day, before_day)
+        # Only the checkpoint of the shard holding doc_id can change its rows.
+        checkpoints = _doc_checkpoints(await self.repo.projector_checkpoints(), doc_id)
+        key = (
+            f"search:daily:{doc_id}:{limit}:{start_day}:{end_day}:{before_day}:"
+            f"{checkpoint_watermark(checkpoints)}"
+        )
+        return schemas.SignalsDailyPage(**await _cached("daily", key, load))
+
+    async def _leaderboard(
+        self,
+        window: str,
+        start: dt.datetime,
+        end: dt.datetime,
+        as_of: dt.datetime,
+        limit: int,
+        checkpoints: dict[str, int],
+        after: tuple[float, int] | None,
+        board_offset: int | None = None,
+    ) -> schemas.LeaderboardPage:
+        rows = None
+        # Pages that started in Redis continue there, by rank; pages that started on the
+        # rollups never switch to Redis, whose day-level scores do not line up with them.
+        # Only when Redis becomes unusable mid-way does a Redis cursor's score seed the
+        # rollup query, so that page may repeat or skip an entry near its start.
+        if (
+            self.board is not None
+            and (after is None or board_offset is not None)
+            and end == as_of
+            and window.endswith("d")
+            and self._board_ready(checkpoints)
+        ):
+            if start.date() >= self.board.oldest_day(as_of.date()):
+                try:
+                    rows = await self._board_leaderboard(start, as_of, limit, board_offset or 0)
+                except RedisError:
+                    logger.warning("Redis leaderboard unavailable; reading rollups", exc_info=True)
+        if rows is not None:
+            entries = _entries(rows)
+            next_cursor = None
+            if len(entries) == limit:
+                next_offset = (board_offset or 0) + limit
+                next_cursor = leaderboard_cursor(as_of, entries[-1], board_offset=next_offset)
+            return schemas.LeaderboardPage(entries=entries, as_of=as_of, next_cursor=next_cursor)
+
+        # Plan up to now rather than open-ended so the recent edge, where decay moves
+        # fastest, is read as days and hours instead of one weight for the whole week.
+        plan = plan_window(start, end, await self._resolutions(checkpoints))
+        rows = await self.repo.window_leaderboard(
+            plan,
+            limit=limit,
+            weights=self.decay.bucket_weights(plan, as_of),
+            edit_weight=self.decay.settings.edit_weight,
+            after=after,
+        )
+        entries = _entries(rows)
+        next_cursor = leaderboard_cursor(as_of, entries[-1]) if len(entries) == limit else None
+        return schemas.LeaderboardPage(entries=entries, as_of=as_of, next_cursor=next_cursor)
+
+    async def _daily(
+        self,
+        doc_id: int,
+        now: dt.datetime,
+        limit: int,
+        start_day: dt.date | None,
+        end_day: dt.date | None,
+        before_day: dt.date | None,
+    ) -> schemas.SignalsDailyPage:
+        rows = await self.repo.daily_for_doc(
+            doc_id=doc_id,
+            limit=limit,
+            start_day=start_day,
+            end_day=end_day,
+            before_day=before_day,
+        )
+        entries = [
             schemas.SignalsDailyEntry(
                 doc_id=row.doc_id,
                 day=row.day,
                 views=row.views,
                 edits=row.edits,
-                recency_score=float(row.recency_score),
+                recency_score=self.decay.activity(row.views, row.edits)
+                * self.decay.day_weight(row.day, now),
             )
             for row in rows
         ]
+        next_cursor = None
+        if len(entries) == limit:
+            next_cursor = _encode_cursor({"before": entries[-1].day.isoformat()})
+        return schemas.SignalsDailyPage(entries=entries, next_cursor=next_cursor)
 
-    def _parse_window(self, window: str) -> dt.date:
-        if window.endswith("d"):
-            days = int(window[:-1])
-            delta = dt.timedelta(days=days)
-        elif window.endswith("h"):
-            hours = int(window[:-1])
-            delta = dt.timedelta(hours=hours)
-        else:
-            raise ValueError("Invalid window format")
-        return (dt.datetime.now(dt.timezone.utc) - delta).date()
+    async def _board_leaderboard(
+        self, start: dt.datetime, now: dt.datetime, limit: int, offset: int = 0
+    ) -> list[WindowTotal]:
+        assert self.board is not None
+        weights = self.decay.bucket_weights(plan_window(start, now, {"day"}), now)
+        return await self.board.top(
+            weights.days, limit, self.decay.settings.edit_weight, offset=offset
+        )
+
+    def _board_ready(self, checkpoints: dict[str, int]) -> bool:
+        """Whether the Redis sets hold exactly what the daily rollup does (see ``_resolutions``)."""
+        daily = _checkpoints_by_suffix(checkpoints, SearchDailyProjection.name)
+        return bool(daily) and _checkpoints_by_suffix(
+            checkpoints, RedisLeaderboardProjection.name
+        ) == daily
+
+    async def _resolutions(self, checkpoints: dict[str, int] | None = None) -> set[Resolution]:
+        """Rollups that are usable: caught up with the daily projection on every shard.
+
+        Projections fed by the same scan advance together, so a rollup whose
+        checkpoints differ is still backfilling and must not be read yet.
+        """
+        if checkpoints is None:
+            checkpoints = await self.repo.projector_checkpoints()
+        daily = _checkpoints_by_suffix(checkpoints, SearchDailyProjection.name)
+        ready: set[Resolution] = {"day"}
+        for resolution, name in _ROLLUPS.items():
+            if daily and _checkpoints_by_suffix(checkpoints, name) == daily:
+                ready.add(resolution)
+        return ready
+
+
+async def _cached(
+    endpoint: str, key: str, load: Callable[[], Awaitable[dict[str, Any]]]
+) -> dict[str, Any]:
+    """``cache_get_or_set`` that records hits and misses per endpoint."""
+    missed = False
+
+    async def factory() -> dict[str, Any]:
+        nonlocal missed
+        missed = True
+        return await load()
+
+    cached = await cache_get_or_set(key, get_settings().search.cache_ttl_seconds, factory)
+    metrics = get_metrics()
+    requests = metrics.counter("search_cache_requests_total")
+    requests.inc(endpoint=endpoint, result="miss" if missed else "hit")
+    hits = requests.get(endpoint=endpoint, result="hit")
+    total = hits + requests.get(endpoint=endpoint, result="miss")
+    metrics.gauge("search_cache_hit_ratio").set(hits / total, endpoint=endpoint)
+    return cached
+
+
+def checkpoint_watermark(checkpoints: dict[str, int]) -> str:
+    """Short digest of the projector checkpoints; changes whenever a batch lands."""
+    payload = ",".join(f"{name}={last_id}" for name, last_id in sorted(checkpoints.items()))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _doc_checkpoints(checkpoints: dict[str, int], doc_id: int) -> dict[str, int]:
+    result = {}
+    for name, last_id in checkpoints.items():
+        _, shard, shards = parse_shard_name(name)
+        if shards is None or shard_of(doc_id, shards) == shard:
+            result[name] = last_id
+    return result
+
+
+def _entries(rows: list[WindowTotal]) -> list[schemas.LeaderboardEntry]:
+    return [
+        schemas.LeaderboardEntry(
+            doc_id=row.doc_id,
+            score=row.score,
+            views=row.views,
+            edits=row.edits,
+        )
+        for row in rows
+    ]
+
+
+def _checkpoints_by_suffix(checkpoints: dict[str, int], name: str) -> dict[str, int]:
+    return {
+        key[len(name) :]: last_id
+        for key, last_id in checkpoints.items()
+        if key == name or key.startswith(f"{name}:shard-")
+    }
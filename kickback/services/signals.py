@@ -2,17 +2,19 @@ from __future__ import annotations
 
 import datetime as dt
 import logging
+from typing import AsyncIterable, Awaitable, Callable
 
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from kickback.core import flags
 from kickback.core.cache import get_redis
+from kickback.core.ndjson import NdjsonLine
 from kickback.core.types import PermissionRole, SignalKind
 from kickback.domain import schemas
 from kickback.infra.repositories.permissions_repo import PermissionRepository
 from kickback.infra.repositories.signals_repo import DuplicateSignalError, SignalRepository
 
-
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +26,12 @@ class SignalConflictError(Exception):
     ...
 
 
+def _describe(exc: ValidationError) -> str:
+    error = exc.errors(include_url=False)[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
 class SignalsService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -31,11 +39,7 @@ class SignalsService:
         self.permissions = PermissionRepository(session)
 
     async def ingest_signal(self, payload: schemas.SignalCreate) -> schemas.SignalRead:
-        role = await self.permissions.get_role(payload.doc_id, payload.user_id)
-        self._ensure_permission(role, payload.kind)
-
-        if payload.idem_key and flags.idempotency_guard_enabled():
-            await self._assert_idempotency(payload.idem_key)
+        await self.authorize(payload)
 
         try:
             record = await self.repo.create(payload)
@@ -51,6 +55,99 @@ class SignalsService:
             idem_key=record.idem_key,
         )
 
+    async def authorize(self, payload: schemas.SignalCreate) -> None:
+        role = await self.permissions.get_role(payload.doc_id, payload.user_id)
+        self._ensure_permission(role, payload.kind)
+
+        if payload.idem_key and flags.idempotency_guard_enabled():
+            await self._assert_idempotency(payload.idem_key)
+
+    async def ingest_batch(self, payloads: list[schemas.SignalCreate]) -> schemas.SignalBatchResult:
+        roles = await self.permissions.get_roles((p.doc_id, p.user_id) for p in payloads)
+
+        items: list[schemas.SignalBatchItem | None] = [None] * len(payloads)
+        permitted: list[int] = []
+        for index, payload in enumerate(payloads):
+            try:
+                self._ensure_permission(roles.get((payload.doc_id, payload.user_id)), payload.kind)
+            except PermissionDeniedError:
+                items[index] = schemas.SignalBatchItem(index=index, status="forbidden")
+            else:
+                permitted.append(index)
+
+        ids = await self.repo.bulk_create([payloads[index] for index in permitted])
+        for index, signal_id in zip(permitted, ids, strict=True):
+            status = "created" if signal_id is not None else "duplicate"
+            items[index] = schemas.SignalBatchItem(index=index, status=status, id=signal_id)
+
+        results = [item for item in items if item is not None]
+        return schemas.SignalBatchResult(
+            created=sum(item.status == "created" for item in results),
+            duplicates=sum(item.status == "duplicate" for item in results),
+            forbidden=sum(item.status == "forbidden" for item in results),
+            items=results,
+        )
+
+    async def ingest_stream(
+        self,
+        lines: AsyncIterable[NdjsonLine],
+        chunk_size: int,
+        max_errors: int,
+        before_flush: Callable[[int], Awaitable[None]] | None = None,
+    ) -> schemas.SignalStreamResult:
+        """Validate NDJSON lines and commit them in chunks of ``chunk_size``.
+
+        Only one chunk and at most ``max_errors`` error records are held at a
+        time, and the next chunk is not read until the previous one is
+        committed, so slow writes push back on the client through the socket.
+        """
+        result = schemas.SignalStreamResult(
+            lines=0, created=0, duplicates=0, forbidden=0, invalid=0, errors=[]
+        )
+        pending: list[tuple[NdjsonLine, schemas.SignalCreate]] = []
+
+        def record_error(line: NdjsonLine, error: str) -> None:
+            if len(result.errors) < max_errors:
+                result.errors.append(
+                    schemas.SignalStreamError(line=line.number, offset=line.offset, error=error)
+                )
+            else:
+                result.errors_truncated = True
+
+        async def flush() -> None:
+            if not pending:
+                return
+            if before_flush is not None:
+                await before_flush(len(pending))
+            batch = await self.ingest_batch([payload for _, payload in pending])
+            await self.session.commit()
+            result.created += batch.created
+            result.duplicates += batch.duplicates
+            result.forbidden += batch.forbidden
+            for item in batch.items:
+                if item.status == "forbidden":
+                    record_error(pending[item.index][0], "Permission denied")
+            pending.clear()
+
+        async for line in lines:
+            result.lines += 1
+            if line.too_long:
+                result.invalid += 1
+                record_error(line, "Line too long")
+                continue
+            try:
+                payload = schemas.SignalCreate.model_validate_json(line.data)
+            except ValidationError as exc:
+                result.invalid += 1
+                record_error(line, _describe(exc))
+                continue
+            pending.append((line, payload))
+            if len(pending) >= chunk_size:
+                await flush()
+
+        await flush()
+        return result
+
     def _ensure_permission(self, role: PermissionRole | None, kind: SignalKind) -> None:
         if role is None:
             raise PermissionDeniedError
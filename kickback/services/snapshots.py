@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.services.search import (
+    SearchService,
+    checkpoint_watermark,
+    leaderboard_cursor,
+    window_start,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    start: dt.datetime
+    watermark: str
+    refreshed_at: float
+    # payloads[k - 1] is the encoded response for limit=k, cursors[k - 1] its next page.
+    payloads: tuple[bytes, ...]
+    cursors: tuple[str | None, ...]
+
+
+class LeaderboardSnapshots:
+    """In-process top-K for the standard windows, held as encoded JSON responses.
+
+    A background task polls the projector checkpoints every ``poll_seconds``
+    and recomputes a window when they moved, when its start rolled over (at
+    midnight for day windows) or after ``max_age_seconds``. Requests with
+    ``limit <= size`` are then answered from memory with no database round
+    trip and no serialization. A snapshot older than twice ``max_age_seconds``
+    is not served, so requests fall back to the database if refreshing stalls.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        windows: Sequence[str] = ("1d", "7d", "30d"),
+        size: int = 100,
+        poll_seconds: float = 1.0,
+        max_age_seconds: float = 60.0,
+    ):
+        self._sessionmaker = sessionmaker
+        self.windows = tuple(windows)
+        self.size = size
+        self.poll_seconds = poll_seconds
+        self.max_age_seconds = max_age_seconds
+        self._snapshots: dict[str, Snapshot] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def get(self, window: str, limit: int) -> tuple[bytes, str | None] | None:
+        """Encoded first page and its next-page cursor, or ``None`` to use the database."""
+        snapshot = self._snapshots.get(window)
+        if snapshot is None:
+            return None
+        count = len(snapshot.payloads)
+        # A snapshot shorter than ``size`` already holds every document in the window.
+        if limit > count and count == self.size:
+            return None
+        if time.monotonic() - snapshot.refreshed_at > 2 * self.max_age_seconds:
+            return None
+        if snapshot.start != window_start(window, dt.datetime.now(dt.UTC)):
+            return None
+        if count == 0:
+            return b"[]", None
+        index = min(limit, count) - 1
+        return snapshot.payloads[index], snapshot.cursors[index]
+
+    async def refresh(self) -> int:
+        """Recompute the windows that are out of date; returns how many were."""
+        refreshed = 0
+        now = dt.datetime.now(dt.UTC)
+        async with self._sessionmaker() as session:
+            checkpoints = await SearchRepository(session).projector_checkpoints()
+            watermark = checkpoint_watermark(checkpoints)
+            # Always the rollups, never Redis: the cursors below continue on the rollups.
+            service = SearchService(session)
+            for window in self.windows:
+                start = window_start(window, now)
+                current = self._snapshots.get(window)
+                if (
+                    current is not None
+                    and current.watermark == watermark
+                    and current.start == start
+                    and time.monotonic() - current.refreshed_at < self.max_age_seconds
+                ):
+                    continue
+                # A cached page could be up to cache_ttl_seconds old, which would
+                # hold decayed scores past max_age_seconds.
+                page = await service.leaderboard_page(
+                    window=window, limit=self.size, use_cache=False
+                )
+                encoded = [entry.model_dump_json().encode() for entry in page.entries]
+                counts = range(1, len(encoded) + 1)
+                payloads = tuple(b"[" + b",".join(encoded[:count]) + b"]" for count in counts)
+                cursors = tuple(
+                    leaderboard_cursor(page.as_of, page.entries[count - 1])
+                    if count < len(encoded)
+                    else page.next_cursor
+                    for count in counts
+                )
+                self._snapshots[window] = Snapshot(
+                    start, watermark, time.monotonic(), payloads, cursors
+                )
+                refreshed += 1
+        return refreshed
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="leaderboard-snapshots")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Leaderboard snapshot refresh failed")
+            await asyncio.sleep(self.poll_seconds)
+
+
+_snapshots: LeaderboardSnapshots | None = None
+
+
+def get_leaderboard_snapshots() -> LeaderboardSnapshots | None:
+    return _snapshots
+
+
+def set_leaderboard_snapshots(snapshots: LeaderboardSnapshots | None) -> None:
+    global _snapshots
+    _snapshots = snapshots
@@ -0,0 +1,27 @@
+"""api key public id
+
+Revision ID: 0002_api_key_id
+Revises: 0001_init
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002_api_key_id"
+down_revision = "0001_init"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable so keys issued before the kb_<id>_<secret> format keep authenticating.
+    op.add_column("api_keys", sa.Column("key_id", sa.String(length=32), nullable=True))
+    op.create_index("ix_api_keys_key_id", "api_keys", ["key_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_api_keys_key_id", table_name="api_keys")
+    op.drop_column("api_keys", "key_id")
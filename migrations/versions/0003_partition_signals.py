@@ -0,0 +1,101 @@
+"""partition signals by month
+
+Revision ID: 0003_partition_signals
+Revises: 0002_api_key_id
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+from alembic import op
+
+from kickback.infra.partitions import add_months, create_partition_sql, month_start
+
+revision = "0003_partition_signals"
+down_revision = "0002_api_key_id"
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE signals RENAME TO signals_unpartitioned")
+    op.execute("ALTER INDEX signals_pkey RENAME TO signals_unpartitioned_pkey")
+    op.execute(
+        "ALTER TABLE signals_unpartitioned "
+        "RENAME CONSTRAINT signals_idem_key_key TO signals_unpartitioned_idem_key_key"
+    )
+
+    # Unique constraints on a partitioned table must include the partition key, so
+    # idem_key deduplicates per occurred_at here; 0009 adds the global signal_idem_keys.
+    op.execute(
+        """
+        CREATE TABLE signals (
+            id bigint NOT NULL DEFAULT nextval('signals_id_seq'),
+            doc_id bigint NOT NULL REFERENCES documents (id),
+            user_id bigint NOT NULL REFERENCES users (id),
+            kind signal_kind NOT NULL,
+            occurred_at timestamptz NOT NULL,
+            idem_key varchar(255),
+            CONSTRAINT signals_pkey PRIMARY KEY (id, occurred_at),
+            CONSTRAINT signals_idem_key_key UNIQUE (idem_key, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+        """
+    )
+    op.execute("CREATE INDEX ix_signals_doc_id_occurred_at ON signals (doc_id, occurred_at)")
+    op.execute("CREATE TABLE signals_default PARTITION OF signals DEFAULT")
+
+    earliest = bind.exec_driver_sql("SELECT min(occurred_at) FROM signals_unpartitioned").scalar()
+    today = dt.datetime.now(dt.UTC).date()
+    month = month_start(earliest.astimezone(dt.UTC).date() if earliest else today)
+    last = add_months(month_start(today), PREMAKE_MONTHS)
+    while month <= last:
+        op.execute(create_partition_sql(month))
+        month = add_months(month, 1)
+
+    op.execute(
+        "INSERT INTO signals (id, doc_id, user_id, kind, occurred_at, idem_key) "
+        "SELECT id, doc_id, user_id, kind, occurred_at, idem_key FROM signals_unpartitioned"
+    )
+    op.execute("ALTER SEQUENCE signals_id_seq OWNED BY signals.id")
+    op.execute("DROP TABLE signals_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE signals RENAME TO signals_partitioned")
+    op.execute("ALTER INDEX signals_pkey RENAME TO signals_partitioned_pkey")
+    op.execute(
+        "ALTER TABLE signals_partitioned "
+        "RENAME CONSTRAINT signals_idem_key_key TO signals_partitioned_idem_key_key"
+    )
+    op.execute(
+        """
+        CREATE TABLE signals (
+            id bigint NOT NULL DEFAULT nextval('signals_id_seq'),
+            doc_id bigint NOT NULL REFERENCES documents (id),
+            user_id bigint NOT NULL REFERENCES users (id),
+            kind signal_kind NOT NULL,
+            occurred_at timestamptz NOT NULL,
+            idem_key varchar(255),
+            CONSTRAINT signals_pkey PRIMARY KEY (id),
+            CONSTRAINT signals_idem_key_key UNIQUE (idem_key)
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO signals (id, doc_id, user_id, kind, occurred_at, idem_key) "
+        "SELECT id, doc_id, user_id, kind, occurred_at, idem_key FROM signals_partitioned"
+    )
+    op.execute("ALTER SEQUENCE signals_id_seq OWNED BY signals.id")
+    op.execute("DROP TABLE signals_partitioned CASCADE")
@@ -0,0 +1,51 @@
+"""notify on signal inserts
+
+Revision ID: 0004_signals_notify
+Revises: 0003_partition_signals
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from kickback.infra.notify import SIGNALS_CHANNEL
+
+revision = "0004_signals_notify"
+down_revision = "0003_partition_signals"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Statement-level, and Postgres folds identical notifications within a transaction,
+    # so a bulk insert or COPY merge costs one NOTIFY rather than one per row.
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION signals_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{SIGNALS_CHANNEL}', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER signals_notify AFTER INSERT ON signals
+        FOR EACH STATEMENT EXECUTE FUNCTION signals_notify()
+        """
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS signals_notify ON signals")
+    op.execute("DROP FUNCTION IF EXISTS signals_notify()")
@@ -0,0 +1,31 @@
+"""hourly search signal counts
+
+Revision ID: 0005_search_signals_hourly
+Revises: 0004_signals_notify
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_search_signals_hourly"
+down_revision = "0004_signals_notify"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_signals_hourly",
+        sa.Column("doc_id", sa.BigInteger(), nullable=False),
+        sa.Column("hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("views", sa.Integer(), nullable=False),
+        sa.Column("edits", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("doc_id", "hour"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("search_signals_hourly")
@@ -0,0 +1,31 @@
+"""weekly search signal counts
+
+Revision ID: 0006_search_signals_weekly
+Revises: 0005_search_signals_hourly
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_search_signals_weekly"
+down_revision = "0005_search_signals_hourly"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_signals_weekly",
+        sa.Column("doc_id", sa.BigInteger(), nullable=False),
+        sa.Column("week", sa.Date(), nullable=False),
+        sa.Column("views", sa.Integer(), nullable=False),
+        sa.Column("edits", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("doc_id", "week"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("search_signals_weekly")
@@ -0,0 +1,35 @@
+"""drop frozen recency_score
+
+Revision ID: 0007_drop_recency_score
+Revises: 0006_search_signals_weekly
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_drop_recency_score"
+down_revision = "0006_search_signals_weekly"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Scores are computed at query time from views/edits and the bucket's age.
+    op.drop_column("search_signals_daily", "recency_score")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "search_signals_daily",
+        sa.Column(
+            "recency_score",
+            sa.Numeric(precision=12, scale=4),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+    op.execute("UPDATE search_signals_daily SET recency_score = views + edits * 2")
+    op.alter_column("search_signals_daily", "recency_score", server_default=None)
@@ -0,0 +1,52 @@
+"""covering indexes for leaderboard window scans
+
+Revision ID: 0008_rollup_covering_indexes
+Revises: 0007_drop_recency_score
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0008_rollup_covering_indexes"
+down_revision = "0007_drop_recency_score"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_search_signals_daily_day_doc_id", "search_signals_daily", "day"),
+    ("ix_search_signals_hourly_hour_doc_id", "search_signals_hourly", "hour"),
+    ("ix_search_signals_weekly_week_doc_id", "search_signals_weekly", "week"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        for name, table, bucket in INDEXES:
+            op.create_index(name, table, [bucket, "doc_id"])
+        return
+
+    # Built concurrently so the projector keeps writing while the rollups are indexed.
+    with op.get_context().autocommit_block():
+        for name, table, bucket in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [bucket, "doc_id"],
+                postgresql_include=["views", "edits"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,36 @@
+"""global idem_key registry for partitioned signals
+
+Revision ID: 0009_signal_idem_keys
+Revises: 0008_rollup_covering_indexes
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0009_signal_idem_keys"
+down_revision = "0008_rollup_covering_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "signal_idem_keys",
+        sa.Column("idem_key", sa.String(length=255), primary_key=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_signal_idem_keys_occurred_at", "signal_idem_keys", ["occurred_at"])
+    # Since 0003 the same idem_key may exist at several occurred_at; register the earliest.
+    op.execute(
+        "INSERT INTO signal_idem_keys (idem_key, occurred_at) "
+        "SELECT idem_key, min(occurred_at) FROM signals "
+        "WHERE idem_key IS NOT NULL GROUP BY idem_key"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_signal_idem_keys_occurred_at", table_name="signal_idem_keys")
+    op.drop_table("signal_idem_keys")
@@ -0,0 +1,37 @@
+"""batch totals on projector_state
+
+Revision ID: 0010_projector_state_stats
+Revises: 0009_signal_idem_keys
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0010_projector_state_stats"
+down_revision = "0009_signal_idem_keys"
+branch_labels = None
+depends_on = None
+
+_TOTALS = ("batches", "signals_projected", "upserts")
+
+
+def upgrade() -> None:
+    # Written with each checkpoint so the status endpoint sees every projector process.
+    for column in _TOTALS:
+        op.add_column(
+            "projector_state",
+            sa.Column(column, sa.BigInteger(), nullable=False, server_default="0"),
+        )
+    op.add_column(
+        "projector_state",
+        sa.Column("batch_seconds", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.add_column("projector_state", sa.Column("last_batch_seconds", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for column in ("last_batch_seconds", "batch_seconds", *reversed(_TOTALS)):
+        op.drop_column("projector_state", column)
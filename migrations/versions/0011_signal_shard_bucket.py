@@ -0,0 +1,56 @@
+"""indexable projector shard bucket on signals
+
+Revision ID: 0011_signal_shard_bucket
+Revises: 0010_projector_state_stats
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0011_signal_shard_bucket"
+down_revision = "0010_projector_state_stats"
+branch_labels = None
+depends_on = None
+
+SHARD_BUCKETS = 1024
+
+
+def upgrade() -> None:
+    # Shards used to own doc_id % shards and now own bucket ranges, so progress made
+    # under a sharded checkpoint would be applied to the wrong documents.
+    sharded = op.get_bind().exec_driver_sql(
+        "SELECT name FROM projector_state WHERE name LIKE '%:shard-%' AND last_signal_id > 0"
+    )
+    names = sorted(sharded.scalars())
+    if names:
+        raise RuntimeError(
+            f"Sharded projector checkpoints hold progress ({', '.join(names)}); run "
+            "'kickback-projector reshard --shards 1' with the previous release before upgrading"
+        )
+
+    # Stored rather than virtual so it can be indexed; SQLite only adds stored
+    # generated columns by rebuilding the table.
+    column = sa.Column(
+        "shard_bucket",
+        sa.SmallInteger(),
+        sa.Computed(f"doc_id % {SHARD_BUCKETS}", persisted=True),
+        nullable=False,
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.add_column("signals", column)
+    else:
+        with op.batch_alter_table("signals", recreate="always") as batch:
+            batch.add_column(column)
+    op.create_index("ix_signals_shard_bucket_id", "signals", ["shard_bucket", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_signals_shard_bucket_id", table_name="signals")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_column("signals", "shard_bucket")
+    else:
+        with op.batch_alter_table("signals", recreate="always") as batch:
+            batch.drop_column("shard_bucket")
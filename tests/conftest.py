@@ -14,14 +14,14 @@ os.environ.setdefault("KICK_FLAGS__FF_CACHE_ENABLED", "false")
 os.environ.setdefault("KICK_FLAGS__FF_IDEMPOTENCY_REDIS_GUARD", "false")
 os.environ.setdefault("KICK_FLAGS__FF_PROJECTOR_ENABLED", "true")
 
-from kickback.api.app import create_app  # noqa: E402
 from kickback.api import deps  # noqa: E402
+from kickback.api.app import create_app  # noqa: E402
 from kickback.core import settings  # noqa: E402
+from kickback.core.auth_cache import get_principal_cache  # noqa: E402
 from kickback.core.security import generate_api_key  # noqa: E402
 from kickback.core.types import ApiKeyStatus  # noqa: E402
 from kickback.domain.models import ApiKey, Base  # noqa: E402
 
-
 settings.get_settings.cache_clear()
 
 
@@ -43,25 +43,32 @@ def _stub_redis(monkeypatch):
         async def delete(self, key: str):
             self.store.pop(key, None)
 
+        async def publish(self, channel: str, message: str) -> int:
+            return 0
+
         async def script_load(self, source: str) -> str:
             return "stub-sha"
 
         async def evalsha(self, sha: str, numkeys: int, *args):
-            # allow all requests by default
-            return (1, 100)
+            # allow all requests by default: grant whatever was requested
+            if numkeys == 1:
+                return (args[numkeys + 2], 100, "0")
+            return (args[numkeys + 3], 100)
 
     dummy = DummyRedis()
 
     async def fake_get_redis():
         return dummy
 
-    async def fake_load_script(_):
+    async def fake_load_script(*_):
         return "stub-sha"
 
     monkeypatch.setattr("kickback.core.cache.get_redis", fake_get_redis)
     monkeypatch.setattr("kickback.core.rate_limit.get_redis", fake_get_redis)
+    monkeypatch.setattr("kickback.core.auth_cache.get_redis", fake_get_redis)
     monkeypatch.setattr("kickback.services.signals.get_redis", fake_get_redis)
     monkeypatch.setattr("kickback.core.rate_limit._load_script", fake_load_script)
+    get_principal_cache().clear()
 
 
 
@@ -109,6 +116,7 @@ async def api_token(session_factory) -> str:
     async with session_factory() as session:
         api_key = ApiKey(
             client_name="test",
+            key_id=generated.key_id,
             key_hash=generated.key_hash,
             salt=generated.salt,
             roles={"admin": True},
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import datetime as dt
+import secrets
+
 import pytest
 from fastapi import HTTPException, status
 from httpx import ASGITransport, AsyncClient
 
 from kickback.api import deps
+from kickback.core.auth_cache import ApiPrincipal, PrincipalCache
+from kickback.core.security import hash_api_key, parse_key_id
+from kickback.core.types import ApiKeyStatus
+from kickback.domain.models import ApiKey
 
 
 @pytest.mark.anyio
@@ -28,3 +35,92 @@ async def test_rate_limit_returns_429(app, api_token):
         response = await client.get("/v1/documents/1", headers=headers)
 
     assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.anyio
+async def test_prefixed_key_uses_single_lookup(app, api_token, monkeypatch):
+    from kickback.infra.repositories.api_keys_repo import ApiKeyRepository
+
+    async def _no_scan(self, legacy_only: bool = False):
+        raise AssertionError("prefixed keys must not scan active keys")
+
+    monkeypatch.setattr(ApiKeyRepository, "fetch_active", _no_scan)
+
+    assert parse_key_id(api_token) is not None
+    headers = {"X-API-KEY": api_token}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        ok = await client.get("/v1/documents/1", headers=headers)
+        tampered = await client.get("/v1/documents/1", headers={"X-API-KEY": api_token + "x"})
+
+    assert ok.status_code == status.HTTP_404_NOT_FOUND
+    assert tampered.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_legacy_key_still_accepted(app, session_factory):
+    legacy_raw = secrets.token_urlsafe(32)
+    salt = secrets.token_hex(16)
+    async with session_factory() as session:
+        session.add(
+            ApiKey(
+                client_name="legacy",
+                key_hash=hash_api_key(legacy_raw, salt),
+                salt=salt,
+                roles={},
+                status=ApiKeyStatus.ACTIVE,
+            )
+        )
+        await session.commit()
+
+    assert parse_key_id(legacy_raw) is None
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/v1/documents/1", headers={"X-API-KEY": legacy_raw})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_principal_cache_skips_lookup_until_disabled(app, api_token, monkeypatch):
+    calls = {"count": 0}
+    original = deps._lookup_api_key
+
+    async def counting_lookup(session, raw_key):
+        calls["count"] += 1
+        return await original(session, raw_key)
+
+    monkeypatch.setattr(deps, "_lookup_api_key", counting_lookup)
+
+    headers = {"X-API-KEY": api_token}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await client.get("/v1/documents/1", headers=headers)
+        await client.get("/v1/documents/1", headers=headers)
+        assert calls["count"] == 1
+
+        listed = await client.get("/v1/api-keys", headers=headers)
+        key_id = listed.json()[0]["id"]
+        disabled = await client.post(f"/v1/api-keys/{key_id}/disable", headers=headers)
+        after = await client.get("/v1/documents/1", headers=headers)
+
+    assert disabled.status_code == status.HTTP_204_NO_CONTENT
+    assert after.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_principal_cache_bounds_and_expiry():
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", ApiPrincipal(id=1, client_name="a"))
+    cache.put("b", ApiPrincipal(id=2, client_name="b"))
+    assert cache.get("a") is not None
+    cache.put("c", ApiPrincipal(id=3, client_name="c"))
+
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    expired = dt.datetime.now(dt.UTC) - dt.timedelta(seconds=1)
+    cache.put("d", ApiPrincipal(id=4, client_name="d", expires_at=expired))
+    assert cache.get("d") is None
+
+    cache.invalidate(1)
+    assert cache.get("a") is None
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
 import datetime as dt
+import time
 
 import pytest
+import sqlalchemy as sa
+from httpx import ASGITransport, AsyncClient
 
+from kickback.core.metrics import get_metrics
 from kickback.core.types import PermissionRole, SignalKind
 from kickback.domain import models
-from kickback.services.projector import SignalProjector
+from kickback.infra.notify import SignalWakeup
 from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.infra.repositories.signals_repo import _after_id, shard_of
+from kickback.services.aggregation import aggregate_daily, aggregate_hourly, aggregate_weekly
+from kickback.services.projections import get_projections
+from kickback.services.projector import (
+    DEFAULT_PROJECTOR_NAME,
+    BatchSizer,
+    ProjectorMonitor,
+    ProjectorPipeline,
+    ProjectorReshard,
+    ShardedProjectorRunner,
+    ShardLayoutError,
+    SignalProjector,
+    parse_shard_name,
+    shard_name,
+)
+from kickback.services.rebuild import ProjectionRebuild
 
 
 @pytest.mark.anyio
@@ -22,7 +42,7 @@ async def test_projector_idempotent(session_factory):
         permission = models.Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.OWNER)
         session.add(permission)
 
-        now = dt.datetime.now(dt.timezone.utc)
+        now = dt.datetime.now(dt.UTC)
         session.add_all(
             [
                 models.Signal(
@@ -58,3 +78,472 @@ async def test_projector_idempotent(session_factory):
         entry = rows[0]
         assert entry.views == 1
         assert entry.edits == 1
+
+
+@pytest.mark.anyio
+async def test_projector_merges_counts_across_batches(session_factory):
+    async with session_factory() as session:
+        user = models.User(email="merge@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="merge-doc", title="Merge Doc", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+
+        occurred_at = dt.datetime.now(dt.UTC)
+        kinds = [SignalKind.VIEW] * 5 + [SignalKind.UPDATE] * 2
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id, user_id=user.id, kind=kind, occurred_at=occurred_at
+                )
+                for kind in kinds
+            ]
+        )
+        await session.commit()
+        doc_id = document.id
+
+    async with session_factory() as session:
+        projector = SignalProjector(session=session, batch_size=3)
+        while await projector.run_once():
+            await session.commit()
+
+        rows = await SearchRepository(session).daily_for_doc(doc_id=doc_id)
+        assert len(rows) == 1
+        assert (rows[0].views, rows[0].edits) == (5, 2)
+
+
+@pytest.mark.anyio
+async def test_sharded_runner_projects_each_doc_once(session_factory):
+    async with session_factory() as session:
+        user = models.User(email="shards@example.com")
+        session.add(user)
+        await session.flush()
+        # Spread over the bucket ranges so every one of the three shards gets documents.
+        documents = [
+            models.Document(
+                id=index * models.SHARD_BUCKETS // 5 + 1,
+                external_key=f"shard-doc-{index}",
+                title="Shard Doc",
+                owner_id=user.id,
+            )
+            for index in range(5)
+        ]
+        session.add_all(documents)
+        await session.flush()
+
+        occurred_at = dt.datetime.now(dt.UTC)
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id,
+                    user_id=user.id,
+                    kind=SignalKind.VIEW,
+                    occurred_at=occurred_at,
+                )
+                for document in documents
+                for _ in range(3)
+            ]
+        )
+        await session.commit()
+        doc_ids = [document.id for document in documents]
+
+    runner = ShardedProjectorRunner(
+        session_factory, shards=3, workers=2, batch_size=1, min_batch_size=1, max_batch_size=2
+    )
+    while await runner.run_sweep(worker=1):
+        pass
+
+    async with session_factory() as session:
+        repo = SearchRepository(session)
+        for doc_id in doc_ids:
+            rows = await repo.daily_for_doc(doc_id=doc_id)
+            assert [(row.views, row.edits) for row in rows] == [(3, 0)]
+        for shard in range(3):
+            state = await repo.get_projector_state(shard_name(DEFAULT_PROJECTOR_NAME, shard, 3))
+            assert state is not None and state.last_signal_id > 0
+        assert await repo.get_projector_state(DEFAULT_PROJECTOR_NAME) is None
+
+
+@pytest.mark.anyio
+async def test_reshard_seeds_new_checkpoints_without_recounting(session_factory):
+    async with session_factory() as session:
+        user = models.User(email="reshard@example.com")
+        session.add(user)
+        await session.flush()
+        documents = [
+            models.Document(external_key=f"reshard-doc-{index}", title="Reshard", owner_id=user.id)
+            for index in range(4)
+        ]
+        session.add_all(documents)
+        await session.flush()
+        occurred_at = dt.datetime.now(dt.UTC)
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=doc.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=occurred_at
+                )
+                for _ in range(3)
+                for doc in documents
+            ]
+        )
+        await session.commit()
+        doc_ids = [document.id for document in documents]
+
+    projections = get_projections(["search_signals_projector"])
+    # Shard 0 caught up, shard 1 one small batch in: the old layout is inconsistent.
+    for shard, max_batches in ((0, None), (1, 1)):
+        await ProjectorPipeline(
+            session_factory,
+            BatchSizer(2, 2, 2, target_seconds=1.0),
+            projections=projections,
+            shard=shard,
+            shards=2,
+            max_batches=max_batches,
+        ).drain()
+
+    three = ShardedProjectorRunner(session_factory, shards=3, projections=projections)
+    with pytest.raises(ShardLayoutError):
+        await three.run_sweep()
+
+    seeded = await ProjectorReshard(session_factory, projections, shards=3).run()
+    assert await three.run_until_caught_up() == 0
+
+    async with session_factory() as session:
+        repo = SearchRepository(session)
+        for doc_id in doc_ids:
+            rows = await repo.daily_for_doc(doc_id=doc_id)
+            assert [(row.views, row.edits) for row in rows] == [(3, 0)]
+        checkpoints = await repo.projector_checkpoints()
+    assert checkpoints == {
+        shard_name(DEFAULT_PROJECTOR_NAME, shard, 3): seeded[DEFAULT_PROJECTOR_NAME]
+        for shard in range(3)
+    }
+    with pytest.raises(ShardLayoutError):
+        await ShardedProjectorRunner(session_factory, shards=2, projections=projections).run_once()
+
+
+@pytest.mark.anyio
+async def test_signal_wakeup_debounces_and_falls_back_to_polling(async_engine):
+    wakeup = SignalWakeup(async_engine, debounce_seconds=0.01)
+    assert await wakeup.start() is False
+
+    event = wakeup.waiter()
+    assert await wakeup.wait(event, wait_seconds=0.01) is False
+
+    wakeup._on_notify()
+    wakeup._on_notify()
+    assert await wakeup.wait(event, wait_seconds=1.0) is True
+    assert not event.is_set()
+    await wakeup.close()
+
+
+@pytest.mark.anyio
+async def test_signal_wakeup_polls_at_poll_interval_while_disconnected(async_engine):
+    wakeup = SignalWakeup(async_engine, debounce_seconds=0, fallback_seconds=30.0)
+    event = wakeup.waiter()
+    wakeup._conn = object()  # type: ignore[assignment]
+    wakeup._on_terminated()
+    event.clear()
+
+    # The reconnect fails (SQLite cannot LISTEN), so the short poll interval applies again.
+    started = time.perf_counter()
+    assert await wakeup.wait(event, wait_seconds=0.01) is False
+    assert time.perf_counter() - started < 1.0
+    wakeup._stale = None
+
+
+def test_batch_sizer_grows_on_backlog_and_shrinks_when_caught_up():
+    sizer = BatchSizer(initial=500, minimum=100, maximum=4000, target_seconds=1.0)
+    assert sizer.observe(requested=500, fetched=500, seconds=0.1) == 1000
+    assert sizer.observe(requested=1000, fetched=1000, seconds=0.1) == 2000
+    assert sizer.observe(requested=2000, fetched=2000, seconds=4.0) == 1000
+    assert sizer.observe(requested=1000, fetched=1000, seconds=0.1) == 2000
+    assert sizer.observe(requested=2000, fetched=2000, seconds=0.1) == 4000
+    assert sizer.observe(requested=4000, fetched=4000, seconds=0.1) == 4000
+    assert sizer.observe(requested=4000, fetched=10, seconds=0.1) == 2000
+    assert sizer.observe(requested=2000, fetched=0, seconds=0.1) == 1000
+
+
+def test_aggregate_daily_vectorized_matches_python():
+    pytest.importorskip("numpy")
+    now = dt.datetime(2026, 10, 17, 12, tzinfo=dt.UTC)
+    kinds = [SignalKind.VIEW, SignalKind.UPDATE, SignalKind.VIEW, SignalKind.CREATE]
+    rows = [
+        (index, 1000 + index % 7, 1, kinds[index % 4], now - dt.timedelta(hours=index * 5))
+        for index in range(3000)
+    ]
+
+    expected = aggregate_daily(rows, vectorize=False)
+    assert aggregate_daily(rows, vectorize=True) == expected
+    first = expected[0]
+    assert (first.doc_id, first.day) == (1000, now.date())
+    assert sum(delta.views + delta.edits for delta in expected) == len(rows)
+
+
+def test_aggregates_bucket_aware_times_in_utc():
+    # Sunday evening in UTC-5 is already Monday in UTC.
+    sunday = dt.datetime(2026, 10, 18, 23, 30, tzinfo=dt.timezone(dt.timedelta(hours=-5)))
+    rows = [(1, 1000, 1, SignalKind.VIEW, sunday)]
+
+    assert [delta.day for delta in aggregate_daily(rows)] == [dt.date(2026, 10, 19)]
+    assert [delta.week for delta in aggregate_weekly(rows)] == [dt.date(2026, 10, 19)]
+    assert [delta.hour for delta in aggregate_hourly(rows)] == [
+        dt.datetime(2026, 10, 19, 4, tzinfo=dt.UTC)
+    ]
+
+
+@pytest.mark.anyio
+async def test_rebuild_swaps_in_fresh_aggregates_and_checkpoint(session_factory):
+    async with session_factory() as session:
+        user = models.User(email="rebuild@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="rebuild-doc", title="Rebuild", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+
+        occurred_at = dt.datetime.now(dt.UTC)
+        kinds = [SignalKind.VIEW] * 4 + [SignalKind.UPDATE] * 3
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id, user_id=user.id, kind=kind, occurred_at=occurred_at
+                )
+                for kind in kinds
+            ]
+        )
+        # A stale row the rebuild must discard.
+        session.add(
+            models.SearchSignalsDaily(
+                doc_id=document.id, day=occurred_at.date(), views=99, edits=0
+            )
+        )
+        await session.commit()
+        doc_id = document.id
+
+    result = await ProjectionRebuild(session_factory, workers=2, chunk_size=2).run()
+    assert (result.signals, result.rows) == (7, 3)
+
+    async with session_factory() as session:
+        repo = SearchRepository(session)
+        rows = await repo.daily_for_doc(doc_id=doc_id)
+        assert [(row.views, row.edits) for row in rows] == [(4, 3)]
+        for table in (models.SearchSignalsHourly, models.SearchSignalsWeekly):
+            counts = await session.execute(sa.select(table.views, table.edits))
+            assert counts.all() == [(4, 3)]
+        for name in (DEFAULT_PROJECTOR_NAME, "search_signals_hourly", "search_signals_weekly"):
+            state = await repo.get_projector_state(name)
+            assert state.last_signal_id == result.high_water_id
+        assert await SignalProjector(session=session).run_once() == 0
+
+
+@pytest.mark.anyio
+async def test_new_projection_backfills_without_replaying_existing_ones(session_factory):
+    async with session_factory() as session:
+        user = models.User(email="fanout@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="fanout-doc", title="Fanout", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+
+        occurred_at = dt.datetime(2026, 10, 17, 9, 30, tzinfo=dt.UTC)
+        kinds = [SignalKind.VIEW] * 3 + [SignalKind.UPDATE] * 2
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id, user_id=user.id, kind=kind, occurred_at=occurred_at
+                )
+                for kind in kinds
+            ]
+        )
+        await session.commit()
+        doc_id = document.id
+
+    async with session_factory() as session:
+        await SignalProjector(session=session, batch_size=100).run_once()
+        await session.commit()
+
+    pipeline = ProjectorPipeline(
+        session_factory,
+        BatchSizer(initial=2, minimum=2, maximum=2, target_seconds=1.0),
+        projections=get_projections(["search_signals_projector", "search_signals_hourly"]),
+        backfill_batches=1,
+    )
+    assert await pipeline.drain() == 2
+    while await pipeline.drain():
+        pass
+
+    async with session_factory() as session:
+        daily = await SearchRepository(session).daily_for_doc(doc_id=doc_id)
+        assert [(row.views, row.edits) for row in daily] == [(3, 2)]
+        hourly = (await session.scalars(sa.select(models.SearchSignalsHourly))).all()
+        assert [(row.doc_id, row.views, row.edits) for row in hourly] == [(doc_id, 3, 2)]
+        assert hourly[0].hour.replace(tzinfo=dt.UTC) == occurred_at.replace(minute=0)
+
+
+@pytest.mark.anyio
+async def test_scan_rows_carry_user_id_for_per_user_projections(session_factory):
+    async with session_factory() as session:
+        users = [models.User(email=f"scan-{index}@example.com") for index in range(2)]
+        session.add_all(users)
+        await session.flush()
+        document = models.Document(external_key="scan-doc", title="Scan", owner_id=users[0].id)
+        session.add(document)
+        await session.flush()
+        occurred_at = dt.datetime.now(dt.UTC)
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id,
+                    user_id=user.id,
+                    kind=SignalKind.VIEW,
+                    occurred_at=occurred_at,
+                )
+                for user in (users[0], users[1], users[1])
+            ]
+        )
+        await session.commit()
+        user_ids = [user.id for user in users]
+
+    class PerUserProjection:
+        name = "per_user_test"
+
+        def __init__(self):
+            self.counts: dict[int, int] = {}
+
+        async def apply(self, session, rows, now, checkpoint):
+            for _, _, user_id, _, _ in rows:
+                self.counts[user_id] = self.counts.get(user_id, 0) + 1
+            return len(self.counts)
+
+    projection = PerUserProjection()
+    pipeline = ProjectorPipeline(
+        session_factory,
+        BatchSizer(initial=10, minimum=10, maximum=10, target_seconds=1.0),
+        projections=[projection],
+    )
+    assert await pipeline.drain() == 3
+    assert projection.counts == {user_ids[0]: 1, user_ids[1]: 2}
+
+
+@pytest.mark.anyio
+async def test_projector_status_reports_lag_and_metrics(app, api_token, session_factory):
+    get_metrics().clear()
+    async with session_factory() as session:
+        user = models.User(email="status@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="status-doc", title="Status Doc", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        old = dt.datetime.now(dt.UTC) - dt.timedelta(hours=1)
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=old
+                )
+                for _ in range(3)
+            ]
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        await SignalProjector(session=session, batch_size=2).run_once()
+        await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/admin/projector/status", headers={"X-API-KEY": api_token})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["max_signal_id"] > 0
+    [checkpoint] = body["checkpoints"]
+    assert checkpoint["projection"] == DEFAULT_PROJECTOR_NAME
+    assert checkpoint["lag_signals"] == 1
+    assert checkpoint["lag_seconds"] >= 3500
+    assert checkpoint["checkpoint_age_seconds"] is not None
+    assert (checkpoint["batches"], checkpoint["signals_projected"]) == (1, 2)
+    assert checkpoint["signals_per_second"] > 0
+    [signals] = body["metrics"]["projector_signals_total"]
+    assert signals == {"labels": {"checkpoint": DEFAULT_PROJECTOR_NAME}, "value": 2}
+    assert body["metrics"]["projector_batch_seconds"][0]["count"] == 1
+
+
+def test_parse_shard_name_round_trips():
+    assert parse_shard_name(shard_name("daily", 2, 4)) == ("daily", 2, 4)
+    assert parse_shard_name("daily") == ("daily", None, None)
+
+
+@pytest.mark.anyio
+async def test_shard_scan_reads_its_bucket_range_through_the_index(session_factory):
+    assert [shard_of(doc_id, 3) for doc_id in (0, 341, 342, 683, 1023, 1024)] == [0, 0, 1, 2, 2, 0]
+    async with session_factory() as session:
+        stmt = _after_id(sa.select(models.Signal.id), last_id=0, limit=10, shard=1, shards=3)
+        compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = await session.execute(sa.text(f"EXPLAIN QUERY PLAN {compiled}"))
+        assert any("ix_signals_shard_bucket_id" in row[-1] for row in plan)
+
+
+@pytest.mark.anyio
+async def test_projector_status_lag_is_per_shard(session_factory):
+    async with session_factory() as session:
+        user = models.User(email="shard-lag@example.com")
+        session.add(user)
+        await session.flush()
+        documents = [
+            models.Document(
+                id=index * models.SHARD_BUCKETS // 2 + 1,
+                external_key=f"shard-lag-{index}",
+                title="Lag",
+                owner_id=user.id,
+            )
+            for index in range(2)
+        ]
+        session.add_all(documents)
+        await session.flush()
+        now = dt.datetime.now(dt.UTC)
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=now
+                )
+                for document in documents
+            ]
+        )
+        await session.commit()
+        for shard in range(2):
+            await SignalProjector(session=session, shard=shard, shards=2).run_once()
+        await session.commit()
+
+        busy = next(document for document in documents if shard_of(document.id, 2) == 0)
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=busy.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=now
+                )
+                for _ in range(3)
+            ]
+        )
+        await session.commit()
+
+    get_metrics().clear()
+    async with session_factory() as session:
+        status = await ProjectorMonitor(session).status()
+        capped = await ProjectorMonitor(session, lag_cap=2).status()
+        exact = await ProjectorMonitor(session, lag_cap=2).status(exact=True)
+
+    lag = {checkpoint.shard: checkpoint.lag_signals for checkpoint in status.checkpoints}
+    assert lag == {0: 3, 1: 0}
+    # Read back from projector_state, not from this process's cleared metrics.
+    assert all(checkpoint.signals_projected == 1 for checkpoint in status.checkpoints)
+    assert [(c.lag_signals, c.lag_signals_capped) for c in capped.checkpoints] == [
+        (2, True),
+        (0, False),
+    ]
+    assert [(c.lag_signals, c.lag_signals_capped) for c in exact.checkpoints] == [
+        (3, False),
+        (0, False),
+    ]
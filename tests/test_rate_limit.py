@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from kickback.core import rate_limit
+from kickback.core.settings import get_settings
+
+
+class BucketRedis:
+    """Models the Lua token bucket without refill so round trips can be counted."""
+
+    def __init__(self, capacity: int):
+        self.tokens = capacity
+        self.calls = 0
+
+    async def evalsha(
+        self, sha, numkeys, tokens_key, ts_key, capacity, rate, now, requested, partial=0
+    ):
+        self.calls += 1
+        if self.tokens >= requested:
+            granted = requested
+        elif partial:
+            granted = self.tokens
+        else:
+            granted = 0
+        self.tokens -= granted
+        return granted, self.tokens
+
+
+@pytest.fixture()
+def bucket(monkeypatch):
+    fake = BucketRedis(capacity=50)
+
+    async def fake_get_redis():
+        return fake
+
+    monkeypatch.setattr("kickback.core.rate_limit.get_redis", fake_get_redis)
+    monkeypatch.setattr(rate_limit, "_leases", {})
+    monkeypatch.setattr(rate_limit, "_lease_locks", {})
+    return fake
+
+
+@pytest.mark.anyio
+async def test_leased_mode_batches_round_trips(bucket, monkeypatch):
+    limits = get_settings().rate_limit
+    monkeypatch.setattr(limits, "mode", "leased")
+    monkeypatch.setattr(limits, "lease_size", 10)
+
+    results = [await rate_limit.check_rate_limit("client") for _ in range(60)]
+
+    assert sum(result.allowed for result in results) == 50
+    assert bucket.calls <= 7
+
+
+@pytest.mark.anyio
+async def test_leased_denial_reports_the_bucket_refill_time(bucket, monkeypatch):
+    limits = get_settings().rate_limit
+    monkeypatch.setattr(limits, "mode", "leased")
+    monkeypatch.setattr(limits, "lease_size", 10)
+    monkeypatch.setattr(limits, "per_min", 60)
+    monkeypatch.setattr(limits, "lease_ttl_seconds", 1.0)
+
+    first = await rate_limit.check_rate_limit("client", cost=40)
+    denied = await rate_limit.check_rate_limit("client", cost=40)
+    local = await rate_limit.check_rate_limit("client", cost=40)
+
+    assert first.allowed and not denied.allowed and not local.allowed
+    # 10 tokens are leased; refilling the other 30 at one per second takes 30 seconds.
+    assert denied.retry_after == pytest.approx(30)
+    assert 29 < local.retry_after <= 30
+
+
+@pytest.mark.anyio
+async def test_direct_mode_charges_cost(bucket):
+    first = await rate_limit.check_rate_limit("client", cost=40)
+    second = await rate_limit.check_rate_limit("client", cost=20)
+
+    assert first.allowed
+    assert not second.allowed
+    assert bucket.tokens == 10
+
+
+@pytest.mark.anyio
+async def test_gcra_denial_sets_retry_after(app, api_token, monkeypatch):
+    class GcraRedis:
+        def __init__(self):
+            self.keys: list[str] = []
+
+        async def evalsha(self, sha, numkeys, tat_key, burst, interval_us, requested, partial):
+            self.keys.append(tat_key)
+            return 0, 0, "2.25"
+
+    fake = GcraRedis()
+
+    async def fake_get_redis():
+        return fake
+
+    monkeypatch.setattr("kickback.core.rate_limit.get_redis", fake_get_redis)
+    monkeypatch.setattr(get_settings().rate_limit, "algorithm", "gcra")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/v1/documents/1", headers={"X-API-KEY": api_token})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert len(fake.keys) == 1 and fake.keys[0].endswith(":tat")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import datetime as dt
+from types import SimpleNamespace
+
+import pytest
+
+from kickback.infra.partitions import add_months, create_partition_sql, parse_partition_name
+from kickback.services.retention import SignalRetention
+
+
+class RecordingSession:
+    def __init__(self, partitions: list[str]):
+        self.partitions = partitions
+        self.statements: list[str] = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        return SimpleNamespace(all=lambda: [(name,) for name in self.partitions])
+
+
+def test_partition_helpers():
+    assert add_months(dt.date(2024, 11, 1), 3) == dt.date(2025, 2, 1)
+    assert add_months(dt.date(2024, 1, 1), -1) == dt.date(2023, 12, 1)
+    assert parse_partition_name("signals_p202402") == dt.date(2024, 2, 1)
+    assert parse_partition_name("signals_default") is None
+    assert "FROM ('2024-12-01 00:00:00+00') TO ('2025-01-01 00:00:00+00')" in create_partition_sql(
+        dt.date(2024, 12, 1)
+    )
+
+
+@pytest.mark.anyio
+async def test_retention_premakes_and_drops_whole_partitions():
+    session = RecordingSession(
+        [
+            "signals_default",
+            "signals_p202401",
+            "signals_p202402",
+            "signals_p202403",
+            "signals_p202406",
+        ]
+    )
+    job = SignalRetention(session=session, retention_months=3, premake_months=1)  # type: ignore[arg-type]
+
+    result = await job.run_once(today=dt.date(2024, 6, 15))
+
+    assert result.created == ["signals_p202407"]
+    assert result.dropped == ["signals_p202401", "signals_p202402"]
+    assert any("DETACH PARTITION signals_p202401" in stmt for stmt in session.statements)
+    # Rows that fell into the default partition move before the new partition is attached.
+    statements = session.statements
+    moved = next(i for i, stmt in enumerate(statements) if "DELETE FROM signals_default" in stmt)
+    attached = next(i for i, stmt in enumerate(statements) if "ATTACH PARTITION" in stmt)
+    assert moved < attached
+    assert any("DELETE FROM signal_idem_keys" in stmt for stmt in session.statements)
+
+
+@pytest.mark.anyio
+async def test_retention_is_noop_on_sqlite(session):
+    job = SignalRetention(session=session, retention_months=3, premake_months=1)
+    result = await job.run_once()
+    assert result.created == [] and result.dropped == []
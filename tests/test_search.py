@@ -1,18 +1,32 @@
 from __future__ import annotations
 
+import base64
 import datetime as dt
+import json
 
 import pytest
+import sqlalchemy as sa
 from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
 
+from kickback.core.metrics import get_metrics
+from kickback.core.settings import ScoringSettings
 from kickback.core.types import PermissionRole, SignalKind
 from kickback.domain import models
-from kickback.services.projector import SignalProjector
+from kickback.infra.repositories.search_repo import SearchRepository
+from kickback.infra.repositories.signals_repo import SignalRepository
+from kickback.services.leaderboard import RedisLeaderboard
+from kickback.services.projections import get_projection, get_projections
+from kickback.services.projector import BatchSizer, ProjectorPipeline, SignalProjector
+from kickback.services.rebuild import LeaderboardRebuild
+from kickback.services.scoring import RecencyDecay
+from kickback.services.search import SearchService, plan_window
+from kickback.services.snapshots import LeaderboardSnapshots, set_leaderboard_snapshots
 
 
 @pytest.mark.anyio
 async def test_leaderboard_and_daily(app, api_token, session_factory):
-    now = dt.datetime.now(dt.timezone.utc)
+    now = dt.datetime.now(dt.UTC)
     async with session_factory() as session:
         user = models.User(email="search@example.com")
         session.add(user)
@@ -61,3 +75,576 @@ async def test_leaderboard_and_daily(app, api_token, session_factory):
     body = daily.json()
     assert len(body) >= 1
     assert body[0]["doc_id"] == doc_id
+
+
+def test_plan_window_uses_coarsest_buckets_with_fine_edges():
+    utc = dt.UTC
+    # Wednesday 10:00 to the following-but-one Tuesday 15:00.
+    start = dt.datetime(2026, 10, 7, 10, tzinfo=utc)
+    end = dt.datetime(2026, 10, 20, 15, tzinfo=utc)
+
+    plan = plan_window(start, end, {"hour", "day", "week"})
+    assert plan.hours == [
+        (start, dt.datetime(2026, 10, 8, tzinfo=utc)),
+        (dt.datetime(2026, 10, 20, tzinfo=utc), end),
+    ]
+    assert plan.days == [
+        (dt.date(2026, 10, 8), dt.date(2026, 10, 12)),
+        (dt.date(2026, 10, 19), dt.date(2026, 10, 20)),
+    ]
+    assert plan.weeks == [(dt.date(2026, 10, 12), dt.date(2026, 10, 19))]
+
+    daily_only = plan_window(start, end, {"day"})
+    assert daily_only.hours == [] and daily_only.weeks == []
+    assert daily_only.days == [(dt.date(2026, 10, 7), dt.date(2026, 10, 21))]
+
+    within_day = plan_window(start, start + dt.timedelta(hours=3), {"hour", "day", "week"})
+    assert within_day.hours == [(start, start + dt.timedelta(hours=3))]
+    assert within_day.days == [] and within_day.weeks == []
+
+
+@pytest.mark.anyio
+async def test_hour_window_is_exact_once_rollups_are_projected(session_factory):
+    now = dt.datetime.now(dt.UTC)
+    async with session_factory() as session:
+        user = models.User(email="rollup@example.com")
+        session.add(user)
+        await session.flush()
+        recent = models.Document(external_key="rollup-recent", title="Recent", owner_id=user.id)
+        older = models.Document(external_key="rollup-older", title="Older", owner_id=user.id)
+        session.add_all([recent, older])
+        await session.flush()
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=recent.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=now
+                )
+            ]
+            + [
+                models.Signal(
+                    doc_id=older.id,
+                    user_id=user.id,
+                    kind=SignalKind.UPDATE,
+                    occurred_at=now - dt.timedelta(hours=30),
+                )
+                for _ in range(3)
+            ]
+        )
+        await session.commit()
+        recent_id, older_id = recent.id, older.id
+
+    pipeline = ProjectorPipeline(
+        session_factory,
+        BatchSizer(initial=100, minimum=100, maximum=100, target_seconds=1.0),
+        projections=get_projections(
+            ["search_signals_projector", "search_signals_hourly", "search_signals_weekly"]
+        ),
+    )
+    await pipeline.drain()
+
+    async with session_factory() as session:
+        service = SearchService(session)
+        assert await service._resolutions() == {"hour", "day", "week"}
+        last_day = await service.leaderboard(window="24h", limit=10)
+        assert [(entry.doc_id, entry.views, entry.edits) for entry in last_day] == [
+            (recent_id, 1, 0)
+        ]
+        month = await service.leaderboard(window="30d", limit=10)
+        assert [entry.doc_id for entry in month] == [older_id, recent_id]
+        # One view now keeps nearly full weight; three edits from ~30h ago have decayed.
+        assert 0.9 < month[1].score <= 1
+        assert month[1].score < month[0].score < 6
+
+
+def test_recency_decay_weights_buckets_by_age():
+    now = dt.datetime(2026, 10, 17, 12, tzinfo=dt.UTC)
+    decay = RecencyDecay(ScoringSettings(decay="exponential", half_life_hours=24))
+    assert decay.weight(dt.timedelta(0)) == 1.0
+    assert decay.weight(dt.timedelta(hours=24)) == pytest.approx(0.5)
+    assert decay.day_weight(dt.date(2026, 10, 16), now) == pytest.approx(0.5)
+
+    plan = plan_window(dt.datetime(2026, 10, 15, 18, tzinfo=dt.UTC), None, {"hour", "day"})
+    weights = decay.bucket_weights(plan, now)
+    assert len(weights.hours) == 6
+    assert list(weights.days) == [dt.date(2026, 10, 16), dt.date(2026, 10, 17)]
+    assert weights.days[dt.date(2026, 10, 17)] == 1.0
+
+    linear = RecencyDecay(ScoringSettings(decay="linear", horizon_hours=48))
+    assert linear.weight(dt.timedelta(hours=12)) == pytest.approx(0.75)
+    assert linear.weight(dt.timedelta(hours=72)) == 0.0
+
+
+@pytest.mark.anyio
+async def test_leaderboard_sums_each_document_once_over_the_window(session_factory):
+    now = dt.datetime.now(dt.UTC)
+    async with session_factory() as session:
+        user = models.User(email="window@example.com")
+        session.add(user)
+        await session.flush()
+        busy = models.Document(external_key="window-busy", title="Busy", owner_id=user.id)
+        quiet = models.Document(external_key="window-quiet", title="Quiet", owner_id=user.id)
+        session.add_all([busy, quiet])
+        await session.flush()
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=busy.id,
+                    user_id=user.id,
+                    kind=SignalKind.VIEW,
+                    occurred_at=now - dt.timedelta(days=days_ago),
+                )
+                for days_ago in range(4)
+            ]
+            + [
+                models.Signal(
+                    doc_id=quiet.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=now
+                )
+            ]
+        )
+        await session.commit()
+        busy_id, quiet_id = busy.id, quiet.id
+
+    async with session_factory() as session:
+        await SignalProjector(session=session, batch_size=50).run_once()
+        await session.commit()
+        week = await SearchService(session).leaderboard(window="7d", limit=10)
+
+    assert [(entry.doc_id, entry.views) for entry in week] == [(busy_id, 4), (quiet_id, 1)]
+
+
+def _cursor(**payload) -> str:
+    """A hand-built leaderboard cursor, as a client could send one."""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+class _SortedSets:
+    """Just enough of redis.asyncio for RedisLeaderboard."""
+
+    def __init__(self):
+        self.sets: dict[str, dict[str, float]] = {}
+        self.strings: dict[str, str] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return _Pipeline(self)
+
+    async def zincrby(self, key, amount, member):
+        members = self.sets.setdefault(key, {})
+        members[str(member)] = members.get(str(member), 0) + amount
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def set(self, key, value):
+        self.strings[key] = str(value)
+
+    async def mset(self, mapping):
+        for key, value in mapping.items():
+            self.strings[key] = str(value)
+
+    async def expireat(self, key, when):
+        return True
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def exists(self, key):
+        return int(key in self.sets)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.sets.pop(key, None)
+
+    async def zunionstore(self, dest, keys):
+        weights = keys if isinstance(keys, dict) else dict.fromkeys(keys, 1)
+        union: dict[str, float] = {}
+        for key, weight in weights.items():
+            for member, score in self.sets.get(key, {}).items():
+                union[member] = union.get(member, 0) + score * weight
+        if union:
+            self.sets[dest] = union
+
+    async def zrevrange(self, key, start, end, withscores=False):
+        ranked = sorted(self.sets.get(key, {}).items(), key=lambda item: (-item[1], item[0]))
+        return ranked[start : end + 1]
+
+    async def zmscore(self, key, members):
+        return [self.sets.get(key, {}).get(member) for member in members]
+
+
+class _Pipeline:
+    def __init__(self, redis: _SortedSets):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(getattr(self.redis, name)(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+@pytest.mark.anyio
+async def test_redis_leaderboard_matches_rollups_and_rebuilds(session_factory, monkeypatch):
+    redis = _SortedSets()
+
+    async def fake_get_redis():
+        return redis
+
+    monkeypatch.setattr("kickback.services.leaderboard.get_redis", fake_get_redis)
+    # Compare the two backends, not a cached copy of the first answer.
+    monkeypatch.setattr("kickback.core.flags.cache_enabled", lambda: False)
+    now = dt.datetime.now(dt.UTC)
+    async with session_factory() as session:
+        user = models.User(email="redis-board@example.com")
+        session.add(user)
+        await session.flush()
+        documents = [
+            models.Document(external_key=f"redis-board-{index}", title="Board", owner_id=user.id)
+            for index in range(3)
+        ]
+        session.add_all(documents)
+        await session.flush()
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id,
+                    user_id=user.id,
+                    kind=SignalKind.UPDATE if index % 2 else SignalKind.VIEW,
+                    occurred_at=now - dt.timedelta(days=index),
+                )
+                for position, document in enumerate(documents)
+                for index in range(position * 2 + 1)
+            ]
+        )
+        await session.commit()
+
+    pipeline = ProjectorPipeline(
+        session_factory,
+        BatchSizer(initial=100, minimum=100, maximum=100, target_seconds=1.0),
+        projections=get_projections(["search_signals_projector", "redis_leaderboard"]),
+    )
+    await pipeline.drain()
+
+    board = await RedisLeaderboard.connect()
+    async with session_factory() as session:
+        from_rollups = await SearchService(session).leaderboard(window="7d", limit=10)
+        from_redis = await SearchService(session, board=board).leaderboard(window="7d", limit=10)
+    assert [(entry.doc_id, entry.views, entry.edits) for entry in from_redis] == [
+        (entry.doc_id, entry.views, entry.edits) for entry in from_rollups
+    ]
+    for redis_entry, rollup_entry in zip(from_redis, from_rollups, strict=True):
+        assert redis_entry.score == pytest.approx(rollup_entry.score)
+
+    # Pages ranked in Redis continue there rather than on the rollups' scores.
+    async with session_factory() as session:
+        service = SearchService(session, board=board)
+        first = await service.leaderboard_page(window="7d", limit=2)
+        # Without rollup rows, only Redis can answer the second page.
+        await session.execute(sa.delete(models.SearchSignalsDaily))
+        rest = await service.leaderboard_page(window="7d", limit=2, cursor=first.next_cursor)
+        await session.rollback()
+    assert rest.next_cursor is None
+    assert [entry.doc_id for entry in first.entries + rest.entries] == [
+        entry.doc_id for entry in from_redis
+    ]
+
+    # A batch fetched again after its commit failed is not counted twice.
+    async with session_factory() as session:
+        rows = await SignalRepository(session).fetch_rows(last_id=0, limit=100)
+    projection = get_projection("redis_leaderboard")
+    await projection.apply(None, rows[:4], now, "redis_leaderboard")
+    snapshot = {key: dict(members) for key, members in redis.sets.items()}
+    await projection.apply(None, rows, now, "redis_leaderboard")
+    assert redis.sets == snapshot
+
+    # Unions are not shared between requests that weigh edits differently.
+    weights = {now.date() - dt.timedelta(days=1): 1.0}
+    [edits_once] = await board.top(weights, 1, edit_weight=1.0)
+    [edits_twice] = await board.top(weights, 1, edit_weight=2.0)
+    assert edits_twice.score > edits_once.score
+
+    # Redis is only read while its checkpoints match the daily ones.
+    redis.sets.clear()
+    async with session_factory() as session:
+        await SearchRepository(session).update_projector_state("redis_leaderboard", 0)
+        await session.commit()
+        behind = await SearchService(session, board=board).leaderboard(window="7d", limit=10)
+    assert [entry.doc_id for entry in behind] == [entry.doc_id for entry in from_rollups]
+
+    assert await LeaderboardRebuild(session_factory, board).run() == 9
+    async with session_factory() as session:
+        rebuilt = await SearchService(session, board=board).leaderboard(window="7d", limit=10)
+    assert [entry.doc_id for entry in rebuilt] == [entry.doc_id for entry in from_rollups]
+
+
+@pytest.mark.anyio
+async def test_redis_outage_only_holds_back_the_leaderboard_checkpoint(
+    session_factory, monkeypatch
+):
+    class DownRedis(_SortedSets):
+        async def get(self, key):
+            raise RedisConnectionError("redis is down")
+
+    redis = DownRedis()
+
+    async def fake_get_redis():
+        return redis
+
+    monkeypatch.setattr("kickback.services.leaderboard.get_redis", fake_get_redis)
+    async with session_factory() as session:
+        user = models.User(email="redis-down@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="redis-down", title="Down", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        now = dt.datetime.now(dt.UTC)
+        signal = {"doc_id": document.id, "user_id": user.id, "kind": SignalKind.VIEW}
+        session.add_all([models.Signal(**signal, occurred_at=now) for _ in range(3)])
+        await session.commit()
+
+    pipeline = ProjectorPipeline(
+        session_factory,
+        BatchSizer(initial=2, minimum=2, maximum=2, target_seconds=1.0),
+        projections=get_projections(["search_signals_projector", "redis_leaderboard"]),
+    )
+    assert await pipeline.drain() == 3
+
+    async with session_factory() as session:
+        checkpoints = await SearchRepository(session).projector_checkpoints()
+    assert checkpoints["search_signals_projector"] > 0
+    assert "redis_leaderboard" not in checkpoints
+
+    # Once Redis is back the leaderboard projection backfills on its own.
+    redis = _SortedSets()
+    assert await pipeline.drain() == 3
+    async with session_factory() as session:
+        checkpoints = await SearchRepository(session).projector_checkpoints()
+    assert checkpoints["redis_leaderboard"] == checkpoints["search_signals_projector"]
+
+
+@pytest.mark.anyio
+async def test_search_cache_is_versioned_by_projector_checkpoint(session_factory):
+    get_metrics().clear()
+    now = dt.datetime.now(dt.UTC)
+    async with session_factory() as session:
+        user = models.User(email="cache@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="cache-doc", title="Cache", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        doc_id, user_id = document.id, user.id
+        session.add(
+            models.Signal(doc_id=doc_id, user_id=user_id, kind=SignalKind.VIEW, occurred_at=now)
+        )
+        await session.commit()
+
+    async def project() -> None:
+        async with session_factory() as session:
+            await SignalProjector(session=session, batch_size=50).run_once()
+            await session.commit()
+
+    await project()
+    async with session_factory() as session:
+        service = SearchService(session)
+        first = await service.leaderboard(window="7d", limit=10)
+        assert await service.leaderboard(window="7d", limit=10) == first
+        assert [entry.views for entry in await service.daily(doc_id)] == [1]
+        assert [entry.views for entry in await service.daily(doc_id)] == [1]
+
+    async with session_factory() as session:
+        session.add(
+            models.Signal(doc_id=doc_id, user_id=user_id, kind=SignalKind.VIEW, occurred_at=now)
+        )
+        await session.commit()
+    await project()
+    async with session_factory() as session:
+        service = SearchService(session)
+        assert [entry.views for entry in await service.leaderboard(window="7d", limit=10)] == [2]
+        assert [entry.views for entry in await service.daily(doc_id)] == [2]
+
+    requests = get_metrics().counter("search_cache_requests_total")
+    for endpoint in ("leaderboard", "daily"):
+        assert requests.get(endpoint=endpoint, result="hit") == 1
+        assert requests.get(endpoint=endpoint, result="miss") == 2
+    ratio = get_metrics().gauge("search_cache_hit_ratio").get(endpoint="daily")
+    assert ratio == pytest.approx(1 / 3)
+
+
+@pytest.mark.anyio
+async def test_leaderboard_snapshot_serves_encoded_top_k(app, api_token, session_factory):
+    now = dt.datetime.now(dt.UTC)
+    async with session_factory() as session:
+        user = models.User(email="snapshot@example.com")
+        session.add(user)
+        await session.flush()
+        documents = [
+            models.Document(external_key=f"snapshot-{index}", title="Snap", owner_id=user.id)
+            for index in range(3)
+        ]
+        session.add_all(documents)
+        await session.flush()
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id, user_id=user.id, kind=SignalKind.VIEW, occurred_at=now
+                )
+                for position, document in enumerate(documents)
+                for _ in range(position + 1)
+            ]
+        )
+        await session.commit()
+        doc_ids = [document.id for document in documents]
+    async with session_factory() as session:
+        await SignalProjector(session=session, batch_size=50).run_once()
+        await session.commit()
+
+    headers = {"X-API-KEY": api_token}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        expected = await client.get("/v1/search/leaderboard?window=7d&limit=2", headers=headers)
+
+        snapshots = LeaderboardSnapshots(session_factory, windows=["7d"], size=2)
+        assert await snapshots.refresh() == 1
+        assert await snapshots.refresh() == 0
+        set_leaderboard_snapshots(snapshots)
+        try:
+            top_two = await client.get("/v1/search/leaderboard?window=7d&limit=2", headers=headers)
+            top_one = await client.get("/v1/search/leaderboard?window=7d&limit=1", headers=headers)
+            # Beyond the snapshot's size or window the database answers as before.
+            wider = await client.get("/v1/search/leaderboard?window=7d&limit=3", headers=headers)
+            other = await client.get("/v1/search/leaderboard?window=1d&limit=2", headers=headers)
+            rest = await client.get(
+                "/v1/search/leaderboard",
+                params={"window": "7d", "limit": 2, "cursor": top_two.headers["X-Next-Cursor"]},
+                headers=headers,
+            )
+        finally:
+            set_leaderboard_snapshots(None)
+
+    assert top_two.content == snapshots.get("7d", 2)[0] == expected.content
+    assert top_two.headers["X-Next-Cursor"] == snapshots.get("7d", 2)[1]
+    assert [entry["doc_id"] for entry in rest.json()] == [doc_ids[0]]
+    assert [entry["doc_id"] for entry in top_one.json()] == [doc_ids[2]]
+    assert [entry["doc_id"] for entry in wider.json()] == doc_ids[::-1]
+    assert [entry["doc_id"] for entry in other.json()] == doc_ids[:0:-1]
+
+
+@pytest.mark.anyio
+async def test_leaderboard_snapshot_refresh_bypasses_result_cache(session_factory, monkeypatch):
+    async def no_cache(*args, **kwargs):
+        raise AssertionError("snapshots must not read the result cache")
+
+    monkeypatch.setattr("kickback.services.search.cache_get_or_set", no_cache)
+    snapshots = LeaderboardSnapshots(session_factory, windows=["7d"], size=2)
+    assert await snapshots.refresh() == 1
+
+
+@pytest.mark.anyio
+async def test_leaderboard_and_daily_pages_follow_cursors(app, api_token, session_factory):
+    now = dt.datetime.now(dt.UTC)
+    async with session_factory() as session:
+        user = models.User(email="pages@example.com")
+        session.add(user)
+        await session.flush()
+        documents = [
+            models.Document(external_key=f"pages-{index}", title="Pages", owner_id=user.id)
+            for index in range(5)
+        ]
+        session.add_all(documents)
+        await session.flush()
+        session.add_all(
+            [
+                models.Signal(
+                    doc_id=document.id,
+                    user_id=user.id,
+                    kind=SignalKind.VIEW,
+                    occurred_at=now - dt.timedelta(days=day),
+                )
+                for position, document in enumerate(documents)
+                for day in range(position % 3 + 1)
+            ]
+        )
+        await session.commit()
+        busiest = documents[2].id
+        active_yesterday = {documents[index].id for index in (1, 2, 4)}
+    async with session_factory() as session:
+        await SignalProjector(session=session, batch_size=50).run_once()
+        await session.commit()
+
+    headers = {"X-API-KEY": api_token}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        everything = await client.get("/v1/search/leaderboard?window=7d&limit=5", headers=headers)
+        paged, cursor = [], None
+        while True:
+            params = {"window": "7d", "limit": 2} | ({"cursor": cursor} if cursor else {})
+            page = await client.get("/v1/search/leaderboard", params=params, headers=headers)
+            assert page.status_code == 200
+            paged.extend(entry["doc_id"] for entry in page.json())
+            cursor = page.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        days, cursor = [], None
+        while True:
+            params = {"doc_id": busiest, "limit": 1} | ({"cursor": cursor} if cursor else {})
+            page = await client.get("/v1/search/signals/daily", params=params, headers=headers)
+            days.extend(entry["day"] for entry in page.json())
+            cursor = page.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        yesterday = (now - dt.timedelta(days=1)).date().isoformat()
+        ranged = await client.get(
+            "/v1/search/signals/daily",
+            params={"doc_id": busiest, "from": yesterday, "to": yesterday},
+            headers=headers,
+        )
+        ranged_board = await client.get(
+            "/v1/search/leaderboard", params={"from": yesterday, "to": yesterday}, headers=headers
+        )
+        invalid = await client.get("/v1/search/leaderboard?cursor=nope", headers=headers)
+        forged = [
+            await client.get(
+                "/v1/search/leaderboard",
+                params={"window": "7d", "cursor": _cursor(as_of=as_of, score=1.0, doc_id=1)},
+                headers=headers,
+            )
+            for as_of in (
+                "2026-10-18T00:00:00",
+                "9999-12-31T23:00:00+00:00",
+                "0001-01-01T00:00:00+00:00",
+                (now + dt.timedelta(hours=1)).isoformat(),
+            )
+        ]
+        out_of_range = [
+            await client.get("/v1/search/leaderboard", params=params, headers=headers)
+            for params in (
+                {"from": "9999-12-30", "to": "9999-12-31"},
+                {"from": "0001-01-01", "to": yesterday},
+                {"window": "9999999d"},
+                {"window": "367d"},
+                {"window": "0d"},
+                {"window": "-1d"},
+            )
+        ]
+        ancient = await client.get(
+            "/v1/search/leaderboard",
+            params={"from": "0001-01-01", "to": "0001-01-01"},
+            headers=headers,
+        )
+
+    assert paged == [entry["doc_id"] for entry in everything.json()]
+    assert len(paged) == 5
+    assert days == sorted(days, reverse=True)
+    assert len(days) == 3
+    assert [entry["day"] for entry in ranged.json()] == [yesterday]
+    assert "X-Next-Cursor" not in ranged.headers
+    assert {entry["doc_id"] for entry in ranged_board.json()} == active_yesterday
+    assert all(entry["views"] == 1 for entry in ranged_board.json())
+    assert invalid.status_code == 400
+    assert [response.status_code for response in forged] == [400] * 4
+    assert [response.status_code for response in out_of_range] == [400] * 6
+    assert (ancient.status_code, ancient.json()) == (200, [])
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import datetime as dt
+import json
 
 import pytest
+import sqlalchemy as sa
 from httpx import ASGITransport, AsyncClient
 
+from kickback.api import deps
 from kickback.core import flags
+from kickback.core.auth_cache import ApiPrincipal
+from kickback.core.rate_limit import RateLimitResult
+from kickback.core.settings import get_settings
 from kickback.core.types import PermissionRole
-from kickback.domain.models import Document, Permission, User
+from kickback.domain import schemas
+from kickback.domain.models import Document, Permission, Signal, User
+from kickback.infra.repositories.signals_repo import SignalRepository
+from kickback.infra.spool import DeadLetterFile
+from kickback.services.ingest_buffer import SignalWriteBuffer
 
 
 @pytest.mark.anyio
@@ -30,7 +40,7 @@ async def test_signal_permission_denied(app, api_token, session_factory):
         "doc_id": doc_id,
         "user_id": user_id,
         "kind": "update",
-        "occurred_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "occurred_at": dt.datetime.now(dt.UTC).isoformat(),
     }
 
     transport = ASGITransport(app=app)
@@ -60,7 +70,7 @@ async def test_signal_idempotency(app, api_token, session_factory, monkeypatch):
         "doc_id": doc_id,
         "user_id": user_id,
         "kind": "create",
-        "occurred_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "occurred_at": dt.datetime.now(dt.UTC).isoformat(),
         "idem_key": "signal-123",
     }
 
@@ -111,7 +121,7 @@ async def test_signal_idempotency_guard(app, api_token, session_factory, monkeyp
         "doc_id": doc_id,
         "user_id": user_id,
         "kind": "create",
-        "occurred_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "occurred_at": dt.datetime.now(dt.UTC).isoformat(),
         "idem_key": "redis-guard",
     }
 
@@ -122,3 +132,232 @@ async def test_signal_idempotency_guard(app, api_token, session_factory, monkeyp
 
     assert first.status_code == 201
     assert dup.status_code == 409
+
+
+@pytest.mark.anyio
+async def test_signal_batch_reports_each_item(app, api_token, session_factory):
+    async with session_factory() as session:
+        owner = User(email="batch-owner@example.com")
+        viewer = User(email="batch-viewer@example.com")
+        session.add_all([owner, viewer])
+        await session.flush()
+        document = Document(external_key="sig-batch", title="Sig Batch", owner_id=owner.id)
+        session.add(document)
+        await session.flush()
+        session.add_all(
+            [
+                Permission(doc_id=document.id, user_id=owner.id, role=PermissionRole.OWNER),
+                Permission(doc_id=document.id, user_id=viewer.id, role=PermissionRole.VIEWER),
+            ]
+        )
+        await session.commit()
+        doc_id, owner_id, viewer_id = document.id, owner.id, viewer.id
+
+    now = dt.datetime.now(dt.UTC).isoformat()
+
+    def signal(user_id: int, kind: str, idem_key: str | None = None) -> dict:
+        return {
+            "doc_id": doc_id,
+            "user_id": user_id,
+            "kind": kind,
+            "occurred_at": now,
+            "idem_key": idem_key,
+        }
+
+    headers = {"X-API-KEY": api_token}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        first = await client.post(
+            "/v1/signals:batch",
+            json={
+                "signals": [
+                    signal(owner_id, "create", "batch-1"),
+                    signal(viewer_id, "view"),
+                    signal(viewer_id, "update"),
+                    signal(owner_id, "view", "batch-1"),
+                    signal(viewer_id, "view"),
+                ]
+            },
+            headers=headers,
+        )
+        replay = await client.post(
+            "/v1/signals:batch",
+            json={"signals": [signal(owner_id, "create", "batch-1")]},
+            headers=headers,
+        )
+
+    assert first.status_code == 200
+    body = first.json()
+    assert [item["status"] for item in body["items"]] == [
+        "created",
+        "created",
+        "forbidden",
+        "duplicate",
+        "created",
+    ]
+    assert (body["created"], body["duplicates"], body["forbidden"]) == (3, 1, 1)
+    assert len({item["id"] for item in body["items"] if item["id"] is not None}) == 3
+    assert replay.json()["items"][0]["status"] == "duplicate"
+
+
+@pytest.mark.anyio
+async def test_signal_batch_charged_by_size(app, api_token, monkeypatch):
+    charged: list[int] = []
+
+    async def fake_check(client_key: str, cost: int = 1):
+        charged.append(cost)
+        return RateLimitResult(False, 0, retry_after=1.5)
+
+    monkeypatch.setattr(deps, "check_rate_limit", fake_check)
+
+    now = dt.datetime.now(dt.UTC).isoformat()
+    item = {"doc_id": 1, "user_id": 1, "kind": "view", "occurred_at": now}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            "/v1/signals:batch", json={"signals": [item] * 7}, headers={"X-API-KEY": api_token}
+        )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert charged == [7]
+
+
+@pytest.mark.anyio
+async def test_stream_wait_charges_in_burst_installments(monkeypatch):
+    charged: list[int] = []
+
+    async def fake_check(client_key: str, cost: int = 1):
+        charged.append(cost)
+        return RateLimitResult(True, 0)
+
+    monkeypatch.setattr(deps, "check_rate_limit", fake_check)
+    monkeypatch.setattr(get_settings().rate_limit, "burst", 4)
+
+    await deps.wait_for_rate_limit(ApiPrincipal(id=1, client_name="c"), cost=10)
+
+    assert charged == [4, 4, 2]
+
+
+@pytest.mark.anyio
+async def test_signal_stream_ingests_in_chunks(app, api_token, session_factory, monkeypatch):
+    async with session_factory() as session:
+        user = User(email="stream@example.com")
+        session.add(user)
+        await session.flush()
+        document = Document(external_key="sig-stream", title="Sig Stream", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        session.add(Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.VIEWER))
+        await session.commit()
+        doc_id, user_id = document.id, user.id
+
+    monkeypatch.setattr(get_settings().ingest, "stream_chunk_size", 2)
+    charged: list[int] = []
+    original_wait = deps.wait_for_rate_limit
+
+    async def counting_wait(api_key, cost):
+        charged.append(cost)
+        await original_wait(api_key, cost)
+
+    monkeypatch.setattr(deps, "wait_for_rate_limit", counting_wait)
+
+    now = dt.datetime.now(dt.UTC).isoformat()
+    view = json.dumps({"doc_id": doc_id, "user_id": user_id, "kind": "view", "occurred_at": now})
+    edit = json.dumps({"doc_id": doc_id, "user_id": user_id, "kind": "update", "occurred_at": now})
+    body = "\n".join([view, "{not json", view, "", edit, view]) + "\n"
+
+    async def chunks():
+        encoded = body.encode()
+        for start in range(0, len(encoded), 7):
+            yield encoded[start : start + 7]
+
+    headers = {"X-API-KEY": api_token, "Content-Type": "application/x-ndjson"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post("/v1/signals:stream", content=chunks(), headers=headers)
+        wrong_type = await client.post(
+            "/v1/signals:stream", content=body, headers={"X-API-KEY": api_token}
+        )
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["lines"] == 5
+    assert (summary["created"], summary["forbidden"], summary["invalid"]) == (3, 1, 1)
+    assert [(error["line"], error["offset"]) for error in summary["errors"]] == [
+        (2, len(view) + 1),
+        (5, 2 * len(view) + len("{not json") + 4),
+    ]
+    assert charged == [2, 2]
+    assert wrong_type.status_code == 415
+
+
+@pytest.mark.anyio
+async def test_signal_write_behind_acks_and_drains(app, api_token, session_factory):
+    async with session_factory() as session:
+        user = User(email="async@example.com")
+        session.add(user)
+        await session.flush()
+        document = Document(external_key="sig-async", title="Sig Async", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        session.add(Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.VIEWER))
+        await session.commit()
+        doc_id, user_id = document.id, user.id
+
+    buffer = SignalWriteBuffer(
+        session_factory, max_queue=3, flush_max_items=10, flush_interval_seconds=0.01
+    )
+    app.dependency_overrides[deps.get_write_buffer] = lambda: buffer
+
+    now = dt.datetime.now(dt.UTC).isoformat()
+    view = {"doc_id": doc_id, "user_id": user_id, "kind": "view", "occurred_at": now}
+    headers = {"X-API-KEY": api_token}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        accepted = [
+            await client.post("/v1/signals:async", json=view, headers=headers) for _ in range(3)
+        ]
+        full = await client.post("/v1/signals:async", json=view, headers=headers)
+        forbidden = await client.post(
+            "/v1/signals:async", json={**view, "kind": "update"}, headers=headers
+        )
+
+        buffer.start()
+        await buffer.stop()
+
+    assert [response.status_code for response in accepted] == [202, 202, 202]
+    assert len({response.json()["ack_id"] for response in accepted}) == 3
+    assert full.status_code == 503
+    assert forbidden.status_code == 403
+
+    async with session_factory() as session:
+        count = await session.scalar(sa.select(sa.func.count()).select_from(Signal))
+    assert count == 3
+
+
+@pytest.mark.anyio
+async def test_write_behind_dead_letters_failed_batches(session_factory, tmp_path, monkeypatch):
+    async def failing_create(self, payloads):
+        raise RuntimeError("database gone")
+
+    monkeypatch.setattr(SignalRepository, "bulk_create", failing_create)
+    dead_letters = DeadLetterFile(tmp_path / "write-behind.jsonl")
+    buffer = SignalWriteBuffer(
+        session_factory,
+        max_queue=10,
+        flush_max_items=10,
+        flush_interval_seconds=0.01,
+        dead_letters=dead_letters,
+    )
+    now = dt.datetime.now(dt.UTC)
+    ack_ids = [
+        buffer.submit(schemas.SignalCreate(doc_id=1, user_id=1, kind="view", occurred_at=now))
+        for _ in range(2)
+    ]
+    buffer.start()
+    await buffer.stop()
+
+    lines = [json.loads(line) for line in dead_letters.path.read_text().splitlines()]
+    assert [line["ack_id"] for line in lines] == ack_ids
+    assert lines[0]["signal"]["doc_id"] == 1
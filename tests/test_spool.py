@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+import pytest
+import sqlalchemy as sa
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from kickback.core.settings import SpoolSettings, get_settings
+from kickback.core.types import PermissionRole, SignalKind
+from kickback.domain import models, schemas
+from kickback.infra.spool import IngestSpool, SpoolLockedError
+from kickback.services.ingest_spool import (
+    SpoolReplayer,
+    claim_spool,
+    set_ingest_spool,
+    spool_signal,
+    spool_slots,
+)
+from kickback.services.signals import SignalsService
+
+
+def test_spool_rolls_segments_and_recovers_torn_tail(tmp_path):
+    spool = IngestSpool(tmp_path, segment_max_bytes=100, max_total_bytes=10_000, fsync="never")
+    for index in range(5):
+        spool.append({"n": index, "pad": "x" * 30})
+    spool.close()
+
+    segments = sorted(tmp_path.glob("*.seg"))
+    assert len(segments) > 1
+    with segments[-1].open("ab") as handle:
+        handle.write(b"\x00\x00\x00\x20partial")
+
+    reopened = IngestSpool(tmp_path, segment_max_bytes=100, max_total_bytes=10_000, fsync="never")
+    reopened.append({"n": 5})
+    records = reopened.read(limit=100)
+    assert [record.data["n"] for record in records] == [0, 1, 2, 3, 4, 5]
+
+    reopened.commit(records[3].position)
+    assert [record.data["n"] for record in reopened.read(limit=100)] == [4, 5]
+    assert len(list(tmp_path.glob("*.seg"))) < len(segments)
+    assert reopened.stats()["pending_records"] == 2
+
+
+@pytest.mark.anyio
+async def test_spool_replay_is_idempotent(tmp_path, session_factory):
+    async with session_factory() as session:
+        user = models.User(email="spool@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="spool-doc", title="Spool Doc", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        session.add(
+            models.Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.VIEWER)
+        )
+        await session.commit()
+        doc_id, user_id = document.id, user.id
+
+    spool = IngestSpool(tmp_path, segment_max_bytes=4096, max_total_bytes=1_000_000, fsync="always")
+    now = dt.datetime.now(dt.UTC)
+    for kind in (SignalKind.VIEW, SignalKind.VIEW, SignalKind.UPDATE):
+        await spool_signal(
+            spool, schemas.SignalCreate(doc_id=doc_id, user_id=user_id, kind=kind, occurred_at=now)
+        )
+
+    replayer = SpoolReplayer(spool, session_factory, batch_size=2)
+    first_pass = spool.read(limit=10)
+    assert await replayer.drain() == 3
+
+    # Simulate a crash before the checkpoint was written: everything replays again.
+    (tmp_path / "replay.offset").unlink()
+    assert len(spool.read(limit=10)) == len(first_pass)
+    await replayer.drain()
+
+    async with session_factory() as session:
+        count = await session.scalar(sa.select(sa.func.count()).select_from(models.Signal))
+    assert count == 2
+
+
+@pytest.mark.anyio
+async def test_spooled_endpoints_authorize_and_absorb_outages(
+    app, api_token, session_factory, tmp_path, monkeypatch
+):
+    async with session_factory() as session:
+        user = models.User(email="spool-api@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="spool-api", title="Spool API", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        session.add(
+            models.Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.VIEWER)
+        )
+        await session.commit()
+        doc_id, user_id = document.id, user.id
+
+    async def unavailable(self, payload):
+        raise OperationalError("INSERT", {}, ConnectionError("failover"))
+
+    spool = IngestSpool(tmp_path, segment_max_bytes=4096, max_total_bytes=1_000_000, fsync="never")
+    set_ingest_spool(spool)
+    now = dt.datetime.now(dt.UTC).isoformat()
+    view = {"doc_id": doc_id, "user_id": user_id, "kind": "view", "occurred_at": now}
+    headers = {"X-API-KEY": api_token}
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            forbidden = await client.post(
+                "/v1/signals:async", json={**view, "kind": "update"}, headers=headers
+            )
+            accepted = await client.post("/v1/signals:async", json=view, headers=headers)
+            monkeypatch.setattr(SignalsService, "ingest_signal", unavailable)
+            spooled = await client.post("/v1/signals", json=view, headers=headers)
+    finally:
+        set_ingest_spool(None)
+
+    assert forbidden.status_code == 403
+    assert accepted.status_code == 202
+    assert spooled.status_code == 202
+    assert [record.data["ack_id"] for record in spool.read(limit=10)] == [
+        accepted.json()["ack_id"],
+        spooled.json()["ack_id"],
+    ]
+
+
+@pytest.mark.anyio
+async def test_spool_is_exclusive_and_dead_letters_poison(tmp_path, session_factory):
+    spool = IngestSpool(tmp_path, segment_max_bytes=4096, max_total_bytes=1_000_000, fsync="never")
+    with pytest.raises(SpoolLockedError):
+        IngestSpool(tmp_path, segment_max_bytes=4096, max_total_bytes=1_000_000, fsync="never")
+
+    now = dt.datetime.now(dt.UTC)
+    spool.append({"ack_id": "bad", "signal": {"doc_id": "x"}})
+    await spool_signal(
+        spool, schemas.SignalCreate(doc_id=1, user_id=1, kind=SignalKind.VIEW, occurred_at=now)
+    )
+    assert await SpoolReplayer(spool, session_factory).drain() == 2
+
+    stats = spool.stats()
+    assert (stats["pending_records"], stats["dead_letters"]) == (0, 2)
+    spool.close()
+    IngestSpool(tmp_path, segment_max_bytes=4096, max_total_bytes=1_000_000, fsync="never").close()
+
+
+def test_each_process_claims_its_own_spool_slot(tmp_path):
+    settings = SpoolSettings(directory=str(tmp_path), fsync="never")
+    first = claim_spool(settings)
+    second = claim_spool(settings)
+    assert spool_slots(settings) == [tmp_path / "worker-0", tmp_path / "worker-1"]
+
+    first.close()
+    reclaimed = claim_spool(settings)
+    assert spool_slots(settings) == [tmp_path / "worker-0", tmp_path / "worker-1"]
+    reclaimed.close()
+    second.close()
+
+
+@pytest.mark.anyio
+async def test_stalled_commit_is_spooled_within_the_timeout(
+    app, api_token, session_factory, tmp_path, monkeypatch
+):
+    async with session_factory() as session:
+        user = models.User(email="spool-commit@example.com")
+        session.add(user)
+        await session.flush()
+        document = models.Document(external_key="spool-commit", title="Spool", owner_id=user.id)
+        session.add(document)
+        await session.flush()
+        session.add(
+            models.Permission(doc_id=document.id, user_id=user.id, role=PermissionRole.VIEWER)
+        )
+        await session.commit()
+        doc_id, user_id = document.id, user.id
+
+    commit = AsyncSession.commit
+    stalled = []
+
+    async def stall_once(self):
+        if not stalled:
+            stalled.append(True)
+            await asyncio.sleep(5)
+        await commit(self)
+
+    monkeypatch.setattr(get_settings().spool, "db_timeout_seconds", 0.2)
+    monkeypatch.setattr(AsyncSession, "commit", stall_once)
+    spool = IngestSpool(tmp_path, segment_max_bytes=4096, max_total_bytes=1_000_000, fsync="never")
+    set_ingest_spool(spool)
+    now = dt.datetime.now(dt.UTC).isoformat()
+    view = {"doc_id": doc_id, "user_id": user_id, "kind": "view", "occurred_at": now}
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.post("/v1/signals", json=view, headers={"X-API-KEY": api_token})
+    finally:
+        set_ingest_spool(None)
+        spool.close()
+
+    assert response.status_code == 202
+    async with session_factory() as session:
+        stored = await session.scalar(
+            sa.select(sa.func.count())
+            .select_from(models.Signal)
+            .where(models.Signal.doc_id == doc_id)
+        )
+    assert stored == 0